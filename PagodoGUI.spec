@@ -1,7 +1,7 @@
 # -*- mode: python ; coding: utf-8 -*-
 from PyInstaller.utils.hooks import collect_all
 
-datas = []
+datas = [('embedded_ghdb.pack', '.')]
 binaries = []
 hiddenimports = ['ttkbootstrap.tooltip']
 tmp_ret = collect_all('ttkbootstrap')
@@ -0,0 +1,109 @@
+"""
+Exploit-DB export conversion: records/s of the old BeautifulSoup loop and of
+dorks/build_ghdb_json_from_exploitdb.py, on dorks/ghdb.json and on a
+synthetic export of --records rows.
+
+    python benchmarks/bench_convert.py [--records 1000000] [--workers 4] [--runs 3]
+
+The old loop is timed with bs4 when it is installed; without it, a stdlib
+html.parser text collector stands in (bs4's "html.parser" builder drives
+the same parser, so the real thing is slower still). The synthetic export
+repeats the GHDB rows with fresh ids and an entity in every tenth dork. Only
+the conversion is timed; json.load is the same for every variant.
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+from html.parser import HTMLParser
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "dorks"))
+
+from build_ghdb_json_from_exploitdb import convert, dorks_by_category, load_export  # noqa: E402
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def _get_text(markup):
+    if BeautifulSoup is not None:
+        return BeautifulSoup(markup, "html.parser").get_text()
+    p = _TextCollector()
+    p.feed(markup)
+    p.close()
+    return "".join(p.parts)
+
+
+def legacy(entries):
+    """The loop the converter replaced."""
+    ghdb = {}
+    for entry in entries:
+        category = entry["category"]["cat_title"]
+        ghdb.setdefault(category, []).append(_get_text(entry["url_title"]))
+    return ghdb
+
+
+def synthetic(entries, n):
+    out = []
+    for i in range(n):
+        entry = copy.copy(entries[i % len(entries)])
+        entry["id"] = str(i + 1)
+        if i % 10 == 0:
+            entry["url_title"] = entry["url_title"].replace("</a>", " &amp; &quot;x&quot;</a>")
+        out.append(entry)
+    return out
+
+
+def best(fn, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def measure(label, entries, workers, runs):
+    n = len(entries)
+    print(f"{label}: {n:,} records")
+    old_s, old = best(lambda: legacy(entries), runs)
+    old_name = "old loop (bs4)" if BeautifulSoup is not None else "old loop (html.parser)"
+    rows = [(old_name, old_s, True)]
+    for w in sorted({1, workers}):
+        new_s, records = best(lambda: convert(entries, workers=w, chunk=max(1, min(50000, n // w))), runs)
+        # the old loop's entity handling differs in one place: it decodes "&num" (no ";") as "#"
+        same = sum(len(v) for v in dorks_by_category(records).values()) == sum(len(v) for v in old.values())
+        rows.append((f"converter, {w} worker{'s' if w > 1 else ''}", new_s, same))
+    for name, seconds, ok in rows:
+        print(f"  {name:<26}{n / seconds:>12,.0f} records/s{seconds:>9.2f} s  {'ok' if ok else 'MISMATCH'}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=1000000, help="size of the synthetic export")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+    print(f"{os.cpu_count()} CPU(s)")
+    entries = load_export(os.path.join(ROOT, "dorks", "ghdb.json"))
+    measure("dorks/ghdb.json", entries, args.workers, args.runs)
+    if args.records:
+        measure("synthetic export", synthetic(entries, args.records), args.workers, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Favorite toggles on a large multi-select: the old per-dork loop against the
+batched one the GUI uses now.
+
+    python benchmarks/bench_favorites.py [--select 5000]
+
+The old loop asked SQLite whether each dork was a favorite, found its
+category by calling _norm() on every listed dork, and committed one write
+per dork. The new one answers both from in-memory indexes (FavoritesStore's
+set and CategoryIndex) and writes everything in one batch, flushed before
+the clock stops.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedded_ghdb import GHDB_DATA  # noqa: E402
+from pagodo_core import _norm  # noqa: E402
+from pagodo_db import DorkDatabase, FavoritesStore  # noqa: E402
+from pagodo_index import CategoryIndex  # noqa: E402
+
+
+def toggle_old(db, dorks_by_category, selection):
+    for dork in selection:
+        dork = _norm(dork)
+        if db.execute("SELECT 1 FROM favorites WHERE dork=?", (dork,)):
+            db.write("DELETE FROM favorites WHERE dork=?", (dork,))
+            continue
+        cat = next((c for c, lst in dorks_by_category.items() if any(_norm(x) == dork for x in lst)), "")
+        db.write("INSERT OR IGNORE INTO favorites (dork, category_id) VALUES (?, ?)",
+                 (dork, db.category_id(cat)))
+
+
+def toggle_new(store, index, selection):
+    unstar, star = {}, {}
+    for dork in selection:
+        dork = _norm(dork)
+        if dork in unstar or dork in star:
+            continue
+        if store.is_favorite(dork):
+            unstar[dork] = None
+        else:
+            star[dork] = index.category_of(dork) or ""
+    with store.batch():
+        store.remove_many(unstar)
+        store.add_many(star.items())
+    store.db.flush()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--select", type=int, default=5000)
+    ap.add_argument("--old", type=int, default=200, help="dorks for the old loop (it is slow)")
+    args = ap.parse_args()
+
+    dorks_by_category = {cat: list(dorks) for cat, dorks in GHDB_DATA.items()}
+    every = [d for dorks in dorks_by_category.values() for d in dorks]
+    selection = random.Random(1).sample(every, min(args.select, len(every)))
+    print(f"{len(every):,} dorks in {len(dorks_by_category)} categories")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DorkDatabase(os.path.join(tmp, "dorks.sqlite3"))
+        n = min(args.old, len(selection))
+        t0 = time.perf_counter()
+        toggle_old(db, dorks_by_category, selection[:n])
+        dt = time.perf_counter() - t0
+        print(f"old loop, {n:,} dorks: {dt * 1000:.0f} ms"
+              f" (~{dt / n * len(selection):.1f} s for {len(selection):,})")
+        db.write("DELETE FROM favorites")
+
+        store = FavoritesStore(db)
+        t0 = time.perf_counter()
+        index = CategoryIndex(dorks_by_category)
+        print(f"CategoryIndex built in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        for label in ("star", "unstar"):
+            t0 = time.perf_counter()
+            toggle_new(store, index, selection)
+            print(f"{label} {len(selection):,} dorks: {(time.perf_counter() - t0) * 1000:.1f} ms"
+                  f" ({store.count():,} favorites)")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
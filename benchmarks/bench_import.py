@@ -0,0 +1,102 @@
+"""
+Streaming import of a large dork file, as Import Dorks… runs it.
+
+    python benchmarks/bench_import.py [--dorks 1000000] [--layout list|dict] [--cancel-after 0] [--memory]
+
+Writes a synthetic export (about 100 bytes per dork), then imports it
+with DorkImporter into a scratch database, de-duplicating against the
+embedded GHDB list. Prints throughput, how long the worker took to stop
+when cancelled and, with --memory, the peak memory of the run.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from bench_search import make_dorks  # noqa: E402
+from embedded_ghdb import GHDB_DATA  # noqa: E402
+from pagodo_db import DorkDatabase, UserDorkStore  # noqa: E402
+from pagodo_import import DorkImporter  # noqa: E402
+from pagodo_index import CategoryIndex  # noqa: E402
+
+
+def write_file(path, dorks, layout):
+    cats = list(GHDB_DATA) + ["Community"]
+    with open(path, "w", encoding="utf-8") as f:
+        if layout == "dict":
+            f.write("{")
+            for i, cat in enumerate(cats):
+                f.write(("," if i else "") + json.dumps(cat) + ": ")
+                json.dump(dorks[i::len(cats)], f, indent=2)
+            f.write("}")
+        else:
+            f.write("[\n")
+            for i, d in enumerate(dorks):
+                f.write(("," if i else "") + json.dumps({"category": cats[i % len(cats)], "dork": d}) + "\n")
+            f.write("]")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dorks", type=int, default=1_000_000)
+    ap.add_argument("--layout", choices=("list", "dict"), default="list")
+    ap.add_argument("--cancel-after", type=float, default=0, help="cancel after this many seconds")
+    ap.add_argument("--memory", action="store_true", help="trace peak memory (slows the run down a lot)")
+    args = ap.parse_args()
+
+    embedded = [d for dorks in GHDB_DATA.values() for d in dorks]
+    dorks = make_dorks(args.dorks) + embedded[:1000]  # some already listed
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dorks.json")
+        write_file(path, dorks, args.layout)
+        print(f"{len(dorks):,} dorks, {os.path.getsize(path) / 1e6:.0f} MB ({args.layout} layout)")
+        del dorks
+
+        index = CategoryIndex(GHDB_DATA)
+        db = DorkDatabase(os.path.join(tmp, "dorks.sqlite3"))
+        done = threading.Event()
+        events = {"added": 0, "progress": 0}
+        result = {}
+
+        def on_event(kind, payload):
+            if kind in events:
+                events[kind] += 1
+            else:
+                result.update(payload, status=kind, at=time.perf_counter())
+                done.set()
+
+        importer = DorkImporter(path, known=lambda nd: nd in index, categories=GHDB_DATA,
+                                fallback="Imported Dorks", user_store=UserDorkStore(db), on_event=on_event)
+        if args.memory:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        importer.start()
+        if args.cancel_after:
+            done.wait(args.cancel_after)
+            t_cancel = time.perf_counter()
+            importer.cancel()
+        done.wait()
+        dt = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] if args.memory else 0
+        tracemalloc.stop()
+        db.close()
+
+    print(f"{result['status']} in {dt:.1f}s: {result['read']:,} read, {result['added']:,} new,"
+          f" {result['duplicates']:,} duplicates ({result['read'] / dt:,.0f} rows/s)")
+    print(f"{events['added']} batches, {events['progress']} progress events")
+    if args.memory:
+        print(f"peak traced memory {peak / 1e6:.0f} MB")
+    if args.cancel_after:
+        print(f"stopped {(result['at'] - t_cancel) * 1000:.0f} ms after cancel")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Memory held by the loaded dork collection, as PagodoGUI builds it.
+
+    python benchmarks/bench_memory.py [--dorks 1000000] [--favorites 0.01]
+
+Builds the per-category lists, CategoryIndex, the search indexes and the
+favorites set for the embedded GHDB list and for a synthetic collection,
+loading the dorks back from a scratch database the way a saved dork list
+comes in. Reports the memory tracemalloc sees still allocated after each
+step and how long the whole build took (tracemalloc slows it down).
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from bench_search import make_dorks  # noqa: E402
+from embedded_ghdb import GHDB_DATA  # noqa: E402
+from pagodo_db import DorkDatabase, DorkListStore, FavoritesStore, normalize_full  # noqa: E402
+from pagodo_index import CategoryIndex, DorkIndex  # noqa: E402
+
+
+def build(db, favorites):
+    """The GUI's startup state from a saved dork list; [(step, bytes held), ...]."""
+    state, steps = {}, []
+
+    def step(name):
+        gc.collect()
+        steps.append((name, tracemalloc.get_traced_memory()[0]))
+
+    step("start")
+    state["lists"] = normalize_full(DorkListStore(db).load())
+    step("category lists")
+    state["categories"] = CategoryIndex(state["lists"])
+    step("CategoryIndex")
+    fav = FavoritesStore(db)
+    fav.add_many(favorites)
+    state["favorites"] = fav
+    step("favorites")
+    index = DorkIndex(d for dorks in state["lists"].values() for d in dorks)
+    index.update(r["dork"] for r in fav.load())
+    state["search"] = index
+    step("search indexes")
+    return state, steps
+
+
+def report(label, make, share):
+    """Save make()'s dork list to a scratch database, drop it, then time and measure the build."""
+    dorks_by_category = make()
+    total = sum(len(v) for v in dorks_by_category.values())
+    every = [d for dorks in dorks_by_category.values() for d in dorks]
+    favorites = [(d, "Bench") for d in every[::max(1, int(1 / share))]] if share else []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DorkDatabase(os.path.join(tmp, "dorks.sqlite3"))
+        DorkListStore(db).save(dorks_by_category)
+        db.flush()
+        del every, dorks_by_category  # only the embedded list stays in memory in the app
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        state, steps = build(db, favorites)
+        dt = time.perf_counter() - t0
+        tracemalloc.stop()
+        db.close()
+    print(f"{label}: {total:,} dorks, {len(favorites):,} favorites, built in {dt:.1f}s")
+    prev = steps[0][1]
+    for name, held in steps[1:]:
+        print(f"  {name:<16}{(held - prev) / 1e6:>9.1f} MB")
+        prev = held
+    held = steps[-1][1] - steps[0][1]
+    print(f"  {'total':<16}{held / 1e6:>9.1f} MB ({held / total:.0f} bytes/dork)")
+    del state
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dorks", type=int, default=1_000_000)
+    ap.add_argument("--favorites", type=float, default=0.01, help="share of dorks starred")
+    args = ap.parse_args()
+
+    def synthetic():
+        cats = list(GHDB_DATA)
+        dorks = make_dorks(args.dorks)
+        return {c: dorks[i::len(cats)] for i, c in enumerate(cats)}
+
+    report("embedded", lambda: GHDB_DATA, args.favorites)
+    report("synthetic", synthetic, args.favorites)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold-start load of the embedded dork list: the old embedded_ghdb.py dict
+literal against the packed embedded_ghdb.pack.
+
+    python benchmarks/bench_pack.py [--dorks 0] [--runs 5]
+
+Each variant is imported in a fresh interpreter and the import alone is
+timed: the literal both compiled from source (first start, or a frozen
+build without its .pyc) and unmarshalled from a warm .pyc, the pack
+through embedded_ghdb.py and pagodo_pack with their .pyc files warm.
+"frozen" is the literal as a PyInstaller build holds it: marshalled code,
+zlib-compressed in the archive.
+With --dorks N a synthetic list of N dorks is measured too, to show how
+both grow.
+"""
+import argparse
+import json
+import marshal
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import zlib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from embedded_ghdb import GHDB_DATA  # noqa: E402
+from pagodo_pack import write_pack  # noqa: E402
+
+# modules the GUI has imported anyway by the time it loads the list
+TIMER = ("import collections, json, os, sys, time; sys.path.insert(0, {path!r}); t = time.perf_counter(); "
+         "from embedded_ghdb import GHDB_DATA; print(time.perf_counter() - t)")
+# a PyInstaller build keeps modules as zlib-compressed marshalled code in its archive
+FROZEN = ("import collections, json, os, sys, time, marshal, zlib; blob = open({path!r}, 'rb').read(); "
+          "t = time.perf_counter(); ns = {{}}; exec(marshal.loads(zlib.decompress(blob)), ns); "
+          "print(time.perf_counter() - t)")
+
+
+def write_literal(data, path):
+    # what convert_json_to_python.py used to emit
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Auto-generated file. Do not edit manually.\n")
+        f.write("GHDB_DATA = ")
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def run_ms(code, runs, bytecode=True):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    cmd = [sys.executable, "-c", code] if bytecode else [sys.executable, "-B", "-c", code]
+    times = [float(subprocess.check_output(cmd, text=True, env=env)) for _ in range(runs)]
+    return statistics.median(times) * 1000
+
+
+def import_ms(path, runs, bytecode):
+    if not bytecode:
+        shutil.rmtree(os.path.join(path, "__pycache__"), ignore_errors=True)
+    return run_ms(TIMER.format(path=path), runs, bytecode)
+
+
+def measure(label, data, runs):
+    total = sum(len(v) for v in data.values())
+    print(f"{label}: {total:,} dorks in {len(data)} categories")
+    with tempfile.TemporaryDirectory() as tmp:
+        literal, packed = os.path.join(tmp, "literal"), os.path.join(tmp, "packed")
+        os.makedirs(literal)
+        os.makedirs(packed)
+        write_literal(data, os.path.join(literal, "embedded_ghdb.py"))
+        for name in ("embedded_ghdb.py", "pagodo_pack.py"):
+            shutil.copy(os.path.join(ROOT, name), packed)
+        write_pack(data, os.path.join(packed, "embedded_ghdb.pack"))
+
+        compiled = import_ms(literal, runs, bytecode=False)
+        import_ms(literal, 1, bytecode=True)  # write the .pyc
+        pyc = os.path.join(literal, "__pycache__", os.listdir(os.path.join(literal, "__pycache__"))[0])
+        unmarshalled = import_ms(literal, runs, bytecode=True)
+        source = os.path.join(literal, "embedded_ghdb.py")
+        with open(source, encoding="utf-8") as f:
+            code = compile(f.read(), source, "exec")
+        frozen = os.path.join(tmp, "embedded_ghdb.pyz")
+        with open(frozen, "wb") as f:
+            f.write(zlib.compress(marshal.dumps(code)))
+        frozen_ms = run_ms(FROZEN.format(path=frozen), runs)
+        import_ms(packed, 1, bytecode=True)
+        pack_ms = import_ms(packed, runs, bytecode=True)
+
+        rows = [("literal, compiled", os.path.getsize(os.path.join(literal, "embedded_ghdb.py")), compiled),
+                ("literal, from .pyc", os.path.getsize(pyc), unmarshalled),
+                ("literal, frozen", os.path.getsize(frozen), frozen_ms),
+                ("pack", os.path.getsize(os.path.join(packed, "embedded_ghdb.pack")), pack_ms)]
+    for name, size, ms in rows:
+        print(f"  {name:<20}{size / 1e3:>10,.0f} KB{ms:>10.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dorks", type=int, default=0, help="also measure a synthetic list of this many dorks")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    measure("embedded", GHDB_DATA, args.runs)
+    if args.dorks:
+        from bench_search import make_dorks
+        cats = list(GHDB_DATA)
+        dorks = make_dorks(args.dorks)
+        measure("synthetic", {c: dorks[i::len(cats)] for i, c in enumerate(cats)}, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Scan engine throughput against a local stub search server.
+
+    python benchmarks/bench_scan.py [--dorks 512] [--latency 0.05]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pagodo_core  # noqa: E402
+from stub_server import StubSearchServer  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dorks", type=int, default=512)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--levels", default="1,8,32,128")
+    args = ap.parse_args()
+
+    dorks = [f'intitle:"index of" bench-{i}' for i in range(args.dorks)]
+    with StubSearchServer(latency=args.latency) as server:
+        pagodo_core.ENGINES["Stub"] = server.template
+        print(f"{args.dorks} dorks, {args.latency * 1000:.0f} ms simulated latency")
+        print(f"{'in-flight':>10} {'seconds':>10} {'queries/s':>10}")
+        for level in (int(x) for x in args.levels.split(",")):
+            # 1 in-flight is the old serial loop; keep it short so the run stays bearable
+            n = min(len(dorks), 64) if level == 1 else len(dorks)
+            t0 = time.perf_counter()
+            results = pagodo_core.run_pagodo_scan(dorks[:n], engine="Stub", concurrency=level)
+            dt = time.perf_counter() - t0
+            assert len(results) == n
+            print(f"{level:>10} {dt:>10.2f} {n / dt:>10.1f}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = pagodo_core.ResultCache(path=os.path.join(tmp, "cache.sqlite3"))
+            pagodo_core.run_pagodo_scan(dorks, engine="Stub", concurrency=128, cache=cache)
+            t0 = time.perf_counter()
+            pagodo_core.run_pagodo_scan(dorks, engine="Stub", concurrency=128, cache=cache)
+            dt = time.perf_counter() - t0
+            print(f"repeat scan from cache: {dt:.3f} s ({cache.stats()['hits']} hits)")
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Dork search benchmark: TrigramIndex against the old lowercase substring scan,
+ranked operator queries on DorkSearchEngine, and FacetIndex filters.
+
+    python benchmarks/bench_search.py [--dorks 1000000] [--queries 200] [--fulltext 100000]
+
+Builds a synthetic collection shaped like GHDB dorks (operators, paths,
+file types, vendor names), then times queries of the kinds people type in
+the search box. Every substring result is checked against the linear scan.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from pagodo_index import DorkSearchEngine, FacetIndex, TrigramIndex  # noqa: E402
+
+OPERATORS = ("inurl:", "intitle:", "intext:", "filetype:", "ext:", "site:", "allinurl:", "allintitle:")
+WORDS = (
+    "admin", "login", "config", "backup", "password", "index of", "phpmyadmin", "wp-content", "uploads",
+    "database", "sql", "dump", "env", "secret", "api", "token", "jenkins", "grafana", "kibana", "tomcat",
+    "apache", "nginx", "server-status", "webcam", "camera", "printer", "router", "setup", "install",
+    "debug", "error", "log", "private", "confidential", "invoice", "report", "employee", "dashboard",
+)
+EXTS = ("sql", "log", "env", "bak", "xls", "pdf", "conf", "ini", "txt", "xml", "json", "yml")
+FIELD_QUERIES = ("filetype:sql dump", "filetype:env secret", "inurl:admin OR intitle:login",
+                 "intitle:\"index of\" -filetype:log", "(inurl:jenkins OR inurl:grafana) dashboard",
+                 "ext:bak config", "intext:passw", "site:", "NOT admin")
+FACET_QUERIES = ({"filetype": "sql"}, {"operator": "intitle", "filetype": "env"},
+                 {"operator": "allinurl", "term": "admin"}, {"term": "password"})
+QUERIES = ("admin", "phpmyadmin", "filetype:sql", "index of", "server-status", "intitle:\"index of\"",
+           "grafana", "wp-content/uploads", "ext:env", "jenkins")
+
+
+def make_dorks(n, seed=1):
+    rnd = random.Random(seed)
+    out = set()
+    while len(out) < n:
+        parts = []
+        for _ in range(rnd.randint(1, 4)):
+            op = rnd.choice(OPERATORS)
+            if op in ("filetype:", "ext:"):
+                parts.append(op + rnd.choice(EXTS))
+            else:
+                term = rnd.choice(WORDS)
+                if rnd.random() < 0.4:
+                    term += "/" + rnd.choice(WORDS) + str(rnd.randint(0, 999))
+                parts.append(op + (f'"{term}"' if " " in term else term))
+        out.add(" ".join(parts) + f" {rnd.randint(0, 99999)}")
+    return list(out)
+
+
+def linear(dorks, query):
+    q = query.lower()
+    return [d for d in dorks if q in d.lower()]
+
+
+def timed(fn, *args, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dorks", type=int, default=1_000_000)
+    ap.add_argument("--queries", type=int, default=200, help="extra random word queries")
+    ap.add_argument("--fulltext", type=int, default=100_000, help="dorks for the ranked search part (0 skips)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    dorks = make_dorks(args.dorks)
+    print(f"generated {len(dorks):,} dorks in {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    index = TrigramIndex(dorks)
+    print(f"built index in {time.perf_counter() - t0:.1f}s ({len(index._postings):,} grams)")
+
+    rnd = random.Random(2)
+    queries = list(QUERIES) + [rnd.choice(WORDS) + str(rnd.randint(0, 999)) for _ in range(args.queries)]
+
+    print(f"\n{'query':<26}{'hits':>9}{'index ms':>11}{'scan ms':>10}")
+    index_times = []
+    for i, q in enumerate(queries):
+        t_index, hits = timed(index.search, q)
+        index_times.append(t_index)
+        if i < len(QUERIES):
+            t_scan, expected = timed(linear, dorks, q, repeat=1)
+            assert hits == expected, f"result mismatch for {q!r}"
+            print(f"{q:<26}{len(hits):>9,}{t_index * 1000:>11.2f}{t_scan * 1000:>10.1f}")
+        elif i < len(QUERIES) + 5:
+            assert hits == linear(dorks, q), f"result mismatch for {q!r}"
+
+    index_times.sort()
+    print(f"\nall {len(queries)} queries: median {statistics.median(index_times) * 1000:.2f} ms,"
+          f" p95 {index_times[int(len(index_times) * 0.95) - 1] * 1000:.2f} ms,"
+          f" max {index_times[-1] * 1000:.2f} ms")
+
+    t0 = time.perf_counter()
+    for d in dorks[:10000]:
+        index.remove(d)
+        index.add(d)
+    print(f"10,000 remove+add: {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    if args.fulltext:
+        del index
+        subset = dorks[:args.fulltext]
+        t0 = time.perf_counter()
+        engine = DorkSearchEngine(subset)
+        print(f"\nranked search over {len(subset):,} dorks, built in {time.perf_counter() - t0:.1f}s")
+        print(f"{'query':<44}{'hits':>9}{'ms':>9}")
+        for q in FIELD_QUERIES:
+            t, hits = timed(engine.search, q)
+            print(f"{q:<44}{len(hits):>9,}{t * 1000:>9.2f}")
+
+        t0 = time.perf_counter()
+        facets = FacetIndex(subset)
+        print(f"\nfacets over {len(subset):,} dorks, built in {time.perf_counter() - t0:.1f}s")
+        print(f"{'filters':<44}{'hits':>9}{'ms':>9}")
+        for filters in FACET_QUERIES:
+            t, hits = timed(facets.select, filters)
+            label = " ".join(f"{k}={v}" for k, v in filters.items())
+            print(f"{label:<44}{len(hits):>9,}{t * 1000:>9.2f}")
+        for facet in ("operator", "filetype", "term"):
+            t, _ = timed(facets.counts, facet, {"filetype": "sql"})
+            print(f"{'counts ' + facet + ' | filetype=sql':<44}{'':>9}{t * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
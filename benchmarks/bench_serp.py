@@ -0,0 +1,70 @@
+"""
+SERP parser microbenchmark over the recorded pages in benchmarks/fixtures.
+
+    python benchmarks/bench_serp.py [--seconds 1.0]
+
+Reports pages/s and MB/s per engine parser, checks each parser still
+extracts the expected links, and times a stdlib html.parser pass over the
+same page for comparison.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from html.parser import HTMLParser
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from pagodo_serp import PARSERS  # noqa: E402
+
+
+class _HrefCollector(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self.hrefs.extend(v for k, v in attrs if k == "href")
+
+
+def _rate(fn, page, seconds):
+    n = 0
+    t0 = time.perf_counter()
+    while True:
+        fn(page)
+        n += 1
+        dt = time.perf_counter() - t0
+        if dt >= seconds:
+            return n / dt
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=1.0, help="time budget per measurement")
+    args = ap.parse_args()
+
+    with open(os.path.join(HERE, "fixtures", "expected.json"), encoding="utf-8") as f:
+        fixtures = json.load(f)
+    expected = fixtures["expected"]
+
+    def baseline(page):
+        p = _HrefCollector()
+        p.feed(page)
+        p.close()
+
+    print(f"{'engine':<12} {'KB/page':>8} {'pages/s':>10} {'MB/s':>8} {'html.parser pages/s':>20}  ok")
+    for engine, parser in PARSERS.items():
+        with open(os.path.join(HERE, "fixtures", fixtures[engine]), encoding="utf-8") as f:
+            page = f.read()
+        ok = parser.parse(page) == expected
+        pps = _rate(parser.parse, page, args.seconds)
+        base = _rate(baseline, page, args.seconds)
+        mbps = pps * len(page.encode("utf-8")) / 1e6
+        print(f"{engine:<12} {len(page) / 1024:>8.1f} {pps:>10.0f} {mbps:>8.1f} {base:>20.0f}  {'yes' if ok else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Near-duplicate detection over a large dork collection.
+
+    python benchmarks/bench_similar.py [--dorks 1000000] [--variants 0.05]
+
+Takes synthetic dorks, adds a variant of a fraction of them (case changed,
+a single word quoted, parts reordered or ext: for filetype:), builds a
+NearDuplicateIndex and reports build time, clusters and how many variants
+landed in their original's cluster. The embedded GHDB list is checked the
+same way for a view of real data.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from bench_search import make_dorks  # noqa: E402
+from embedded_ghdb import GHDB_DATA  # noqa: E402
+from pagodo_similar import NearDuplicateIndex  # noqa: E402
+
+
+def variant(dork, rnd):
+    parts = dork.split(" ")
+    kind = rnd.randrange(4)
+    if kind == 0:
+        return dork.upper()
+    if kind == 1:
+        i = rnd.randrange(len(parts))
+        return " ".join(parts[:i] + [f'"{parts[i]}"'] + parts[i + 1:]) if '"' not in parts[i] else dork.title()
+    if kind == 2 and len(parts) > 1:
+        return " ".join(parts[1:] + parts[:1])
+    return dork.replace("filetype:", "ext:") if "filetype:" in dork else dork.swapcase()
+
+
+def run(label, dorks):
+    t0 = time.perf_counter()
+    index = NearDuplicateIndex(dorks)
+    dt = time.perf_counter() - t0
+    clusters = index.clusters()
+    print(f"{label}: {len(dorks):,} dorks in {dt:.1f}s ({dt / len(dorks) * 1e6:.0f} µs/dork),"
+          f" {len(clusters):,} clusters, {sum(len(c.members) for c in clusters):,} dorks clustered")
+    return index
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dorks", type=int, default=1_000_000)
+    ap.add_argument("--variants", type=float, default=0.05, help="share of dorks given a variant")
+    args = ap.parse_args()
+
+    embedded = list(dict.fromkeys(d for dorks in GHDB_DATA.values() for d in dorks))
+    run("embedded", embedded)
+
+    rnd = random.Random(1)
+    dorks = make_dorks(args.dorks)
+    n = len(dorks)
+    picked = rnd.sample(range(n), int(n * args.variants))
+    pairs = [(i, len(dorks) + k) for k, i in enumerate(picked)]
+    dorks.extend(variant(dorks[i], rnd) for i in picked)
+    index = run("synthetic", dorks)
+    found = sum(index._find(a) == index._find(b) for a, b in pairs)
+    print(f"variants found: {found:,} of {len(pairs):,} ({found / len(pairs):.1%})")
+
+
+if __name__ == "__main__":
+    main()
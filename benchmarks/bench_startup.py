@@ -0,0 +1,117 @@
+"""
+Startup: time to first paint and time to interactive.
+
+    python benchmarks/bench_startup.py [--dorks 0] [--user 0] [--runs 5] [--headless]
+
+Launches pagodo_gui.py --profile-startup --exit-when-ready against a
+scratch data folder (seeded with a saved list of --dorks synthetic dorks,
+else the embedded list is used, and --user dorks of the user's own) and
+reads the "first paint" and
+"interactive" marks it prints, counted from the moment the process was
+launched. Needs a display and ttkbootstrap.
+
+--headless skips the GUI and times load_dork_state(), the work that used
+to run before the window appeared and now runs behind it, phase by phase:
+cold (no snapshot, so the list is normalized, merged and snapshotted) and
+warm (read back from the snapshot).
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+_MARK = re.compile(r"^\s*([\d.]+)\s{8,}(first paint|interactive)$", re.M)
+
+
+def seed(config_home, n, user):
+    """n synthetic dorks as the saved list and user more as the user's own, in the scratch data folder."""
+    from bench_search import make_dorks
+    from embedded_ghdb import GHDB_DATA
+    from pagodo_core import _appdata_dir
+    from pagodo_db import DorkDatabase, DorkListStore, UserDorkStore
+    os.environ["XDG_CONFIG_HOME"] = os.environ["APPDATA"] = config_home
+    cats = list(GHDB_DATA)
+    dorks = make_dorks(n + user)
+    db = DorkDatabase(_appdata_dir() / "dorks.sqlite3")
+    if n:
+        DorkListStore(db).save({c: dorks[i:n:len(cats)] for i, c in enumerate(cats)})
+    if user:
+        UserDorkStore(db).add_many((cats[i % len(cats)], d) for i, d in enumerate(dorks[n:]))
+    db.close()
+
+
+def gui_run(config_home):
+    env = dict(os.environ, XDG_CONFIG_HOME=config_home, APPDATA=config_home)
+    env["PAGODO_STARTUP_T0"] = repr(time.time())
+    out = subprocess.run([sys.executable, os.path.join(ROOT, "pagodo_gui.py"), "--profile-startup",
+                          "--exit-when-ready"], env=env, capture_output=True, text=True, timeout=600)
+    marks = dict((name, float(at)) for at, name in _MARK.findall(out.stderr))
+    if len(marks) != 2:
+        raise SystemExit(f"no startup report from pagodo_gui.py:\n{out.stderr[-2000:]}")
+    return marks, out.stderr
+
+
+def headless(config_home, runs):
+    from pagodo_core import _appdata_dir
+    from pagodo_startup import SNAPSHOT_NAME, StartupProfile, load_dork_state
+    os.environ["XDG_CONFIG_HOME"] = os.environ["APPDATA"] = config_home
+    path = _appdata_dir() / "dorks.sqlite3"
+    totals = {"cold": {}, "warm": {}}
+    for _ in range(runs):
+        for start in totals:
+            if start == "cold" and path.with_name(SNAPSHOT_NAME).exists():
+                path.with_name(SNAPSHOT_NAME).unlink()
+            profile = StartupProfile(True, origin=time.time())
+            state = load_dork_state(profile, path)
+            for name, _start, seconds, _thread in profile.phases:
+                totals[start].setdefault(name, []).append(seconds)
+            state.db.close()
+    print("load_dork_state phases (median ms):")
+    print(f"  {'':<18}{'cold':>9}{'warm':>9}")
+    names = list(totals["cold"]) + [n for n in totals["warm"] if n not in totals["cold"]]
+    for name in names + ["total"]:
+        cells = []
+        for start in totals:
+            if name == "total":
+                cells.append(sum(statistics.median(t) for t in totals[start].values()))
+            else:
+                cells.append(statistics.median(totals[start][name]) if name in totals[start] else None)
+        print(f"  {name:<18}" + "".join(f"{c * 1000:>9.1f}" if c is not None else f"{'-':>9}" for c in cells))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dorks", type=int, default=0, help="seed a saved list of this many dorks")
+    ap.add_argument("--user", type=int, default=0, help="seed this many user dorks")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--headless", action="store_true", help="time the background loading only")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dorks or args.user:
+            seed(tmp, args.dorks, args.user)
+        if args.headless:
+            headless(tmp, args.runs)
+            return
+        paint, ready = [], []
+        for i in range(args.runs):
+            marks, report = gui_run(tmp)
+            paint.append(marks["first paint"])
+            ready.append(marks["interactive"])
+            if i == 0:
+                print(report.strip())
+    print(f"first paint: median {statistics.median(paint) * 1000:.0f} ms, "
+          f"interactive: median {statistics.median(ready) * 1000:.0f} ms ({args.runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
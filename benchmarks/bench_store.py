@@ -0,0 +1,74 @@
+"""
+Cost of one user-dork or favorite add against the size of the store.
+
+    python benchmarks/bench_store.py [--sizes 1000,10000,100000] [--adds 200]
+
+For each size the database is pre-filled, then single adds are timed with
+a commit each (write_delay=0) and coalesced the way the GUI issues them,
+where the commit happens later on the background writer. The old JSON
+stores rewrote the whole indented file per add; that is timed too.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagodo_db import DorkDatabase, FavoritesStore, UserDorkStore  # noqa: E402
+
+
+def json_add(path, rows, item):
+    rows.append(item)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(rows, ensure_ascii=False, indent=2))
+    os.replace(tmp, path)
+
+
+def per_add_ms(fn, n):
+    times = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,10000,100000")
+    ap.add_argument("--adds", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"{'stored':>9}{'user add ms':>13}{'fav add ms':>12}{'coalesced ms':>14}{'json add ms':>13}")
+    for size in (int(x) for x in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DorkDatabase(os.path.join(tmp, "dorks.sqlite3"), write_delay=0)
+            users, favs = UserDorkStore(db), FavoritesStore(db)
+            cid = db.category_id("Bench")
+            db.write_many("INSERT INTO user_dorks (category_id, dork) VALUES (?, ?)",
+                          ((cid, f"inurl:seed-{i}") for i in range(size)))
+            favs.add_many((f"inurl:seed-{i}", "Bench") for i in range(size))
+
+            user_ms = per_add_ms(lambda i: users.add("Bench", f"intitle:new-{i}"), args.adds)
+            fav_ms = per_add_ms(lambda i: favs.add(f"intitle:new-{i}", "Bench"), args.adds)
+            db.close()
+
+            db = DorkDatabase(os.path.join(tmp, "dorks.sqlite3"))
+            favs = FavoritesStore(db)
+            coalesced_ms = per_add_ms(lambda i: favs.add(f"intext:new-{i}", "Bench"), args.adds)
+            db.close()
+
+            path = os.path.join(tmp, "user_dorks.json")
+            rows = [{"category": "Bench", "dork": f"inurl:seed-{i}"} for i in range(size)]
+            n = max(1, min(args.adds, 2_000_000 // size))
+            json_ms = per_add_ms(lambda i: json_add(path, rows, {"category": "Bench", "dork": f"new-{i}"}), n)
+        print(f"{size:>9,}{user_ms:>13.3f}{fav_ms:>12.3f}{coalesced_ms:>14.3f}{json_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Incremental GHDB update: time to refresh the dork database from a newer
+Exploit-DB export of --records rows.
+
+    python benchmarks/bench_update.py [--records 10000] [--churn 0.02] [--runs 3]
+
+Builds an export from dorks/ghdb.json (padded with synthetic rows), applies
+it to a scratch database once, then times update_from_export() with a
+refresh in which --churn of the rows were edited and as many removed and
+added, split into reading the export, diffing it and applying the delta.
+Also times the no-change refresh and, for comparison, replacing the whole
+list the way a reset and reimport did.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from pagodo_db import DorkDatabase, DorkListStore, GhdbRecordStore  # noqa: E402
+from pagodo_ghdb import (  # noqa: E402
+    diff_records, dorks_by_category, load_export, load_records, record_rows, update_from_export,
+)
+
+
+def make_export(n):
+    rows = load_export(os.path.join(ROOT, "dorks", "ghdb.json"))
+    out = []
+    for i in range(n):
+        row = copy.copy(rows[i % len(rows)])
+        if i >= len(rows):
+            row["id"] = str(100000 + i)
+            row["url_title"] = row["url_title"].replace("</a>", f" site:{i}.example</a>")
+        out.append(row)
+    return out
+
+
+def churn(rows, fraction, seed=1):
+    rng = random.Random(seed)
+    k = max(1, int(len(rows) * fraction))
+    rows = [copy.copy(r) for r in rows]
+    for r in rng.sample(rows, k):
+        r["url_title"] = r["url_title"].replace("</a>", " ext:bak</a>")
+    gone = set(rng.sample(range(len(rows)), k))
+    rows = [r for i, r in enumerate(rows) if i not in gone]
+    top = max(int(r["id"]) for r in rows)
+    for i in range(k):
+        r = copy.copy(rows[i])
+        r["id"] = str(top + 1 + i)
+        r["url_title"] = f'<a href="/ghdb/{top + 1 + i}">inurl:added{i} intitle:"index of"</a>'
+        rows.append(r)
+    return rows
+
+
+def write(rows, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"data": rows}, f)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=10000)
+    ap.add_argument("--churn", type=float, default=0.02, help="fraction of rows edited, and again removed and added")
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    base = make_export(args.records)
+    with tempfile.TemporaryDirectory() as tmp:
+        old, new = os.path.join(tmp, "old.json"), os.path.join(tmp, "new.json")
+        write(base, old)
+        write(churn(base, args.churn), new)
+        print(f"export: {args.records:,} records, {os.path.getsize(new) / 1e6:.1f} MB")
+        timings = {}
+        for run in range(args.runs):
+            db = DorkDatabase(os.path.join(tmp, f"run{run}.sqlite3"), write_delay=0)
+            update_from_export(db, old)
+            t0 = time.perf_counter()
+            update_from_export(db, old)
+            timings.setdefault("no-change refresh", []).append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            rows = record_rows(load_records(new))
+            t1 = time.perf_counter()
+            store = GhdbRecordStore(db)
+            delta = diff_records(rows, store.digests())
+            t2 = time.perf_counter()
+            added, dropped = store.apply([rows[rid] for rid in delta.added + delta.changed], delta.removed)
+            t3 = time.perf_counter()
+            for name, seconds in (("read export", t1 - t0), ("diff", t2 - t1), ("apply", t3 - t2),
+                                  ("refresh total", t3 - t0)):
+                timings.setdefault(name, []).append(seconds)
+
+            t0 = time.perf_counter()
+            DorkListStore(db).save(dorks_by_category(load_records(new)))
+            timings.setdefault("full replace", []).append(time.perf_counter() - t0)
+            db.close()
+        print(f"delta: {len(delta.added)} added, {len(delta.changed)} changed, {len(delta.removed)} removed"
+              f" -> list +{len(added)} -{len(dropped)}")
+        for name, times in timings.items():
+            print(f"  {name:<20}{statistics.median(times) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Local stand-in for a search engine, used by the benchmarks.
+
+Every GET sleeps for `latency` seconds (simulating network + engine time)
+and answers with a small results page.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE = (
+    "<html><body>"
+    + "".join(f'<div class="g"><a href="https://example.com/result/{i}">Result {i}</a></div>' for i in range(10))
+    + "</body></html>"
+).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class StubSearchServer:
+    def __init__(self, latency=0.05):
+        self.httpd = _Server(("127.0.0.1", 0), _Handler)
+        self.httpd.latency = latency
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def template(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/search?q={{query}}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,191 @@
+"""
+Build every dork data artifact in one pass.
+
+    python build_dork_data.py [--force] [--export dorks/ghdb.json]
+                              [--dorks-folder dorks] [--cache build/dork_data]
+
+The three steps that used to be separate scripts, plus copying the result
+around by hand, run as stages:
+
+    export        dorks/ghdb.json (Exploit-DB)   -> cache/export.json
+    dorks files   dorks/*.dorks                  -> cache/dorks_files.json
+    merge         both of the above              -> ghdb_full.json
+    copies        ghdb_full.json                 -> dorks/ghdb_full.json, dist/ghdb_full.json
+    pack          ghdb_full.json                 -> embedded_ghdb.pack
+
+The export's categories come first, exactly as listed; a .dorks file adds
+the dorks it does not repeat to the category of the same name, or a new
+category.
+
+A stage runs only when it has to. Its key is a SHA-256 over the stage's
+name, BUILD_VERSION and the contents of its inputs. cache/manifest.json
+records each stage's last key and the hashes of the outputs it wrote, and
+a stage whose key is unchanged and whose outputs are still the files it
+wrote is skipped. A stage whose inputs are all missing (no export, no
+.dorks files) removes its output. --force runs everything.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from collections import namedtuple
+
+from build_ghdb_json import dorks_files, read_dorks_files
+from pagodo_ghdb import convert, dorks_by_category, load_export
+from pagodo_pack import EMBEDDED_PACK, read_pack, write_pack
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# bump when a stage starts producing different output from the same inputs
+BUILD_VERSION = 1
+
+# run(inputs, outputs) builds the outputs; optional stages may have no inputs at all
+Stage = namedtuple("Stage", "name inputs outputs run optional")
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def _rel(path):
+    return os.path.relpath(path, ROOT).replace(os.sep, "/")
+
+
+def _write_json(data, path, indent=2):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        json.dump(data, out, indent=indent, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_export(inputs, outputs):
+    _write_json(dorks_by_category(convert(load_export(inputs[0]))), outputs[0])
+
+
+def run_dorks_files(inputs, outputs):
+    _write_json(read_dorks_files(inputs), outputs[0])
+
+
+def run_merge(inputs, outputs):
+    merged = {}
+    for path in inputs:
+        if not os.path.exists(path):
+            continue
+        for cat, dorks in _read_json(path).items():
+            if cat not in merged:
+                merged[cat] = list(dorks)  # as the source lists them, repeats included
+                continue
+            seen = set(merged[cat])
+            merged[cat].extend(d for d in dorks if d not in seen and not seen.add(d))
+    if not merged:
+        raise ValueError("no dorks: neither the export nor any .dorks file was found")
+    _write_json(merged, outputs[0])
+
+
+def run_copies(inputs, outputs):
+    for path in outputs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(inputs[0], f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+
+def run_pack(inputs, outputs):
+    data = _read_json(inputs[0])
+    write_pack(data, f"{outputs[0]}.tmp")
+    if read_pack(f"{outputs[0]}.tmp") != data:
+        raise ValueError(f"{_rel(outputs[0])} does not read back as {_rel(inputs[0])}")
+    os.replace(f"{outputs[0]}.tmp", outputs[0])
+
+
+def stages(export, dorks_folder, cache):
+    full = os.path.join(ROOT, "ghdb_full.json")
+    export_out = os.path.join(cache, "export.json")
+    files_out = os.path.join(cache, "dorks_files.json")
+    return [
+        Stage("export", [export], [export_out], run_export, True),
+        Stage("dorks files", dorks_files(dorks_folder), [files_out], run_dorks_files, True),
+        Stage("merge", [export_out, files_out], [full], run_merge, False),
+        Stage("copies", [full], [os.path.join(ROOT, "dorks", "ghdb_full.json"),
+                                 os.path.join(ROOT, "dist", "ghdb_full.json")], run_copies, False),
+        Stage("pack", [full], [EMBEDDED_PACK], run_pack, False),
+    ]
+
+
+def stage_key(stage):
+    h = hashlib.sha256(f"{stage.name}\0{BUILD_VERSION}".encode("utf-8"))
+    for path in stage.inputs:
+        h.update(f"\0{_rel(path)}\0{_sha256(path) or '-'}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def build(export, dorks_folder, cache, force=False):
+    """Run the stages that are out of date; returns [(stage name, status, seconds), ...]."""
+    manifest_path = os.path.join(cache, "manifest.json")
+    try:
+        manifest = _read_json(manifest_path)
+    except (OSError, ValueError):
+        manifest = {}
+    report = []
+    try:
+        for stage in stages(export, dorks_folder, cache):
+            start = time.perf_counter()
+            key = stage_key(stage)
+            entry = manifest.get(stage.name) or {}
+            if stage.optional and not any(os.path.exists(p) for p in stage.inputs):
+                for path in stage.outputs:
+                    if os.path.exists(path):
+                        os.remove(path)
+                manifest.pop(stage.name, None)
+                status = "no input"
+            elif (not force and entry.get("key") == key
+                  and all(entry.get("outputs", {}).get(_rel(p)) == _sha256(p) for p in stage.outputs)):
+                status = "cached"
+            else:
+                manifest.pop(stage.name, None)  # a failed run must not look up to date
+                stage.run(stage.inputs, stage.outputs)
+                manifest[stage.name] = {"key": key, "outputs": {_rel(p): _sha256(p) for p in stage.outputs}}
+                status = "built"
+            report.append((stage.name, status, time.perf_counter() - start))
+    finally:
+        # stages that finished stay cached even if a later one failed
+        _write_json(manifest, manifest_path)
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build ghdb_full.json and the embedded dork pack.")
+    ap.add_argument("--export", default=os.path.join(ROOT, "dorks", "ghdb.json"), help="Exploit-DB GHDB export")
+    ap.add_argument("--dorks-folder", default=os.path.join(ROOT, "dorks"), help="folder of *.dorks files")
+    ap.add_argument("--cache", default=os.path.join(ROOT, "build", "dork_data"), help="intermediates and manifest")
+    ap.add_argument("--force", action="store_true", help="rebuild every stage")
+    args = ap.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        report = build(args.export, args.dorks_folder, args.cache, args.force)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    for name, status, seconds in report:
+        print(f"  {name:<14}{status:<10}{seconds * 1000:>9.1f} ms")
+    print(f"✅ Dork data up to date ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
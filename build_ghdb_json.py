@@ -1,20 +1,27 @@
 import os
 import json
 
-def build_ghdb_json(dorks_folder, output_file="ghdb_full.json"):
-    ghdb = {}
+def dorks_files(dorks_folder):
+    """The *.dorks files in dorks_folder, sorted by name."""
+    if not os.path.isdir(dorks_folder):
+        return []
+    return sorted(os.path.join(dorks_folder, f) for f in os.listdir(dorks_folder) if f.endswith(".dorks"))
 
-    for filename in os.listdir(dorks_folder):
-        if not filename.endswith(".dorks"):
-            continue
-
-        category = filename.replace(".dorks", "").replace("_", " ").title()
-        filepath = os.path.join(dorks_folder, filename)
 
+def read_dorks_files(paths):
+    """{category: [dork, ...]} from *.dorks files, one dork per line; the file name is the category."""
+    ghdb = {}
+    for filepath in paths:
+        category = os.path.basename(filepath).replace(".dorks", "").replace("_", " ").title()
         with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
             dorks = [line.strip() for line in f if line.strip()]
             if dorks:
                 ghdb[category] = dorks
+    return ghdb
+
+
+def build_ghdb_json(dorks_folder, output_file="ghdb_full.json"):
+    ghdb = read_dorks_files(dorks_files(dorks_folder))
 
     with open(output_file, "w", encoding="utf-8") as out:
         json.dump(ghdb, out, indent=2, ensure_ascii=False)
@@ -23,6 +30,7 @@ def build_ghdb_json(dorks_folder, output_file="ghdb_full.json"):
 
 # === USAGE ===
 # Place all your *.dorks files in a folder, e.g., "dorks/"
-# Then run this script:
+# Then run this script (or build_dork_data.py, which merges them into the
+# Exploit-DB list and rebuilds everything else):
 if __name__ == "__main__":
     build_ghdb_json("dorks")  # Replace "dorks" with your folder name
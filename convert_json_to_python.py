@@ -1,20 +1,25 @@
 import json
+import os
 
-# Input and output filenames
+from pagodo_pack import read_pack, write_pack
+
+# Input and output filenames; embedded_ghdb.py loads the pack at startup.
+# build_dork_data.py runs this step (and the ones before it) with caching.
 input_file = "ghdb_full.json"
-output_file = "embedded_ghdb.py"
+output_file = "embedded_ghdb.pack"
 
 def main():
     try:
         with open(input_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("# Auto-generated file. Do not edit manually.\n")
-            f.write("GHDB_DATA = ")
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        write_pack(data, output_file)
+        if read_pack(output_file) != data:
+            raise ValueError(f"{output_file} does not read back as {input_file}")
 
-        print(f"✅ Successfully wrote embedded data to {output_file}")
+        total = sum(len(v) for v in data.values())
+        print(f"✅ Successfully packed {total} dorks in {len(data)} categories into {output_file}"
+              f" ({os.path.getsize(output_file):,} bytes)")
 
     except Exception as e:
         print(f"❌ Error: {e}")
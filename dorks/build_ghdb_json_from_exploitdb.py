@@ -1,25 +1,60 @@
+"""
+Convert an Exploit-DB GHDB export (ghdb.json, as served by
+https://www.exploit-db.com/google-hacking-database) into the dork lists
+the app is built from.
+
+    python build_ghdb_json_from_exploitdb.py [ghdb.json] [-o ghdb_full.json]
+                                             [--records ghdb_records.json]
+                                             [--workers N] [--chunk 50000]
+
+Writes ghdb_full.json ({category: [dork, ...]}, what convert_json_to_python.py
+packs) and, with --records, every dork with the metadata the export carries:
+
+    {"categories": {"Files Containing Juicy Info":
+                        {"id": 8, "description": "No usernames or passwords, ..."}},
+     "dorks": [{"id": 2, "date": "2003-06-24", "author": "anonymous",
+                "category": "Files Containing Juicy Info",
+                "dork": "intitle:\\"Ganglia\\" \\"Cluster Report for\\""}, ...]}
+
+The parsing lives in pagodo_ghdb, which the app also uses to update its
+dork database from a newer export.
+"""
+import argparse
 import json
-from bs4 import BeautifulSoup
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagodo_ghdb import CHUNK, convert, dorks_by_category, load_export  # noqa: E402
+
 
-# Load your downloaded 'ghdb.json' file from Exploit-DB
-with open("ghdb.json", "r", encoding="utf-8") as f:
-    raw_data = json.load(f)
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Convert an Exploit-DB GHDB export to ghdb_full.json.")
+    ap.add_argument("export", nargs="?", default="ghdb.json")
+    ap.add_argument("-o", "--output", default="ghdb_full.json")
+    ap.add_argument("--records", help="also write every dork with its id, date, author and category")
+    ap.add_argument("--workers", type=int, default=None, help="processes for large exports (default: CPU count)")
+    ap.add_argument("--chunk", type=int, default=CHUNK, help="records per process chunk")
+    args = ap.parse_args(argv)
 
-# Prepare the categorized dictionary
-ghdb = {}
+    start = time.perf_counter()
+    entries = load_export(args.export)
+    records = convert(entries, args.workers, args.chunk)
+    ghdb = dorks_by_category(records)
 
-for entry in raw_data["data"]:
-    category = entry["category"]["cat_title"]
-    html = entry["url_title"]
-    # Extract clean text from HTML
-    dork = BeautifulSoup(html, "html.parser").get_text()
+    with open(args.output, "w", encoding="utf-8") as out:
+        json.dump(ghdb, out, indent=2, ensure_ascii=False)
+    if args.records:
+        with open(args.records, "w", encoding="utf-8") as out:
+            json.dump(records, out, indent=1, ensure_ascii=False)
 
-    if category not in ghdb:
-        ghdb[category] = []
-    ghdb[category].append(dork)
+    seconds = time.perf_counter() - start
+    print(f"[+] {args.output} created with {len(ghdb)} categories "
+          f"({len(records['dorks'])} dorks, {seconds:.2f} s).")
+    return 0
 
-# Save the final JSON output
-with open("ghdb_full.json", "w", encoding="utf-8") as out:
-    json.dump(ghdb, out, indent=2, ensure_ascii=False)
 
-print("[+] ghdb_full.json created with", len(ghdb), "categories.")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Headless entry point for long-running scans.
+
+    python pagodo_cli.py scan dorks.txt --domain example.com --output results.json
+    python pagodo_cli.py scan dorks.txt --domains-file scope.txt --concurrency 32
+    python pagodo_cli.py jobs
+    python pagodo_cli.py resume [JOB_ID] --output results.json
+    python pagodo_cli.py enqueue dorks.txt --domain example.com --priority 5
+    python pagodo_cli.py worker --workers 2
+    python pagodo_cli.py queue
+
+Finished dorks are checkpointed as they arrive; Ctrl+C pauses the job and
+`resume` picks it up where it stopped. `enqueue` only adds the scan to the
+persistent job queue shared with the GUI; `worker` runs queued jobs until
+the queue is empty (or forever with --watch).
+"""
+import argparse
+import json
+import sys
+import time
+
+from pagodo_core import (
+    DEFAULT_CONCURRENCY, DEFAULT_ENGINE, ENGINES, ScanJob, ResultCache, parse_domains, read_domains,
+)
+from pagodo_jobs import JobQueue, JobRunner
+
+
+def _read_dorks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            if isinstance(data, dict):
+                return [d for lst in data.values() for d in (lst if isinstance(lst, list) else [lst])]
+            return [row.get("dork", "") if isinstance(row, dict) else row for row in data]
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def _run(job, args):
+    cache = None if args.no_cache else ResultCache()
+    total = job.total
+
+    def progress(domain, dork, urls, error):
+        label = f"site:{domain} {dork}" if domain else dork
+        print(f"[{job.attempted}/{total}] {label}" + (f"  FAILED: {error}" if error else ""), file=sys.stderr)
+        for url in urls:
+            print(url)
+
+    try:
+        job.run(on_result=progress, concurrency=args.concurrency, cache=cache)
+    except KeyboardInterrupt:
+        print(f"\nPaused at {job.attempted}/{total}. Resume with: python pagodo_cli.py resume {job.id}",
+              file=sys.stderr)
+        return 130
+    finally:
+        if cache is not None:
+            cache.close()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(job.export(), f, indent=2)
+    failed = f", {len(job.failed)} failed (retry with: python pagodo_cli.py resume {job.id})" if job.failed else ""
+    print(f"Job {job.id} {job.status}: {len(job.done)}/{total} queries{failed}.", file=sys.stderr)
+    return 0
+
+
+def _domains(args):
+    domains = parse_domains(args.domain)
+    if args.domains_file:
+        domains += parse_domains(read_domains(args.domains_file))
+    return domains
+
+
+def cmd_scan(args):
+    job = ScanJob(_read_dorks(args.dorks), _domains(args), args.engine)
+    print(f"Job {job.id}: {len(job.dorks)} dorks x {max(1, len(job.domains))} domains -> {job.path}",
+          file=sys.stderr)
+    return _run(job, args)
+
+
+def cmd_resume(args):
+    if args.job:
+        # a named job may also be a finished one whose failed queries should be retried
+        path = ScanJob.jobs_dir() / f"{args.job}.jsonl"
+        jobs = [ScanJob.load(path)] if path.exists() else []
+    else:
+        jobs = ScanJob.unfinished()
+    if not jobs:
+        print("No unfinished scan jobs.", file=sys.stderr)
+        return 1
+    return _run(jobs[0], args)
+
+
+def cmd_jobs(args):
+    for job in ScanJob.unfinished():
+        print(f"{job.id}  {job.status:<8} {len(job.done)}/{job.total}  {job.engine}  {job.domain_label or '-'}")
+    return 0
+
+
+def cmd_enqueue(args):
+    jobs = JobQueue()
+    try:
+        job_id = jobs.enqueue(_read_dorks(args.dorks), _domains(args), args.engine,
+                              priority=args.priority, label=args.label or args.dorks)
+    finally:
+        jobs.close()
+    print(job_id)
+    return 0
+
+
+def cmd_worker(args):
+    jobs = JobQueue()
+    jobs.recover(resume=True)
+    cache = None if args.no_cache else ResultCache()
+
+    def on_event(kind, job_id, payload):
+        if kind == "status":
+            print(f"{job_id} {payload}", file=sys.stderr)
+        elif payload[3]:
+            print(f"{job_id} FAILED: {payload[1]}: {payload[3]}", file=sys.stderr)
+
+    runner = JobRunner(jobs, workers=args.workers, on_event=on_event, concurrency=args.concurrency, cache=cache)
+    runner.start()
+    try:
+        while args.watch or runner.active or any(r["status"] == "queued" for r in jobs.list()):
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        print("\nStopping; interrupted jobs stay queued.", file=sys.stderr)
+    finally:
+        runner.stop(wait=True)
+        jobs.close()
+        if cache is not None:
+            cache.close()
+    return 0
+
+
+def cmd_queue(args):
+    jobs = JobQueue()
+    try:
+        rows = jobs.list()
+    finally:
+        jobs.close()
+    for row in rows:
+        print(f"{row['id']}  {row['status']:<9} p{row['priority']:<3} {row['done'] + row['failed']}/{row['total']}"
+              f"  {row['engine']}  {row['label']}")
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pagodo headless scanner")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    def scan_options(p):
+        p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+        p.add_argument("--output", help="write {dork: [urls]} JSON here when finished")
+        p.add_argument("--no-cache", action="store_true", help="always query, ignore cached results")
+
+    p = sub.add_parser("scan", help="start a new checkpointed scan")
+    p.add_argument("dorks", help="text file (one dork per line) or JSON dork list/DB")
+    p.add_argument("--domain", default="", help="one domain or a comma-separated list")
+    p.add_argument("--domains-file", help="file with one or more domains per line")
+    p.add_argument("--engine", default=DEFAULT_ENGINE, choices=sorted(ENGINES))
+    scan_options(p)
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser("resume", help="resume an unfinished scan (newest by default) or retry a job's failures")
+    p.add_argument("job", nargs="?")
+    scan_options(p)
+    p.set_defaults(func=cmd_resume)
+
+    p = sub.add_parser("jobs", help="list unfinished scans")
+    p.set_defaults(func=cmd_jobs)
+
+    p = sub.add_parser("enqueue", help="add a scan to the persistent job queue")
+    p.add_argument("dorks", help="text file (one dork per line) or JSON dork list/DB")
+    p.add_argument("--domain", default="", help="one domain or a comma-separated list")
+    p.add_argument("--domains-file", help="file with one or more domains per line")
+    p.add_argument("--engine", default=DEFAULT_ENGINE, choices=sorted(ENGINES))
+    p.add_argument("--priority", type=int, default=0, help="higher runs first")
+    p.add_argument("--label")
+    p.set_defaults(func=cmd_enqueue)
+
+    p = sub.add_parser("worker", help="run queued scan jobs in the background pool")
+    p.add_argument("--workers", type=int, default=2)
+    p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    p.add_argument("--no-cache", action="store_true", help="always query, ignore cached results")
+    p.add_argument("--watch", action="store_true", help="keep waiting for new jobs")
+    p.set_defaults(func=cmd_worker)
+
+    p = sub.add_parser("queue", help="list queued and recent scan jobs")
+    p.set_defaults(func=cmd_queue)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
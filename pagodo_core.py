@@ -1,10 +1,809 @@
-import time
+import asyncio
+import json
+import os
 import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pagodo_serp import parse_serp
+
+CONFIG_DIR_NAME = "PagodoGUI"
+
+ENGINES = {
+    "Google": "https://www.google.com/search?q={query}",
+    "Yahoo": "https://search.yahoo.com/search?p={query}",
+    "Bing": "https://www.bing.com/search?q={query}",
+    "DuckDuckGo": "https://duckduckgo.com/?q={query}",
+}
+# Scan-time overrides for engines whose browser page is not scrapable HTML
+SCAN_URLS = {
+    "DuckDuckGo": "https://html.duckduckgo.com/html/?q={query}",
+}
+DEFAULT_ENGINE = "Google"
+# (requests per second, burst) per engine; engines not listed are not paced
+ENGINE_LIMITS = {
+    "Google": (0.5, 4),
+    "Yahoo": (1.0, 5),
+    "Bing": (1.0, 5),
+    "DuckDuckGo": (1.0, 3),
+}
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT = 15
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+# circuit breaker: trip when >= BREAKER_THRESHOLD of the last BREAKER_WINDOW requests failed
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 5
+BREAKER_THRESHOLD = 0.5
+BREAKER_COOLDOWN = 30.0
+BREAKER_MAX_COOLDOWN = 300.0
+CACHE_TTL = 24 * 3600
+CACHE_MAX_ENTRIES = 50000
+
+
+def _norm(s):
+    return " ".join(str(s).split()) if s is not None else ""
+
+
+def _intern(s):
+    """_norm(s) as an interned string, so equal dorks share one object in memory."""
+    n = _norm(s)
+    return sys.intern(s if n == s else n)
+
+
+def _appdata_dir():
+    if os.name == "nt":
+        return Path(os.environ.get("APPDATA", str(Path.home() / "AppData" / "Roaming"))) / CONFIG_DIR_NAME
+    return Path(os.environ.get("XDG_CONFIG_HOME", str(Path.home() / ".config"))) / CONFIG_DIR_NAME
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` tokens/s up to `burst`.
+    Callers reserve a token up front and sleep for the returned delay, so
+    waiters are served in order and the bucket is safe to share between
+    threads and event loops. A caller that gives up before its turn (a
+    cancelled scan) refunds its token, or the debt would delay later scans.
+    """
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self):
+        """Return a reserved token that was never used."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+class CircuitBreaker:
+    """
+    Per-engine circuit breaker. Closed: requests flow and outcomes are
+    tracked over a sliding window. Open: the engine's queue waits out a
+    cooldown. Half-open: a single probe request decides whether to close
+    again or reopen with a doubled cooldown.
+    """
+    def __init__(self, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS, threshold=BREAKER_THRESHOLD,
+                 cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN):
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = "closed"
+        self._outcomes = deque(maxlen=window)
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Seconds the caller must wait before sending; 0 means go now."""
+        with self._lock:
+            if self.state == "closed":
+                return 0.0
+            now = time.monotonic()
+            if self.state == "open":
+                if now < self._open_until:
+                    return self._open_until - now
+                self.state = "half-open"
+                self._probe_started = None
+            # half-open: let one probe through; a probe that never reported back is replaced
+            if self._probe_started is None or now - self._probe_started > REQUEST_TIMEOUT * 2:
+                self._probe_started = now
+                return 0.0
+            return 0.5
+
+    def record(self, ok):
+        with self._lock:
+            if self.state == "half-open":
+                self._probe_started = None
+                if ok:
+                    self.state = "closed"
+                    self._outcomes.clear()
+                    self._cooldown = self.base_cooldown
+                else:
+                    self._trip(min(self.max_cooldown, self._cooldown * 2))
+                return
+            self._outcomes.append(ok)
+            if self.state == "closed" and len(self._outcomes) >= self.min_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.threshold:
+                    self._trip(self._cooldown)
+
+    def _trip(self, cooldown):
+        self.state = "open"
+        self._cooldown = cooldown
+        self._open_until = time.monotonic() + cooldown
+        self._outcomes.clear()
+
+    async def wait(self):
+        while True:
+            delay = self.before_request()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+
+class RetryPolicy:
+    """Retry transient failures with full-jitter exponential backoff."""
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def is_transient(exc):
+        if isinstance(exc, urllib.error.HTTPError):
+            return exc.code == 429 or exc.code >= 500
+        return isinstance(exc, (urllib.error.URLError, socket.timeout, TimeoutError, ConnectionError))
+
+    def delay(self, attempt, exc=None):
+        retry_after = getattr(exc, "headers", None) and exc.headers.get("Retry-After")
+        if retry_after and retry_after.strip().isdigit():
+            return min(self.max_delay, float(retry_after))
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+DEFAULT_RETRY = RetryPolicy()
+
+
+def describe_error(exc):
+    if isinstance(exc, urllib.error.HTTPError):
+        return f"HTTP {exc.code}"
+    if isinstance(exc, (socket.timeout, TimeoutError)):
+        return "timeout"
+    if isinstance(exc, urllib.error.URLError):
+        return f"connection error: {exc.reason}"
+    return f"{type(exc).__name__}: {exc}"
+
+
+class RequestScheduler:
+    """
+    Per-engine pacing shared by every scan in the process: a token bucket
+    for the rate limit and a circuit breaker that pauses a failing engine.
+    """
+    def __init__(self, limits=None):
+        self._limits = dict(ENGINE_LIMITS if limits is None else limits)
+        self._buckets = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure(self, engine, rate, burst):
+        with self._lock:
+            if rate:
+                self._limits[engine] = (rate, burst)
+            else:
+                self._limits.pop(engine, None)
+            self._buckets.pop(engine, None)
+
+    def _bucket(self, engine):
+        with self._lock:
+            bucket = self._buckets.get(engine)
+            if bucket is None and engine in self._limits:
+                bucket = self._buckets[engine] = TokenBucket(*self._limits[engine])
+            return bucket
+
+    def breaker(self, engine):
+        with self._lock:
+            breaker = self._breakers.get(engine)
+            if breaker is None:
+                breaker = self._breakers[engine] = CircuitBreaker()
+            return breaker
+
+    async def acquire(self, engine):
+        await self.breaker(engine).wait()
+        bucket = self._bucket(engine)
+        if bucket is not None:
+            delay = bucket.reserve()
+            if delay:
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    bucket.refund()
+                    raise
+
+
+SCHEDULER = RequestScheduler()
+
+
+class ResultCache:
+    """
+    On-disk scan result cache keyed on (engine, domain, normalized dork).
+    Entries expire after their TTL; once the cache holds more than
+    `max_entries`, the least recently used entries are evicted.
+    Safe to share between scan threads.
+    """
+    _COMMIT_EVERY = 256
+
+    def __init__(self, path=None, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.path = Path(path) if path else _appdata_dir() / "scan_cache.sqlite3"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " engine TEXT NOT NULL, domain TEXT NOT NULL, dork TEXT NOT NULL,"
+            " urls TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL,"
+            " PRIMARY KEY (engine, domain, dork))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._db.commit()
+        self._size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @staticmethod
+    def key(engine, domain, dork):
+        return (engine or "", (domain or "").strip().lower(), _norm(dork))
+
+    def get(self, engine, domain, dork):
+        key = self.key(engine, domain, dork)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT urls, expires FROM results WHERE engine=? AND domain=? AND dork=?", key
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._db.execute("DELETE FROM results WHERE engine=? AND domain=? AND dork=?", key)
+                    self._size -= 1
+                    self._touch()
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE results SET accessed=? WHERE engine=? AND domain=? AND dork=?", (now,) + key
+            )
+            self._touch()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, engine, domain, dork, urls, ttl=None):
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        key, value = self.key(engine, domain, dork), json.dumps(urls)
+        with self._lock:
+            # a refresh overwrites its row; only a new row counts towards max_entries
+            updated = self._db.execute(
+                "UPDATE results SET urls=?, expires=?, accessed=? WHERE engine=? AND domain=? AND dork=?",
+                (value, now + ttl, now) + key,
+            ).rowcount
+            if not updated:
+                self._db.execute(
+                    "INSERT INTO results (engine, domain, dork, urls, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    key + (value, now + ttl, now),
+                )
+                self._size += 1
+                if self._size > self.max_entries:
+                    self._evict()
+            self._touch()
+
+    def _evict(self):
+        self._db.execute("DELETE FROM results WHERE expires < ?", (time.time(),))
+        self._size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = self._size - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE rowid IN"
+                " (SELECT rowid FROM results ORDER BY accessed LIMIT ?)", (excess,)
+            )
+            self._size -= excess
+
+    def _touch(self):
+        # access-time updates are batched; a crash only loses LRU ordering, not results
+        self._pending += 1
+        if self._pending >= self._COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def flush(self):
+        with self._lock:
+            self._db.commit()
+            self._pending = 0
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+            self._size = self._pending = 0
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": self._size}
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+def build_query(dork, domain=""):
+    domain = (domain or "").strip()
+    return f"site:{domain} {dork}" if domain else dork
+
+
+def _norm_domain(domain):
+    d = _norm(domain).lower()
+    for prefix in ("site:", "https://", "http://"):
+        if d.startswith(prefix):
+            d = d[len(prefix):]
+    return d.strip("/ ")
+
 
-def run_pagodo_scan(dorks, domain=""):
+def parse_domains(value):
+    """
+    Unique, normalized domains from an inline list ("a.com, b.org c.net")
+    or any iterable of such strings, in first-seen order.
+    """
+    if isinstance(value, str):
+        value = [value]
+    out = {}
+    for chunk in value or ():
+        for d in str(chunk).replace(",", " ").replace(";", " ").split():
+            d = _norm_domain(d)
+            if d:
+                out.setdefault(d, None)
+    return list(out)
+
+
+def read_domains(path):
+    """Lazily yield domains from a text file (one or more per line, # comments)."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            yield from parse_domains(line)
+
+
+def iter_targets(dorks, domains=()):
+    """
+    Lazily yield the (domain, dork) cross product with duplicate dorks and
+    domains collapsed, so every yielded query is distinct. Dorks are held
+    in memory, domains are streamed; with no domains the dorks are yielded
+    with domain "".
+    """
+    dorks = list(dict.fromkeys(nd for nd in (_norm(d) for d in dorks) if nd))
+    if isinstance(domains, str):
+        domains = parse_domains(domains)
+    seen = set()
+    for domain in domains:
+        domain = _norm_domain(domain)
+        if not domain or domain in seen:
+            continue
+        seen.add(domain)
+        for dork in dorks:
+            yield domain, dork
+    if not seen:
+        for dork in dorks:
+            yield "", dork
+
+
+def search_url(query, engine=DEFAULT_ENGINE):
+    template = SCAN_URLS.get(engine) or ENGINES.get(engine, ENGINES[DEFAULT_ENGINE])
+    return template.format(query=urllib.parse.quote_plus(query))
+
+
+def fetch_page(url, timeout=REQUEST_TIMEOUT):
+    """Blocking GET of a search page; runs on the engine's thread pool."""
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        charset = resp.headers.get_content_charset() or "utf-8"
+        return resp.read().decode(charset, "replace")
+
+
+def fetch_results(url, engine=DEFAULT_ENGINE, fetch=fetch_page):
+    """Fetch one result page and extract its result links (runs on the pool)."""
+    return parse_serp(engine, fetch(url))
+
+
+async def stream_queries_async(targets, engine=DEFAULT_ENGINE, concurrency=DEFAULT_CONCURRENCY,
+                               fetch=fetch_page, scheduler=SCHEDULER, cache=None, retry=DEFAULT_RETRY):
+    """
+    Async generator yielding (domain, dork, urls, error) as each query
+    finishes. `error` is None on success; a query that still fails after
+    `retry` is reported with empty urls and a short error string instead of
+    raising, so one bad query never aborts the batch.
+
+    At most `concurrency` requests are in flight, paced by the engine's token
+    bucket and circuit breaker in `scheduler`. `targets` is an iterable of
+    (domain, dork) pairs and is consumed lazily, so it may be arbitrarily long.
+    With a ResultCache, cached queries are answered without a request and
+    fresh results are stored back.
+    """
+    concurrency = max(1, int(concurrency))
+    loop = asyncio.get_running_loop()
+    pending = iter(targets)
+    finished = asyncio.Queue(maxsize=concurrency * 2)
+    done = object()
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    breaker = scheduler.breaker(engine)
+
+    async def query(domain, dork):
+        url = search_url(build_query(dork, domain), engine)
+        for attempt in range(retry.attempts):
+            await scheduler.acquire(engine)
+            try:
+                urls = await loop.run_in_executor(pool, fetch_results, url, engine, fetch)
+            except Exception as exc:
+                transient = retry.is_transient(exc)
+                # only engine trouble (throttling, 5xx, network) counts against the breaker
+                breaker.record(not transient)
+                if attempt + 1 >= retry.attempts or not transient:
+                    return [], describe_error(exc)
+                await asyncio.sleep(retry.delay(attempt, exc))
+            else:
+                breaker.record(True)
+                return urls, None
+
+    async def worker():
+        for domain, dork in pending:
+            if cache is not None:
+                urls = cache.get(engine, domain, dork)
+                if urls is not None:
+                    await finished.put((domain, dork, urls, None))
+                    continue
+            urls, error = await query(domain, dork)
+            if cache is not None and error is None:
+                cache.put(engine, domain, dork, urls)
+            await finished.put((domain, dork, urls, error))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+
+    async def supervise():
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            await finished.put(done)
+
+    supervisor = asyncio.ensure_future(supervise())
+    try:
+        while True:
+            item = await finished.get()
+            if item is done:
+                break
+            yield item
+        await supervisor
+    finally:
+        if cache is not None:
+            cache.flush()
+        for task in workers + [supervisor]:
+            task.cancel()
+        await asyncio.gather(*workers, supervisor, return_exceptions=True)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def stream_scan_async(dorks, domain="", engine=DEFAULT_ENGINE, **options):
+    """Single-domain stream_queries_async yielding (dork, urls, error)."""
+    async for _, dork, urls, error in stream_queries_async(((domain, d) for d in dorks), engine, **options):
+        yield dork, urls, error
+
+
+async def scan_dorks_async(dorks, domain="", engine=DEFAULT_ENGINE, **options):
+    """
+    Collect stream_scan_async into {dork: [urls]} (completion order);
+    dorks that failed map to {"error": message} instead.
+    """
     results = {}
-    for dork in dorks:
-        query = f"site:{domain} {dork}" if domain else dork
-        time.sleep(random.uniform(0.1, 0.3))  # Simulate scan delay
-        results[dork] = [f"https://www.google.com/search?q={query}"]
+    async for dork, urls, error in stream_scan_async(dorks, domain, engine, **options):
+        results[dork] = {"error": error} if error else urls
     return results
+
+
+def _iter_async(stream):
+    """
+    Drive an async generator from blocking code. The event loop only runs
+    while the caller asks for the next item, so a slow consumer throttles
+    the scan instead of buffering it.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(stream.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(stream.aclose())
+        loop.close()
+
+
+def iter_pagodo_scan(dorks, domain="", engine=DEFAULT_ENGINE, **options):
+    """Blocking (dork, urls, error) generator for thread/GUI callers; options go to stream_queries_async."""
+    return _iter_async(stream_scan_async(dorks, domain, engine, **options))
+
+
+def iter_batch_scan(dorks, domains, engine=DEFAULT_ENGINE, **options):
+    """
+    Blocking (domain, dork, urls, error) generator over the dorks x domains product.
+    `domains` may be an inline string, a list, or a lazy iterable such as
+    read_domains(path); the product is never materialized.
+    """
+    return _iter_async(stream_queries_async(iter_targets(dorks, domains), engine, **options))
+
+
+def run_pagodo_scan(dorks, domain="", engine=DEFAULT_ENGINE, **options):
+    """Run a whole batch and return {dork: [urls]}, failed dorks as {"error": message}."""
+    return {dork: {"error": error} if error else urls
+            for dork, urls, error in iter_pagodo_scan(dorks, domain, engine, **options)}
+
+
+class ScanJob:
+    """
+    A scan whose finished queries are checkpointed to a JSON-lines journal
+    in the app data dir, so a crashed or closed run can be resumed.
+
+    A job covers the dorks x domains product (a single "" domain when no
+    domain is given). Journal layout: one header line with the job spec,
+    one line per finished query, and a final {"status": ...} line once the
+    job is done or cancelled. Only the finished (domain, dork) keys are kept
+    in memory; results are read back from the journal by iter_results().
+    Queries that failed are recorded with their error and are retried the
+    next time the job runs; a job done with failures says so in its status
+    line ({"status": "done", "failed": n}) and stays unfinished.
+    pause(), resume(), cancel() and stop() may be called from any thread
+    while run() is executing.
+    """
+    def __init__(self, dorks, domains="", engine=DEFAULT_ENGINE, job_id=None, directory=None):
+        self.dorks = list(dict.fromkeys(nd for nd in (_norm(d) for d in dorks) if nd))
+        self.domains = parse_domains(domains)
+        self.engine = engine
+        self.id = job_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.directory = Path(directory) if directory else self.jobs_dir()
+        self.path = self.directory / f"{self.id}.jsonl"
+        self.done = set()
+        self.failed = {}
+        self.status = "pending"
+        self._resume = threading.Event()
+        self._resume.set()
+        self._cancelled = False
+        self._stopped = False
+
+    @staticmethod
+    def jobs_dir():
+        return _appdata_dir() / "scan_jobs"
+
+    @staticmethod
+    def _rows(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # torn final line after a crash
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        job = None
+        for row in cls._rows(path):
+            if job is None:
+                job = cls(row.get("dorks", []), row.get("domains", ""), row.get("engine", DEFAULT_ENGINE),
+                          job_id=row.get("job"), directory=path.parent)
+            elif "dork" in row:
+                job._record((row.get("domain", ""), row["dork"]), row.get("error"))
+                job.status = "pending"  # a re-run after an earlier final status
+            elif "status" in row:
+                job.status = row["status"]
+        if job is None:
+            raise ValueError(f"{path} is not a scan journal")
+        if job.status not in ("done", "cancelled"):
+            job.status = "paused" if job.done else "pending"
+        return job
+
+    @staticmethod
+    def finished(path):
+        """True if the journal at path ends with a final status and no failures; only its tail is read."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 64))
+            tail = f.read()
+        if not tail.endswith(b"\n"):
+            return False
+        try:
+            row = json.loads(tail[:-1].rsplit(b"\n", 1)[-1])
+        except ValueError:
+            return False  # the window cut into a longer line
+        return isinstance(row, dict) and row.get("status") in ("done", "cancelled") and not row.get("failed")
+
+    @classmethod
+    def unfinished(cls, directory=None, skip=()):
+        """
+        Jobs with a journal but no final status, or done with failed queries
+        left to retry, newest first. Journals whose job id is in skip, or that
+        end with a final status and no failures, are not read.
+        """
+        directory = Path(directory) if directory else cls.jobs_dir()
+        jobs = []
+        for path in sorted(directory.glob("*.jsonl"), reverse=True):
+            if path.stem in skip:
+                continue
+            try:
+                if cls.finished(path):
+                    continue
+                job = cls.load(path)
+            except (OSError, ValueError):
+                continue
+            if job.status not in ("done", "cancelled") or (job.status == "done" and job.failed):
+                jobs.append(job)
+        return jobs
+
+    def _record(self, key, error):
+        if error:
+            self.failed[key] = error
+        else:
+            self.done.add(key)
+            self.failed.pop(key, None)
+
+    @property
+    def attempted(self):
+        return len(self.done) + len(self.failed)
+
+    @property
+    def total(self):
+        return len(self.dorks) * max(1, len(self.domains))
+
+    @property
+    def domain_label(self):
+        if len(self.domains) > 3:
+            return f"{', '.join(self.domains[:3])} +{len(self.domains) - 3} more"
+        return ", ".join(self.domains)
+
+    def remaining(self):
+        """Lazily yield the (domain, dork) pairs not yet in the journal."""
+        for key in iter_targets(self.dorks, self.domains):
+            if key not in self.done:
+                yield key
+
+    def iter_results(self):
+        """Yield (domain, dork, urls, error) for every query in the journal, oldest first."""
+        if not self.path.exists():
+            return
+        for row in self._rows(self.path):
+            if "dork" in row:
+                yield row.get("domain", ""), row["dork"], row.get("urls", []), row.get("error")
+
+    def export(self):
+        """
+        {dork: [urls]} for single-domain jobs, {domain: {dork: [urls]}} otherwise;
+        queries whose latest attempt failed map to {"error": message}.
+        """
+        out = {}
+        for domain, dork, urls, error in self.iter_results():
+            value = {"error": error} if error else urls
+            if len(self.domains) <= 1:
+                out[dork] = value
+            else:
+                out.setdefault(domain, {})[dork] = value
+        return out
+
+    def pause(self):
+        if self.status == "running":
+            self.status = "paused"
+            self._resume.clear()
+
+    def resume(self):
+        if self.status == "paused":
+            self.status = "running"
+        self._resume.set()
+
+    def cancel(self):
+        self._cancelled = True
+        self._resume.set()
+
+    def stop(self):
+        """Interrupt run() without finishing the job: no final status is written, so it can be resumed."""
+        self._stopped = True
+        self._resume.set()
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _append(self, f, row):
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        f.flush()
+
+    def save(self):
+        """Create the journal (header only) if it does not exist yet."""
+        if self.path.exists() and self.path.stat().st_size:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            self._append(f, {"job": self.id, "created": time.time(), "domains": self.domains,
+                             "engine": self.engine, "dorks": self.dorks})
+
+    def run(self, on_result=None, **options):
+        """
+        Scan the queries not yet in the journal (including earlier failures),
+        calling on_result(domain, dork, urls, error) for each. Blocks until
+        the job is done, cancelled, stopped ("paused") or fails; a stopped or
+        failed run can be run again.
+        Keyword options are passed to stream_queries_async.
+        """
+        self.save()
+        self.status = "running"
+        with open(self.path, "a", encoding="utf-8") as f:
+            if not self._ends_with_newline():
+                f.write("\n")  # terminate a line torn by a crash
+            scan = _iter_async(stream_queries_async(self.remaining(), self.engine, **options))
+            try:
+                for domain, dork, urls, error in scan:
+                    self._record((domain, dork), error)
+                    row = {"domain": domain, "dork": dork, "urls": urls}
+                    if error:
+                        row["error"] = error
+                    self._append(f, row)
+                    if on_result is not None:
+                        on_result(domain, dork, urls, error)
+                    self._resume.wait()
+                    if self._cancelled or self._stopped:
+                        break
+            except Exception:
+                self.status = "paused"
+                raise
+            finally:
+                scan.close()
+            if self.attempted < self.total and (self._cancelled or self._stopped):
+                self.status = "cancelled" if self._cancelled else "paused"
+            else:
+                self.status = "done"
+            if self.status == "done" and self.failed:
+                self._append(f, {"status": self.status, "failed": len(self.failed)})
+            elif self.status != "paused":
+                self._append(f, {"status": self.status})
+        return self.status
+
+    def discard(self):
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,584 @@
+"""
+SQLite dork database.
+
+One file under the app data dir holds the optional full dork list override,
+the user's own dorks and their favorites. Dork text is stored normalized and
+indexed, so membership checks and single edits are indexed look-ups and
+one-row writes instead of rewriting a JSON file.
+
+Writes follow SQLite's write-ahead log: a commit appends the changed pages
+to dorks.sqlite3-wal, so adding one dork costs the same however many are
+stored. A background thread commits coalesced writes (see DorkDatabase)
+and checkpoints the log into the main file every CHECKPOINT_INTERVAL
+seconds; close() folds in the rest.
+
+Every change to the dork list itself (the override and the user's dorks,
+not favorites) bumps a revision number kept in meta, which together with
+the database's random id tells a cached copy of the merged list (see
+pagodo_startup) whether it is still current.
+
+The override can also be kept in step with Exploit-DB's GHDB: ghdb_records
+remembers which GHDB record (by id, with a digest of its content) each
+listed dork came from, so a newer export only has to apply what changed
+(see apply_ghdb and pagodo_ghdb).
+
+The first time the database is opened, the older user_dorks.json,
+favorites.json and all_dorks.json files are imported. They are left in
+place but no longer read.
+"""
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from pagodo_core import _intern, _norm, _appdata_dir
+
+# seconds between background checkpoints of the write-ahead log
+CHECKPOINT_INTERVAL = 30.0
+# pages the log may reach before a commit checkpoints it inline (~16 MB)
+WAL_AUTOCHECKPOINT = 4000
+# coalesced writes: commit once no write came in for WRITE_DELAY seconds,
+# and never hold one back longer than MAX_WRITE_AGE
+WRITE_DELAY = 0.5
+MAX_WRITE_AGE = 3.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+-- the full dork list override (formerly all_dorks.json)
+CREATE TABLE IF NOT EXISTS dorks (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    dork TEXT NOT NULL,
+    UNIQUE (category_id, dork)
+);
+CREATE INDEX IF NOT EXISTS dorks_text ON dorks (dork);
+CREATE TABLE IF NOT EXISTS favorites (
+    id INTEGER PRIMARY KEY,
+    dork TEXT NOT NULL UNIQUE,
+    category_id INTEGER NOT NULL REFERENCES categories (id)
+);
+-- dorks added or edited by the user on top of the list
+CREATE TABLE IF NOT EXISTS user_dorks (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    dork TEXT NOT NULL,
+    UNIQUE (category_id, dork)
+);
+-- the GHDB records the override was last updated from, by GHDB id
+CREATE TABLE IF NOT EXISTS ghdb_records (
+    id INTEGER PRIMARY KEY,
+    digest BLOB NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    dork TEXT NOT NULL,
+    date TEXT,
+    author TEXT
+);
+CREATE INDEX IF NOT EXISTS ghdb_records_dork ON ghdb_records (dork, category_id);
+"""
+
+
+def normalize_full(data):
+    """A dork list as {category: [dork, ...]} from either JSON layout, normalized and interned."""
+    if isinstance(data, dict):
+        out = {}
+        for k, v in data.items():
+            if not isinstance(k, str):
+                continue
+            lst = v if isinstance(v, list) else [v]
+            out[k] = [d for d in map(_intern, lst) if d]
+        return out
+    if isinstance(data, list):
+        out = {}
+        for row in data:
+            if not isinstance(row, dict):
+                continue
+            cat = _norm(row.get("category", ""))
+            dork = _intern(row.get("dork", ""))
+            if not cat or not dork:
+                continue
+            out.setdefault(cat, [])
+            if dork not in out[cat]:
+                out[cat].append(dork)
+        return out
+    return {}
+
+
+def _read_legacy(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+class DorkDatabase:
+    """
+    The shared connection; safe to use from several threads.
+
+    Writes are coalesced: each one runs at once, but the commit waits until
+    no write has come in for write_delay seconds (at most MAX_WRITE_AGE
+    after the first), so a burst of edits costs one commit. flush() commits
+    now; close() and interpreter exit always flush. write_delay=0 commits
+    every write. checkpoint_interval=None leaves checkpoints to SQLite's
+    auto-checkpoint.
+    """
+    def __init__(self, path=None, checkpoint_interval=CHECKPOINT_INTERVAL, write_delay=WRITE_DELAY):
+        self.path = Path(path) if path else _appdata_dir() / "dorks.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_interval = checkpoint_interval
+        self.write_delay = write_delay
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # in WAL mode a commit only appends to the log; it is synced at checkpoints
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA wal_autocheckpoint={WAL_AUTOCHECKPOINT}")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        self._db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('db_id', ?)", (uuid.uuid4().hex,))
+        self._db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('dork_revision', '0')")
+        self._db.commit()
+        self._depth = 0  # open batch() blocks
+        self._first_write = self._last_write = None  # uncommitted writes, monotonic times
+        self._closed = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._background = None
+        if self.get_meta("migrated") is None:
+            self.migrate(self.path.parent)
+        if checkpoint_interval or write_delay:
+            self._background = threading.Thread(target=self._background_loop, name="pagodo-db-writer", daemon=True)
+            self._background.start()
+        atexit.register(self.close)
+
+    def _background_loop(self):
+        next_checkpoint = time.monotonic() + self.checkpoint_interval if self.checkpoint_interval else None
+        while not self._stop.is_set():
+            deadline = next_checkpoint
+            commit_at = self._commit_due()
+            if commit_at is not None:
+                deadline = commit_at if deadline is None else min(deadline, commit_at)
+            self._wake.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            now = time.monotonic()
+            try:
+                commit_at = self._commit_due()
+                if commit_at is not None and now >= commit_at:
+                    self.flush()
+                if next_checkpoint is not None and now >= next_checkpoint:
+                    self.checkpoint()
+                    next_checkpoint = now + self.checkpoint_interval
+            except sqlite3.Error:
+                pass
+
+    def _commit_due(self):
+        first, last = self._first_write, self._last_write
+        if first is None:
+            return None
+        return min(last + self.write_delay, first + MAX_WRITE_AGE)
+
+    def _written(self):
+        """A write finished outside any batch: commit it now or schedule the commit."""
+        if self._depth or self._closed:
+            return
+        if not self.write_delay or self._background is None:
+            self._db.commit()
+            return
+        now = time.monotonic()
+        if self._first_write is None:
+            self._first_write = now
+        self._last_write = now
+        self._wake.set()
+
+    @contextmanager
+    def _savepoint(self, name="pagodo_write"):
+        """Undo only this block's changes on error, leaving earlier uncommitted writes alone."""
+        with self._lock:
+            if not self._db.in_transaction:
+                self._db.execute("BEGIN")
+            self._db.execute(f"SAVEPOINT {name}")
+            try:
+                yield
+            except BaseException:
+                if not self._closed:
+                    self._db.execute(f"ROLLBACK TO {name}")
+                    self._db.execute(f"RELEASE {name}")
+                raise
+            # close() inside the block already undid it and closed the connection
+            if not self._closed:
+                self._db.execute(f"RELEASE {name}")
+
+    @contextmanager
+    def _atomic(self):
+        with self._lock:
+            with self._savepoint():
+                yield
+            self._written()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group writes into one transaction: they are committed together when
+        the block ends (after write_delay, as usual) or all undone if it raises.
+        """
+        with self._lock:
+            # the outermost block gets its own savepoint name so close() can undo it
+            name = "pagodo_write" if self._depth else "pagodo_batch"
+            self._depth += 1
+            try:
+                with self._savepoint(name):
+                    yield self
+            finally:
+                if not self._closed:
+                    self._depth -= 1
+            self._written()
+
+    def flush(self):
+        """Commit pending writes now."""
+        with self._lock:
+            if self._depth:
+                return
+            self._first_write = self._last_write = None
+            if self._db.in_transaction:
+                self._db.commit()
+
+    def checkpoint(self, mode="PASSIVE"):
+        """Copy the write-ahead log into the main file; TRUNCATE also empties the log."""
+        with self._lock:
+            if self._db.in_transaction:
+                return None  # pending writes are flushed first
+            return self._db.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+    def execute(self, sql, args=()):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def write(self, sql, args=(), revise=False):
+        """
+        Run one statement; returns the number of changed rows. revise=True
+        means it changes the dork list, so revision() moves on if it did.
+        """
+        with self._atomic():
+            changed = self._db.execute(sql, args).rowcount
+            if revise and changed:
+                self._revise()
+            return changed
+
+    def write_many(self, sql, rows, revise=False):
+        """Run one statement per row, all or nothing."""
+        with self._atomic():
+            changed = self._db.executemany(sql, rows).rowcount
+            if revise and changed:
+                self._revise()
+            return changed
+
+    def _revise(self):
+        self._db.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key='dork_revision'")
+
+    def revision(self):
+        """(database id, dork list revision): changes whenever the override or the user dorks do."""
+        return self.get_meta("db_id"), int(self.get_meta("dork_revision") or 0)
+
+    def get_meta(self, key):
+        rows = self.execute("SELECT value FROM meta WHERE key=?", (key,))
+        return rows[0][0] if rows else None
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def category_id(self, name):
+        name = (name or "").strip()
+        with self._atomic():
+            self._db.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (name,))
+            return self._db.execute("SELECT id FROM categories WHERE name=?", (name,)).fetchone()[0]
+
+    def migrate(self, directory):
+        """One-time import of the JSON stores found in directory."""
+        directory = Path(directory)
+        users = _read_legacy(directory / "user_dorks.json")
+        favs = _read_legacy(directory / "favorites.json")
+        full = _read_legacy(directory / "all_dorks.json")
+        with self._atomic():
+            if isinstance(users, list):
+                for r in users:
+                    if isinstance(r, dict) and _norm(r.get("dork", "")):
+                        self._db.execute(
+                            "INSERT OR IGNORE INTO user_dorks (category_id, dork) VALUES (?, ?)",
+                            (self.category_id(r.get("category")), _norm(r["dork"])))
+            if isinstance(favs, list):
+                for r in favs:
+                    if isinstance(r, dict) and _norm(r.get("dork", "")):
+                        self._db.execute(
+                            "INSERT OR IGNORE INTO favorites (dork, category_id) VALUES (?, ?)",
+                            (_norm(r["dork"]), self.category_id(r.get("category"))))
+            if full is not None:
+                self._replace_full(normalize_full(full))
+            self._revise()
+            self._set_meta("migrated", "1")
+
+    def _replace_full(self, data):
+        self._forget_ghdb()
+        self._db.execute("DELETE FROM dorks")
+        for cat, dorks in data.items():
+            cid = self.category_id(cat)
+            self._db.executemany("INSERT OR IGNORE INTO dorks (category_id, dork) VALUES (?, ?)",
+                                 ((cid, d) for d in dorks))
+        self._set_meta("full_db", "1")
+        self._revise()
+
+    def save_full(self, data):
+        """Replace the full dork list override in one transaction."""
+        with self._atomic():
+            self._replace_full(normalize_full(data))
+
+    def clear_full(self):
+        with self._atomic():
+            self._forget_ghdb()
+            self._db.execute("DELETE FROM dorks")
+            self._db.execute("DELETE FROM meta WHERE key='full_db'")
+            self._revise()
+
+    def _forget_ghdb(self):
+        # the records no longer describe a list that was replaced wholesale
+        self._db.execute("DELETE FROM ghdb_records")
+        self._db.execute("DELETE FROM meta WHERE key='ghdb_synced'")
+
+    def apply_ghdb(self, upserts, removed, base=None):
+        """
+        Apply a GHDB delta in one transaction. upserts are new or changed
+        records as (id, digest, category, dork, date, author), removed the
+        ids of records that are gone. A dork leaves the override once no
+        record lists it; base is the list to start from when there is no
+        override yet. The first update also drops every listed dork the
+        export does not have. Returns (added, dropped): the (category,
+        dork) pairs that joined or left the merged list, which also holds
+        the user's dorks.
+        """
+        with self._atomic():
+            if self.get_meta("full_db") != "1":
+                self._replace_full(normalize_full(base or {}))
+            first = self.get_meta("ghdb_synced") is None
+            cids = {}
+            for row in upserts:
+                if row[2] not in cids:
+                    cids[row[2]] = self.category_id(row[2])
+            stale = set()
+            for rid in list(removed) + [row[0] for row in upserts]:
+                old = self._db.execute("SELECT category_id, dork FROM ghdb_records WHERE id=?", (rid,)).fetchone()
+                if old:
+                    stale.add(old)
+            self._db.executemany("DELETE FROM ghdb_records WHERE id=?", ((rid,) for rid in removed))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO ghdb_records (id, digest, category_id, dork, date, author)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                ((rid, digest, cids[cat], dork, date, author) for rid, digest, cat, dork, date, author in upserts))
+            added = [(cids[cat], dork) for _, _, cat, dork, _, _ in upserts
+                     if self._db.execute("INSERT OR IGNORE INTO dorks (category_id, dork) VALUES (?, ?)",
+                                         (cids[cat], dork)).rowcount]
+            if first:
+                stale.update(self._db.execute("SELECT category_id, dork FROM dorks"))
+            dropped = [pair for pair in stale if self._db.execute(
+                "DELETE FROM dorks WHERE category_id=? AND dork=? AND NOT EXISTS"
+                " (SELECT 1 FROM ghdb_records r WHERE r.dork=dorks.dork AND r.category_id=dorks.category_id)",
+                pair).rowcount]
+            self._set_meta("ghdb_synced", "1")
+            if added or dropped:
+                self._revise()
+            names = dict(self._db.execute("SELECT id, name FROM categories"))
+            mine = "SELECT 1 FROM user_dorks WHERE category_id=? AND dork=?"
+            return ([(names[cid], dork) for cid, dork in added if not self._db.execute(mine, (cid, dork)).fetchone()],
+                    [(names[cid], dork) for cid, dork in dropped if not self._db.execute(mine, (cid, dork)).fetchone()])
+
+    def close(self):
+        """Flush pending writes, checkpoint and close; safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._stop.set()
+        self._wake.set()
+        if self._background is not None:
+            self._background.join()
+        # a batch holds the lock until it ends, so one running on another thread
+        # finishes first; a batch still open here was left by this thread and is undone
+        with self._lock:
+            if self._depth:
+                self._db.execute("ROLLBACK TO pagodo_batch")
+                self._db.execute("RELEASE pagodo_batch")
+                self._depth = 0
+            self.flush()
+            try:
+                self.checkpoint("TRUNCATE")
+            except sqlite3.Error:
+                pass
+            self._db.close()
+
+
+class _Store:
+    """A view of one table group; batch() groups its writes into one commit."""
+    def __init__(self, db):
+        self.db = db
+
+    @contextmanager
+    def batch(self):
+        try:
+            with self.db.batch():
+                yield self
+        except BaseException:
+            self._forget()
+            raise
+
+    def _forget(self):
+        """Drop anything cached from writes that were just rolled back."""
+
+
+class UserDorkStore(_Store):
+    """
+    User-added dorks: list of {"category": str, "dork": str}
+    Does NOT store the whole DB — only user additions/edits.
+    """
+
+    def load(self):
+        rows = self.db.execute(
+            "SELECT c.name, u.dork FROM user_dorks u JOIN categories c ON c.id = u.category_id ORDER BY u.id")
+        return [{"category": cat, "dork": dork} for cat, dork in rows]
+
+    def add(self, category, dork):
+        self.db.write("INSERT OR IGNORE INTO user_dorks (category_id, dork) VALUES (?, ?)",
+                      (self.db.category_id(category), _norm(dork)), revise=True)
+
+    def add_many(self, items):
+        """Add [(category, dork), ...] as one write."""
+        ids = {}
+        rows = []
+        for category, dork in items:
+            if category not in ids:
+                ids[category] = self.db.category_id(category)
+            rows.append((ids[category], _norm(dork)))
+        if rows:
+            self.db.write_many("INSERT OR IGNORE INTO user_dorks (category_id, dork) VALUES (?, ?)", rows, revise=True)
+
+    def remove(self, category, dork):
+        self.db.write("DELETE FROM user_dorks WHERE dork=?"
+                      " AND category_id=(SELECT id FROM categories WHERE name=?)",
+                      (_norm(dork), (category or "").strip()), revise=True)
+
+    def update(self, old_cat, old_dork, new_cat, new_dork):
+        self.db.write("UPDATE OR REPLACE user_dorks SET category_id=?, dork=?"
+                      " WHERE dork=? AND category_id=(SELECT id FROM categories WHERE name=?)",
+                      (self.db.category_id(new_cat), _norm(new_dork), _norm(old_dork), (old_cat or "").strip()),
+                      revise=True)
+
+    def clear(self):
+        self.db.write("DELETE FROM user_dorks", revise=True)
+
+
+class DorkListStore(_Store):
+    """
+    Optional full DB override:
+    - Saves/loads {"Category": ["d1","d2", ...], ...}
+    """
+
+    def exists(self):
+        return self.db.get_meta("full_db") == "1"
+
+    def load(self):
+        if not self.exists():
+            return None
+        out = {}
+        for cat, dork in self.db.execute(
+                "SELECT c.name, d.dork FROM dorks d JOIN categories c ON c.id = d.category_id ORDER BY d.id"):
+            out.setdefault(cat, []).append(dork)
+        return out
+
+    def save(self, data):
+        self.db.save_full(data)
+
+    def clear(self):
+        self.db.clear_full()
+
+
+class GhdbRecordStore(_Store):
+    """
+    The GHDB records behind the override: {id: digest} for diffing a newer
+    export, and apply() to bring the list up to date (see apply_ghdb).
+    """
+
+    def digests(self):
+        return dict(self.db.execute("SELECT id, digest FROM ghdb_records"))
+
+    def apply(self, upserts, removed, base=None):
+        return self.db.apply_ghdb(upserts, removed, base)
+
+
+class FavoritesStore(_Store):
+    """
+    Favorites as [{"dork": str, "category": str}], in the order they were added.
+    The normalized dorks are also kept in a set, so is_favorite() does not
+    touch the database; they are interned, so they share the strings of the
+    loaded dork list.
+    """
+    def __init__(self, db):
+        super().__init__(db)
+        self._keys = None
+
+    def _forget(self):
+        self._keys = None
+
+    def _favorites(self):
+        if self._keys is None:
+            self._keys = {_intern(d) for (d,) in self.db.execute("SELECT dork FROM favorites")}
+        return self._keys
+
+    def load(self):
+        rows = self.db.execute(
+            "SELECT f.dork, c.name FROM favorites f JOIN categories c ON c.id = f.category_id ORDER BY f.id")
+        return [{"dork": _intern(dork), "category": cat} for dork, cat in rows]
+
+    def count(self):
+        return len(self._favorites())
+
+    def is_favorite(self, dork):
+        return _norm(dork) in self._favorites()
+
+    def add(self, dork, category):
+        self.add_many([(dork, category)])
+
+    def add_many(self, items):
+        """Add [(dork, category), ...] in one transaction."""
+        keys = self._favorites()
+        ids = {}
+        rows = {}
+        for dork, category in items:
+            nd = _intern(dork)
+            if not nd or nd in keys or nd in rows:
+                continue
+            if category not in ids:
+                ids[category] = self.db.category_id(category)
+            rows[nd] = ids[category]
+        if rows:
+            self.db.write_many("INSERT OR IGNORE INTO favorites (dork, category_id) VALUES (?, ?)", rows.items())
+            keys.update(rows)
+
+    def remove(self, dork):
+        self.remove_many([dork])
+
+    def remove_many(self, dorks):
+        keys = self._favorites()
+        gone = {_norm(d) for d in dorks} & keys
+        if gone:
+            self.db.write_many("DELETE FROM favorites WHERE dork=?", ((d,) for d in gone))
+            keys -= gone
+
+    def clear(self):
+        self.db.write("DELETE FROM favorites")
+        self._keys = set()
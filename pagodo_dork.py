@@ -0,0 +1,130 @@
+"""
+Dork parser.
+
+parse_dork() turns a dork string into a small AST: the top level is a tuple
+of nodes that Google ANDs together, each node being an Operator, Phrase,
+Term, OrGroup (alternatives) or Group (a parenthesized AND). Parsing is
+cached, so indexes built from the same dork list share the work.
+
+    parse_dork('intitle:"index of" -inurl:html (ext:sql OR ext:bak)')
+    -> (Operator(name='intitle', value='index of', quoted=True, negated=False),
+     Operator(name='inurl', value='html', quoted=False, negated=True),
+     OrGroup(items=(Operator(name='ext', ...), Operator(name='ext', ...)), negated=False))
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+Operator = namedtuple("Operator", "name value quoted negated")
+Phrase = namedtuple("Phrase", "text negated")
+Term = namedtuple("Term", "text negated")
+OrGroup = namedtuple("OrGroup", "items negated")
+Group = namedtuple("Group", "items negated")  # parenthesized terms that are all required
+
+# operators Google documents; anything else that looks like `foo:bar` is a plain term
+OPERATORS = frozenset((
+    "intitle", "allintitle", "inurl", "allinurl", "intext", "allintext", "inanchor", "allinanchor",
+    "filetype", "ext", "site", "cache", "related", "info", "link", "define", "before", "after",
+))
+# allin* operators take every following word until the next operator
+_GREEDY = frozenset(op for op in OPERATORS if op.startswith("allin"))
+
+_TOKEN = re.compile(r'\s*(?:([()|])|(-)?(?:([A-Za-z]+):)?("[^"]*"?|[^\s()|"]+)?)')
+
+
+def _tokens(dork):
+    for m in _TOKEN.finditer(dork):
+        if not m.group(0).strip():
+            continue
+        paren, neg, op, value = m.groups()
+        if paren:
+            yield paren, None, None, None
+            continue
+        if op and op.lower() not in OPERATORS:
+            value, op = f"{op}:{value or ''}", None
+        yield None, bool(neg), op.lower() if op else None, value or ""
+
+
+def _node(neg, op, value):
+    quoted = value.startswith('"')
+    text = value.strip('"')
+    if op:
+        return Operator(op, text, quoted, neg)
+    if quoted:
+        return Phrase(text, neg)
+    return Term(text, neg)
+
+
+# the indexes parse each dork a few times in a row; a big cache would only hold ASTs nobody asks for again
+@lru_cache(maxsize=4096)
+def parse_dork(dork):
+    """The AST of one dork; see the module docstring."""
+    groups = [([[]], False)]  # open groups: (OR-separated branches, negated)
+    greedy = None
+    pending_neg = False
+    for paren, neg, op, value in _tokens(dork or ""):
+        branch = groups[-1][0][-1]
+        if paren == "(":
+            groups.append(([[]], pending_neg))
+            pending_neg = False
+            greedy = None
+            continue
+        if paren == ")":
+            if len(groups) > 1:
+                closed = groups.pop()
+                groups[-1][0][-1].extend(_close(*closed))
+            greedy = None
+            continue
+        if paren == "|" or (not op and not neg and value == "OR"):
+            groups[-1][0].append([])
+            greedy = None
+            continue
+        if neg and not op and not value:
+            pending_neg = True  # "-(" negates the group that follows
+            continue
+        if op:
+            greedy = op if op in _GREEDY else None
+            if greedy and not value:
+                branch.append(Operator(op, "", False, neg))
+                continue
+        elif (greedy and not neg and not value.startswith('"') and branch
+              and isinstance(branch[-1], Operator) and branch[-1].name == greedy):
+            # more words for a preceding allintitle:/allinurl:/...
+            last = branch[-1]
+            branch[-1] = last._replace(value=f"{last.value} {value}".strip())
+            continue
+        branch.append(_node(neg, op, value))
+    while len(groups) > 1:  # unclosed parentheses
+        closed = groups.pop()
+        groups[-1][0][-1].extend(_close(*closed))
+    return tuple(_close(*groups[0]))
+
+
+def _close(branches, negated):
+    """Nodes a finished group contributes to its parent's current branch."""
+    branches = [b for b in branches if b]
+    if not branches:
+        return []
+    if len(branches) == 1:
+        return [Group(tuple(branches[0]), True)] if negated else branches[0]
+    items = tuple(b[0] if len(b) == 1 else Group(tuple(b), False) for b in branches)
+    return [OrGroup(items, negated)]
+
+
+def walk(nodes):
+    """Every Operator/Phrase/Term in an AST, descending into groups."""
+    for node in nodes:
+        if isinstance(node, (OrGroup, Group)):
+            yield from walk(node.items)
+        else:
+            yield node
+
+
+def positive_nodes(nodes, negated=False):
+    """The Operator/Phrase/Term leaves a matching page must satisfy (not excluded ones)."""
+    for node in nodes:
+        neg = negated or node.negated
+        if isinstance(node, (OrGroup, Group)):
+            yield from positive_nodes(node.items, neg)
+        elif not neg:
+            yield node
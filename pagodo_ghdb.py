@@ -0,0 +1,216 @@
+"""
+Exploit-DB GHDB exports.
+
+An export (ghdb.json from https://www.exploit-db.com/google-hacking-database)
+is a list of records like
+
+    {"id": "2", "date": "2003-06-24",
+     "url_title": "<a href=\\"/ghdb/2\\">intitle:\\"Ganglia\\" ...</a>",
+     "author": {"id": "2168", "name": "anonymous"},
+     "category": {"cat_id": "8", "cat_title": "Files Containing Juicy Info",
+                  "cat_description": "...", ...}, ...}
+
+convert() turns one into {"categories": ..., "dorks": [...]} with the id,
+date, author and category of every dork. Each url_title is a single anchor,
+so the dork is the text between its tags (a compiled regex strips anything
+less regular) with HTML entities decoded; no DOM is built. For exports
+larger than a chunk the anchors are handed to worker processes; the records
+themselves are assembled in this process, since shipping whole rows to a
+worker costs more than converting them.
+
+update_from_export() refreshes the dork database from a newer export
+without touching the user's dorks or favorites: records are compared by
+GHDB id and a digest of their content against the ones the list was last
+updated from, and only the added, changed and removed ones are applied.
+
+    python pagodo_ghdb.py ghdb.json [--dry-run]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from pagodo_core import _norm
+from pagodo_db import DorkDatabase, GhdbRecordStore
+
+# records per worker chunk when an export is converted in parallel
+CHUNK = 50000
+_TAG = re.compile(r"<[^>]*>")
+
+GhdbDelta = namedtuple("GhdbDelta", "added changed removed")
+
+
+def anchor_text(markup):
+    """The text of an HTML fragment: tags dropped, entities decoded."""
+    if "<" in markup:
+        # the usual case, one anchor around plain text, needs no regex
+        start = markup.find(">") + 1
+        if markup.startswith("<a") and markup.endswith("</a>") and "<" not in markup[start:-4]:
+            markup = markup[start:-4]
+        else:
+            markup = _TAG.sub("", markup)
+    if "&" in markup:
+        markup = html.unescape(markup)
+    return markup
+
+
+def anchor_texts(markups):
+    return [anchor_text(m) for m in markups]
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _author(entry):
+    author = entry.get("author")
+    if isinstance(author, dict):
+        return author.get("name")
+    pair = entry.get("author_id")
+    return pair[1] if isinstance(pair, list) and len(pair) > 1 else author
+
+
+def _category(entry):
+    cat = entry.get("category")
+    if isinstance(cat, dict) and cat.get("cat_title"):
+        return cat["cat_title"], _int(cat.get("cat_id")), cat.get("cat_description")
+    pair = entry.get("cat_id")
+    if isinstance(pair, list) and len(pair) > 1 and pair[1]:
+        return pair[1], _int(pair[0]), None
+    return None, None, None
+
+
+def convert(entries, workers=None, chunk=CHUNK):
+    """{"categories": ..., "dorks": [...]} for the rows of an export, in export order."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    markups = [entry.get("url_title") or "" for entry in entries]
+    if workers > 1 and len(markups) > chunk:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = pool.map(anchor_texts, [markups[i:i + chunk] for i in range(0, len(markups), chunk)])
+            texts = [text for part in parts for text in part]
+    else:
+        texts = anchor_texts(markups)
+
+    categories, dorks = {}, []
+    for entry, text in zip(entries, texts):
+        try:  # current exports carry the category and author as objects
+            title, author = entry["category"]["cat_title"], entry["author"]["name"]
+        except (KeyError, TypeError):
+            title, author = None, _author(entry)
+        if title not in categories:
+            title, cat_id, description = _category(entry)
+            if not title:
+                continue
+            categories.setdefault(title, {"id": cat_id, "description": description})
+        dorks.append({"id": _int(entry.get("id")), "date": entry.get("date"), "author": author,
+                      "category": title, "dork": text})
+    return {"categories": categories, "dorks": dorks}
+
+
+def dorks_by_category(records):
+    """{category: [dork, ...]}, categories in order of first appearance."""
+    ghdb = {}
+    for record in records["dorks"]:
+        ghdb.setdefault(record["category"], []).append(record["dork"])
+    return ghdb
+
+
+def load_export(path):
+    """The record rows of an export (or of a bare list of them)."""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return raw["data"] if isinstance(raw, dict) else raw
+
+
+def load_records(path, workers=None):
+    """
+    Converted records from an Exploit-DB export, or from a records file
+    written by dorks/build_ghdb_json_from_exploitdb.py --records.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if isinstance(raw, dict) and isinstance(raw.get("dorks"), list):
+        return raw
+    return convert(raw["data"] if isinstance(raw, dict) else raw, workers)
+
+
+def record_rows(records):
+    """
+    {id: (id, digest, category, dork, date, author)} for the usable records,
+    normalized the way the database stores them. Records without an
+    integer id or a dork are skipped; a repeated id keeps its last record.
+    """
+    rows = {}
+    for r in records["dorks"]:
+        rid, cat, dork = r.get("id"), (r.get("category") or "").strip(), _norm(r.get("dork") or "")
+        if not isinstance(rid, int) or not cat or not dork:
+            continue
+        date, author = r.get("date"), r.get("author")
+        key = "\0".join((cat, dork, str(date or ""), str(author or ""))).encode("utf-8")
+        rows[rid] = (rid, hashlib.blake2b(key, digest_size=8).digest(), cat, dork, date, author)
+    return rows
+
+
+def diff_records(rows, digests):
+    """GhdbDelta of new record rows against the {id: digest} last applied, ids sorted."""
+    added = sorted(rid for rid in rows if rid not in digests)
+    changed = sorted(rid for rid in rows if rid in digests and digests[rid] != rows[rid][1])
+    removed = sorted(rid for rid in digests if rid not in rows)
+    return GhdbDelta(added, changed, removed)
+
+
+def update_from_export(db, path, dry_run=False, workers=1):
+    """
+    Bring db's dork list in line with the export at path; returns
+    (GhdbDelta, added pairs, dropped pairs) where the pairs are the
+    (category, dork) entries that joined or left the merged list.
+    workers stays 1 inside the app, where a process pool would start
+    another copy of a frozen build.
+    """
+    store = GhdbRecordStore(db)
+    rows = record_rows(load_records(path, workers))
+    delta = diff_records(rows, store.digests())
+    if dry_run:
+        return delta, [], []
+    base = None
+    if db.get_meta("full_db") != "1":
+        from embedded_ghdb import GHDB_DATA
+        base = GHDB_DATA
+    upserts = [rows[rid] for rid in delta.added + delta.changed]
+    added, dropped = store.apply(upserts, delta.removed, base)
+    return delta, added, dropped
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Update the dork database from an Exploit-DB GHDB export.")
+    ap.add_argument("export", help="ghdb.json from Exploit-DB, or a --records file")
+    ap.add_argument("--db", help="dork database (default: the app's)")
+    ap.add_argument("--dry-run", action="store_true", help="only report what would change")
+    ap.add_argument("--workers", type=int, default=None, help="processes for large exports (default: CPU count)")
+    args = ap.parse_args(argv)
+
+    db = DorkDatabase(args.db, write_delay=0)
+    try:
+        start = time.perf_counter()
+        delta, added, dropped = update_from_export(db, args.export, args.dry_run, args.workers)
+        seconds = time.perf_counter() - start
+    finally:
+        db.close()
+    print(f"[+] records: {len(delta.added)} added, {len(delta.changed)} changed, {len(delta.removed)} removed")
+    if not args.dry_run:
+        print(f"[+] dork list: {len(added)} added, {len(dropped)} dropped ({seconds * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
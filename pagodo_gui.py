@@ -2,24 +2,50 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from ttkbootstrap import Style
 from ttkbootstrap.tooltip import ToolTip
+import argparse
+import collections
 import json
 import os
 import random
 import webbrowser
-from pathlib import Path
 import threading
 import time
-import traceback
+import queue
 
-from pagodo_core import run_pagodo_scan
-from embedded_ghdb import GHDB_DATA
+from pagodo_core import (
+    ENGINES, DEFAULT_ENGINE, ResultCache, parse_domains, read_domains,
+    _intern, _norm, _appdata_dir,
+)
+from pagodo_db import normalize_full
+from pagodo_index import CategoryIndex, DorkIndex
+from pagodo_jobs import JobQueue, JobRunner
+from pagodo_startup import StartupProfile, build_search_index, load_dork_state
+
+# --profile-startup counts from here; a launcher that sets PAGODO_STARTUP_T0 gets the imports counted too
+START_TIME = time.time()
 
 APP_TITLE = "Pagodo GUI — Neo Hacker Edition"
-CONFIG_DIR_NAME = "PagodoGUI"
 FAV_CATEGORY_NAME = "★ Favorites"
 UNKNOWN_CAT_BUCKET = "Imported Dorks"
 CONTACT_EMAIL = "kurasaki2010@gmail.com"
 
+# Streaming scan results: how often the log drains the result queue, and how much per tick
+SCAN_DRAIN_MS = 100
+SCAN_DRAIN_BATCH = 200
+# search box: delay after the last keystroke before searching
+SEARCH_DEBOUNCE_MS = 150
+# imported dorks added to the list and search index per drain tick
+IMPORT_APPLY_BATCH = 500
+# facet filters: "any" entry and how many values each dropdown lists
+FACET_ANY = "(any)"
+FACET_LIMIT = 200
+# scan jobs run in parallel on this many background workers
+SCAN_WORKERS = 2
+# seconds closing the window waits for scan workers to stop before closing the job queue and cache
+SHUTDOWN_WAIT = 5
+# how often the window checks whether the dork database has finished loading
+STARTUP_POLL_MS = 50
+
 EMOJI_DEFAULT = "🗂️"
 EMOJI_LOCK = "🔒"
 EMOJI_DB = "🗄️"
@@ -29,10 +55,6 @@ EMOJI_USER = "👤"
 EMOJI_SERVER = "🖥️"
 
 
-def _norm(s):
-    return " ".join(str(s).split()) if s is not None else ""
-
-
 def _emoji_for_category(cat):
     c = (cat or "").lower()
     if any(k in c for k in ("login", "admin", "auth", "password")):
@@ -50,160 +72,6 @@ def _emoji_for_category(cat):
     return EMOJI_DEFAULT
 
 
-def _appdata_dir():
-    if os.name == "nt":
-        return Path(os.environ.get("APPDATA", str(Path.home() / "AppData" / "Roaming"))) / CONFIG_DIR_NAME
-    return Path(os.environ.get("XDG_CONFIG_HOME", str(Path.home() / ".config"))) / CONFIG_DIR_NAME
-
-
-class UserDorkStore:
-    """
-    Persist only user-added dorks: list of {"category": str, "dork": str}
-    Does NOT store the whole DB — only user additions/edits.
-    """
-    def __init__(self):
-        self.path = _appdata_dir() / "user_dorks.json"
-        self._cache = None
-
-    def load(self):
-        if self._cache is not None:
-            return list(self._cache)
-        if self.path.exists():
-            try:
-                rows = json.loads(self.path.read_text(encoding="utf-8"))
-            except Exception:
-                rows = []
-        else:
-            rows = []
-        # normalize
-        for r in rows:
-            if "dork" in r:
-                r["dork"] = _norm(r["dork"])
-            if "category" in r and r["category"] is not None:
-                r["category"] = r["category"].strip()
-        self._cache = rows
-        return list(self._cache)
-
-    def _save(self, rows):
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self.path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
-        tmp.replace(self.path)
-
-    def add(self, category, dork):
-        rows = self.load()
-        item = {"category": (category or "").strip(), "dork": _norm(dork)}
-        for r in rows:
-            if r.get("category") == item["category"] and _norm(r.get("dork", "")) == item["dork"]:
-                return
-        rows.append(item)
-        self._cache = rows
-        self._save(rows)
-
-    def remove(self, category, dork):
-        nd = _norm(dork)
-        rows = [r for r in self.load() if not (r.get("category") == (category or "").strip() and _norm(r.get("dork", "")) == nd)]
-        self._cache = rows
-        self._save(rows)
-
-    def update(self, old_cat, old_dork, new_cat, new_dork):
-        rows = self.load()
-        ond = _norm(old_dork)
-        changed = False
-        for r in rows:
-            if r.get("category") == (old_cat or "").strip() and _norm(r.get("dork", "")) == ond:
-                r["category"] = (new_cat or "").strip()
-                r["dork"] = _norm(new_dork)
-                changed = True
-                break
-        if changed:
-            self._cache = rows
-            self._save(rows)
-
-
-class DorkListStore:
-    """
-    Optional full DB override on disk:
-    - Saves/loads {"Category": ["d1","d2", ...], ...}
-    """
-    def __init__(self):
-        self.path = _appdata_dir() / "all_dorks.json"
-
-    def exists(self):
-        return self.path.exists()
-
-    def load(self):
-        if not self.exists():
-            return None
-        try:
-            return json.loads(self.path.read_text(encoding="utf-8"))
-        except Exception:
-            return None
-
-    def save(self, data):
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self.path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-        tmp.replace(self.path)
-
-    def clear(self):
-        try:
-            if self.path.exists():
-                self.path.unlink()
-        except Exception:
-            pass
-
-
-class FavoritesStore:
-    """Persist favorites as [{"dork": str, "category": str}]"""
-    def __init__(self):
-        self.path = _appdata_dir() / "favorites.json"
-        self._cache = None
-
-    def load(self):
-        if self._cache is not None:
-            return list(self._cache)
-        if self.path.exists():
-            try:
-                rows = json.loads(self.path.read_text(encoding="utf-8"))
-            except Exception:
-                rows = []
-        else:
-            rows = []
-        for r in rows:
-            if "dork" in r:
-                r["dork"] = _norm(r["dork"])
-            if "category" in r and r["category"] is not None:
-                r["category"] = r["category"].strip()
-        self._cache = rows
-        return list(self._cache)
-
-    def _save(self, rows):
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self.path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
-        tmp.replace(self.path)
-
-    def is_favorite(self, dork):
-        nd = _norm(dork)
-        return any(_norm(r.get("dork", "")) == nd for r in self.load())
-
-    def add(self, dork, category):
-        nd = _norm(dork)
-        rows = self.load()
-        if any(_norm(r.get("dork", "")) == nd for r in rows):
-            return
-        rows.append({"dork": nd, "category": (category or "").strip()})
-        self._cache = rows
-        self._save(rows)
-
-    def remove(self, dork):
-        nd = _norm(dork)
-        rows = [r for r in self.load() if _norm(r.get("dork", "")) != nd]
-        self._cache = rows
-        self._save(rows)
-
-
 class ManageDorksWindow(tk.Toplevel):
     def __init__(self, app):
         super().__init__(app.root)
@@ -284,7 +152,7 @@ class ManageDorksWindow(tk.Toplevel):
 
     def _add_or_save(self):
         cat = (self.var_cat.get() or "").strip()
-        dork = _norm(self.var_dork.get())
+        dork = _intern(self.var_dork.get())
         if not cat:
             messagebox.showwarning("Missing category", "Please enter a category.")
             return
@@ -297,19 +165,11 @@ class ManageDorksWindow(tk.Toplevel):
             old_cat, old_dork = self.tree.item(sel[0], "values")
             if (old_cat, old_dork) != (cat, dork):
                 self.app.user_store.update(old_cat, old_dork, cat, dork)
-                try:
-                    if old_cat in self.app.dorks_by_category and old_dork in self.app.dorks_by_category[old_cat]:
-                        self.app.dorks_by_category[old_cat].remove(old_dork)
-                except ValueError:
-                    pass
-                self.app.dorks_by_category.setdefault(cat, [])
-                if dork not in self.app.dorks_by_category[cat]:
-                    self.app.dorks_by_category[cat].append(dork)
+                self.app._remove_from_category(old_cat, old_dork)
+                self.app._add_to_category(cat, dork)
         else:
             self.app.user_store.add(cat, dork)
-            self.app.dorks_by_category.setdefault(cat, [])
-            if dork not in self.app.dorks_by_category[cat]:
-                self.app.dorks_by_category[cat].append(dork)
+            self.app._add_to_category(cat, dork)
 
         self._refresh_tree()
         self.app._refresh_after_user_change()
@@ -323,11 +183,7 @@ class ManageDorksWindow(tk.Toplevel):
         if not messagebox.askyesno("Delete", f"Delete this dork?\n\n[{cat}]\n{dork}"):
             return
         self.app.user_store.remove(cat, dork)
-        try:
-            if cat in self.app.dorks_by_category and dork in self.app.dorks_by_category[cat]:
-                self.app.dorks_by_category[cat].remove(dork)
-        except ValueError:
-            pass
+        self.app._remove_from_category(cat, dork)
         self._refresh_tree()
         self.app._refresh_after_user_change()
 
@@ -335,9 +191,264 @@ class ManageDorksWindow(tk.Toplevel):
         self.destroy()
 
 
+class ScanJobsWindow(tk.Toplevel):
+    REFRESH_MS = 1000
+
+    def __init__(self, app):
+        super().__init__(app.root)
+        self.app = app
+        self.title("Scan Jobs")
+        self.minsize(860, 380)
+        self.resizable(True, True)
+        self.transient(app.root)
+
+        cols = ("label", "engine", "domains", "status", "progress", "priority", "created")
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", selectmode="browse")
+        for col, text, width in (("label", "Job", 260), ("engine", "Engine", 90), ("domains", "Domains", 160),
+                                 ("status", "Status", 80), ("progress", "Progress", 110),
+                                 ("priority", "Priority", 60), ("created", "Created", 130)):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor="w")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 6))
+        self.tree.bind("<Double-1>", lambda _e: self._view())
+
+        bottom = ttk.Frame(self)
+        bottom.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(bottom, text="View Results", command=self._view).pack(side=tk.LEFT)
+        ttk.Button(bottom, text="Pause", command=lambda: self._act(self.app.job_runner.pause)).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(bottom, text="Resume", command=lambda: self._act(self.app.job_runner.resume)).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(bottom, text="Cancel", command=lambda: self._act(self.app.job_runner.cancel)).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(bottom, text="Priority +", command=lambda: self._bump(1)).pack(side=tk.LEFT, padx=(18, 0))
+        ttk.Button(bottom, text="Priority −", command=lambda: self._bump(-1)).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(bottom, text="Delete", command=self._delete).pack(side=tk.LEFT, padx=(18, 0))
+        ttk.Button(bottom, text="Close", command=self._close).pack(side=tk.RIGHT)
+
+        self.protocol("WM_DELETE_WINDOW", self._close)
+        self.refresh()
+        self._center()
+        self.after(self.REFRESH_MS, self._auto_refresh)
+
+    def _center(self):
+        self.update_idletasks()
+        x = self.app.root.winfo_rootx() + self.app.root.winfo_width() // 2 - self.winfo_width() // 2
+        y = self.app.root.winfo_rooty() + self.app.root.winfo_height() // 2 - self.winfo_height() // 2
+        self.geometry(f"+{x}+{y}")
+
+    def refresh(self):
+        selected = self._selected()
+        self.tree.delete(*self.tree.get_children())
+        for row in self.app.job_queue.list():
+            domains = json.loads(row["domains"])
+            progress = f"{row['done'] + row['failed']}/{row['total']}"
+            if row["failed"]:
+                progress += f" ({row['failed']} failed)"
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created"]))
+            self.tree.insert("", "end", iid=row["id"], values=(
+                row["label"], row["engine"], ", ".join(domains[:3]) + (" …" if len(domains) > 3 else ""),
+                row["status"], progress, row["priority"], created))
+        if selected and self.tree.exists(selected):
+            self.tree.selection_set(selected)
+
+    def _auto_refresh(self):
+        try:
+            self.refresh()
+            self.after(self.REFRESH_MS, self._auto_refresh)
+        except tk.TclError:
+            pass
+
+    def _selected(self):
+        sel = self.tree.selection()
+        return sel[0] if sel else None
+
+    def _view(self):
+        job_id = self._selected()
+        if job_id:
+            self.app._watch_job(job_id)
+
+    def _act(self, action):
+        job_id = self._selected()
+        if job_id:
+            action(job_id)
+            self.refresh()
+
+    def _bump(self, delta):
+        job_id = self._selected()
+        row = self.app.job_queue.get(job_id) if job_id else None
+        if row:
+            self.app.job_queue.set_priority(job_id, row["priority"] + delta)
+            self.refresh()
+
+    def _delete(self):
+        job_id = self._selected()
+        row = self.app.job_queue.get(job_id) if job_id else None
+        if not row:
+            return
+        if row["status"] in ("running", "paused") and job_id in self.app.job_runner.active:
+            messagebox.showwarning("Delete", "Cancel this job before deleting it.", parent=self)
+            return
+        if not messagebox.askyesno("Delete", f"Delete job {row['label']} and its results?", parent=self):
+            return
+        self.app.job_queue.delete(job_id)
+        if getattr(self.app, "current_job_id", None) == job_id:
+            self.app.current_job_id = None
+        self.refresh()
+
+    def _close(self):
+        self.app.jobs_window = None
+        self.destroy()
+
+
+class ImportWindow(tk.Toplevel):
+    """Progress of a background import, with a Cancel button."""
+    def __init__(self, app, path, importer):
+        super().__init__(app.root)
+        self.app = app
+        self.importer = importer
+        self.title("Import Dorks")
+        self.resizable(False, False)
+        self.transient(app.root)
+
+        ttk.Label(self, text=os.path.basename(path), font=("Consolas", 10, "bold")).pack(anchor="w", padx=12, pady=(12, 4))
+        self.bar = ttk.Progressbar(self, length=420, mode="determinate", maximum=1000)
+        self.bar.pack(padx=12, pady=4)
+        self.status_var = tk.StringVar(value="Reading…")
+        ttk.Label(self, textvariable=self.status_var).pack(anchor="w", padx=12, pady=4)
+        buttons = ttk.Frame(self)
+        buttons.pack(fill=tk.X, padx=12, pady=(4, 12))
+        self.button = ttk.Button(buttons, text="Cancel", command=self._cancel)
+        self.button.pack(side=tk.RIGHT)
+        # shown once a finished import has flagged near-duplicates
+        self.review_button = ttk.Button(buttons, text="Review Near-Duplicates…", command=self._review)
+        self.protocol("WM_DELETE_WINDOW", self._cancel)
+        self._center()
+
+    def _center(self):
+        self.update_idletasks()
+        x = self.app.root.winfo_rootx() + self.app.root.winfo_width() // 2 - self.winfo_width() // 2
+        y = self.app.root.winfo_rooty() + self.app.root.winfo_height() // 2 - self.winfo_height() // 2
+        self.geometry(f"+{max(x, 0)}+{max(y, 0)}")
+
+    def update_counts(self, counts, status=None):
+        if counts.get("total"):
+            self.bar["value"] = 1000 * min(counts["bytes"] / counts["total"], 1.0)
+        text = f"{counts['read']:,} read · {counts['added']:,} new · {counts['duplicates']:,} already listed"
+        if counts.get("near_duplicates"):
+            text += f" · {counts['near_duplicates']:,} flagged as near-duplicates"
+        if status == "done":
+            self.bar["value"] = 1000
+            text = "Finished: " + text
+        elif status == "cancelled":
+            text = "Cancelled: " + text + " (new dorks so far were kept)"
+        elif status == "failed":
+            text = f"Failed after {counts['read']:,} read: {counts.get('error')}"
+        self.status_var.set(text)
+        if status:
+            self.button.configure(text="Close", command=self._close)
+            self.protocol("WM_DELETE_WINDOW", self._close)
+            if counts.get("near_duplicates") and status != "failed":
+                self.review_button.pack(side=tk.LEFT)
+
+    def _review(self):
+        self._close()
+        self.app.open_near_duplicates()
+
+    def _cancel(self):
+        self.importer.cancel()
+        self.status_var.set("Cancelling…")
+
+    def _close(self):
+        if self.app.import_window is self:
+            self.app.import_window = None
+        self.destroy()
+
+
+class NearDuplicatesWindow(tk.Toplevel):
+    """Clusters of near-identical dorks, each under its suggested canonical form."""
+    POLL_MS = 200
+
+    def __init__(self, app):
+        super().__init__(app.root)
+        self.app = app
+        self.title("Near-Duplicate Dorks")
+        self.minsize(760, 420)
+        self.transient(app.root)
+
+        self.status_var = tk.StringVar(value="Looking for near-duplicates…")
+        ttk.Label(self, textvariable=self.status_var).pack(anchor="w", padx=10, pady=(10, 4))
+        self.tree = ttk.Treeview(self, columns=("count",), selectmode="browse")
+        self.tree.heading("#0", text="Suggested canonical dork / variants")
+        self.tree.heading("count", text="Variants")
+        self.tree.column("#0", width=620, anchor="w")
+        self.tree.column("count", width=80, anchor="e")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=4)
+
+        bottom = ttk.Frame(self)
+        bottom.pack(fill=tk.X, padx=10, pady=(4, 10))
+        ttk.Button(bottom, text="Show Cluster in List", command=self._show_in_list).pack(side=tk.LEFT)
+        ttk.Button(bottom, text="Close", command=self._close).pack(side=tk.RIGHT)
+        self.protocol("WM_DELETE_WINDOW", self._close)
+
+        # every listed dork plus favorites, searched on a worker thread
+        dorks = list(dict.fromkeys(d for lst in app.dorks_by_category.values() for d in lst))
+        dorks.extend(d for d in app._favorites_list() if d not in app.category_index)
+        from embedded_ghdb import GHDB_DATA
+        prefer = {d for lst in GHDB_DATA.values() for d in lst}
+        self._result = None
+        threading.Thread(target=self._find, args=(dorks, prefer), daemon=True).start()
+        self.after(self.POLL_MS, self._poll)
+        self._center()
+
+    def _center(self):
+        self.update_idletasks()
+        x = self.app.root.winfo_rootx() + self.app.root.winfo_width() // 2 - self.winfo_width() // 2
+        y = self.app.root.winfo_rooty() + self.app.root.winfo_height() // 2 - self.winfo_height() // 2
+        self.geometry(f"+{max(x, 0)}+{max(y, 0)}")
+
+    def _find(self, dorks, prefer):
+        from pagodo_similar import find_near_duplicates
+        try:
+            self._result = (len(dorks), find_near_duplicates(dorks, prefer=prefer))
+        except Exception as e:
+            self._result = e
+
+    def _poll(self):
+        if self._result is None:
+            try:
+                self.after(self.POLL_MS, self._poll)
+            except tk.TclError:
+                pass
+            return
+        if isinstance(self._result, Exception):
+            self.status_var.set(f"Search failed: {self._result}")
+            return
+        total, clusters = self._result
+        extra = sum(len(c.members) - 1 for c in clusters)
+        self.status_var.set(f"{len(clusters):,} clusters among {total:,} dorks; "
+                            f"{extra:,} dorks could be replaced by their canonical form.")
+        for i, cluster in enumerate(clusters):
+            parent = self.tree.insert("", "end", iid=f"c{i}", text=cluster.canonical, values=(len(cluster.members),))
+            for dork in cluster.members:
+                if dork != cluster.canonical:
+                    self.tree.insert(parent, "end", text=dork, values=("",))
+
+    def _show_in_list(self):
+        sel = self.tree.selection()
+        if not sel or self._result is None or isinstance(self._result, Exception):
+            return
+        item = sel[0] if self.tree.parent(sel[0]) == "" else self.tree.parent(sel[0])
+        cluster = self._result[1][int(item[1:])]
+        self.app.dorks_listbox.delete(0, tk.END)
+        self.app.dorks_listbox.insert(tk.END, *cluster.members)
+
+    def _close(self):
+        self.destroy()
+
+
 class PagodoGUI:
-    def __init__(self, root):
+    def __init__(self, root, profile=None, exit_when_ready=False):
         self.root = root
+        self.profile = profile or StartupProfile()
+        self._exit_when_ready = exit_when_ready
         self.root.title(APP_TITLE)
 
         try:
@@ -351,16 +462,28 @@ class PagodoGUI:
         self.root.geometry("1280x780")
         self.root.minsize(960, 720)
 
-        self.user_store = UserDorkStore()
-        self.full_store = DorkListStore()
-        self.fav_store = FavoritesStore()
-
-        stored = self.full_store.load()
-        if stored:
-            self.dorks_by_category = self._normalize_full(stored)
-        else:
-            self.dorks_by_category = {cat: list(dorks) for cat, dorks in GHDB_DATA.items()}
-        self._merge_user_dorks()
+        # the dork database loads on a background thread once the window is up (see _start_loading);
+        # until then the lists are empty and the handlers that change them wait
+        self.dork_db = self.user_store = self.full_store = self.fav_store = None
+        self.dorks_by_category = {}
+        self.category_index = CategoryIndex()
+        self.search_index = DorkIndex()
+        self._loaded = None
+        try:
+            self.result_cache = ResultCache()
+        except Exception:
+            self.result_cache = None
+        self._job_events = queue.Queue()
+        self.jobs_window = None
+        self._import_events = queue.Queue()
+        self._import_pending = collections.deque()
+        self._import_finished = None
+        self.importer = self.import_window = None
+        self._ghdb_update = None  # [outcome] once the running GHDB update finishes
+        # the job queue opens on a background thread as well, since it may have scan
+        # journals to adopt; the runner starts once it is there (see _poll_jobs)
+        self.job_queue = self.job_runner = None
+        self._jobs_loaded = None
 
         self.category_var = tk.StringVar()
         self.domain_var = tk.StringVar()
@@ -368,50 +491,132 @@ class PagodoGUI:
         self.theme_var = tk.StringVar(value="darkly")
 
         # --- Added: search engine support ---
-        self.search_engines = {
-            "Google": "https://www.google.com/search?q={query}",
-            "Yahoo": "https://search.yahoo.com/search?p={query}",
-            "Bing": "https://www.bing.com/search?q={query}",
-            "DuckDuckGo": "https://duckduckgo.com/?q={query}",
-        }
-        self.selected_search_engine = tk.StringVar(value="Google")
-
-        self.style = Style(theme=self.theme_var.get())
-
-        self._build_menubar()
-        self._build_ui()
-        self._set_random_category()
-        self._apply_hacker_theme()
+        self.search_engines = dict(ENGINES)
+        self.selected_search_engine = tk.StringVar(value=DEFAULT_ENGINE)
+
+        with self.profile.phase("theme"):
+            self.style = Style(theme=self.theme_var.get())
+
+        with self.profile.phase("build window"):
+            self._build_menubar()
+            self._build_ui()
+            self._apply_hacker_theme()
+        self.category_var.set("Loading dorks…")
 
         self.root.bind("<Control-d>", lambda e: self.toggle_favorite())
         self.root.bind("<Control-f>", lambda e: self._focus_search())
         self.root.bind("<Control-r>", lambda e: self.run_scan())
         self.root.bind("<Control-e>", lambda e: self.export_all_dorks())
 
-        self._show_daily_dork()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Show enhanced ASCII art banner at startup
         self.root.after(300, self._show_disclaimer_banner)
+        # idle callbacks run after Tk has drawn the window
+        self.root.after_idle(self._start_loading)
+
+    def _start_loading(self):
+        self.profile.mark("first paint")
+        threading.Thread(target=self._load_worker, name="pagodo-startup", daemon=True).start()
+        threading.Thread(target=self._jobs_worker, name="pagodo-job-queue", daemon=True).start()
+        self.root.after(STARTUP_POLL_MS, self._poll_loaded)
+        self.root.after(STARTUP_POLL_MS, self._poll_jobs)
+
+    def _jobs_worker(self):
+        try:
+            jobs = JobQueue()
+            jobs.recover(resume=True)
+            self._jobs_loaded = jobs
+        except Exception as e:
+            self._jobs_loaded = e
+
+    def _poll_jobs(self):
+        if self._jobs_loaded is None:
+            self.root.after(STARTUP_POLL_MS, self._poll_jobs)
+            return
+        if isinstance(self._jobs_loaded, Exception):
+            return
+        self.job_queue = self._jobs_loaded
+        self.job_runner = JobRunner(self.job_queue, workers=SCAN_WORKERS, on_event=self._on_job_event,
+                                    cache=self.result_cache)
+        self.job_runner.start()
+        self.root.after(SCAN_DRAIN_MS, self._drain_job_events)
+
+    def _load_worker(self):
+        try:
+            self._loaded = load_dork_state(self.profile)
+        except Exception as e:
+            self._loaded = e
+
+    def _poll_loaded(self):
+        if self._loaded is None:
+            self.root.after(STARTUP_POLL_MS, self._poll_loaded)
+            return
+        if isinstance(self._loaded, Exception):
+            self.category_var.set("")
+            messagebox.showerror("Dork database", f"Couldn’t load the dork database:\n{self._loaded}")
+            return
+        with self.profile.phase("fill window"):
+            state = self._loaded
+            self.dork_db = state.db
+            self.user_store, self.full_store, self.fav_store = state.user_store, state.full_store, state.fav_store
+            self.dorks_by_category = state.dorks_by_category
+            self.category_index = state.category_index
+            self.search_index = state.search_index
+            self._refresh_categories_combo()
+            self._set_random_category()
+            self._update_fav_count()
+            self._show_daily_dork()
+            if self.search_var.get().strip():
+                self.search_dorks()
+        self.profile.mark("interactive")
+        self.profile.print_report()
+        if self._exit_when_ready:
+            self._on_close()
+
+    def _dorks_ready(self):
+        """False, after telling the user, while the dork database is still loading."""
+        if self.dork_db is not None:
+            return True
+        if isinstance(self._loaded, Exception):
+            messagebox.showerror("Dork database", f"The dork database couldn’t be loaded:\n{self._loaded}")
+        else:
+            messagebox.showinfo("Loading", "The dork database is still loading; try again in a moment.")
+        return False
+
+    def _jobs_ready(self, title="Scan Jobs"):
+        """False, after telling the user, while the scan job queue is opening or unavailable."""
+        if self.job_queue is not None:
+            return True
+        if self._jobs_loaded is None:
+            messagebox.showinfo(title, "The scan job queue is still opening; try again in a moment.")
+        else:
+            messagebox.showerror(title, "The scan job queue is not available.")
+        return False
 
     def _build_menubar(self):
         menubar = tk.Menu(self.root)
 
-        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu = self.file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Import Dorks…", command=self.import_all_dorks)
+        file_menu.add_command(label="Update from GHDB Export…", command=self.update_from_ghdb)
         file_menu.add_command(label="Export Dorks…", command=self.export_all_dorks)
         file_menu.add_separator()
         file_menu.add_command(label="Reset to Embedded", command=self.reset_to_embedded)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self._on_close)
         menubar.add_cascade(label="File", menu=file_menu)
 
         tools_menu = tk.Menu(menubar, tearoff=0)
         tools_menu.add_command(label="Add Dork", command=self.on_add_dork)
         tools_menu.add_command(label="Manage Dorks", command=self.open_manage_dorks)
+        tools_menu.add_command(label="Find Near-Duplicates…", command=self.open_near_duplicates)
         tools_menu.add_command(label="Toggle Favorite", command=self.toggle_favorite, accelerator="Ctrl+D")
         tools_menu.add_separator()
         tools_menu.add_command(label="Run Scan", command=self.run_scan, accelerator="Ctrl+R")
+        tools_menu.add_command(label="Scan Jobs…", command=self.open_scan_jobs)
         tools_menu.add_command(label="Save Results", command=self.save_results)
+        tools_menu.add_command(label="Clear Scan Cache", command=self.clear_scan_cache)
         tools_menu.add_separator()
         tools_menu.add_command(label="Apply Theme", command=self.apply_theme)
         menubar.add_cascade(label="Tools", menu=tools_menu)
@@ -443,7 +648,8 @@ class PagodoGUI:
         ttk.Label(row1, text="Domain (optional):").pack(side=tk.LEFT, padx=(10, 0))
         self.domain_entry = ttk.Entry(row1, textvariable=self.domain_var, width=28)
         self.domain_entry.pack(side=tk.LEFT, padx=5)
-        ToolTip(self.domain_entry, text="Limit search: site:example.com")
+        ToolTip(self.domain_entry, text="Limit search: site:example.com (comma-separate several to batch-scan)")
+        ttk.Button(row1, text="Domains…", command=self.load_domains_file).pack(side=tk.LEFT)
 
         # --- New Search Engine Dropdown ---
         se_frame = ttk.Frame(row1)
@@ -468,7 +674,8 @@ class PagodoGUI:
         row2.pack(fill=tk.X, padx=10, pady=(0, 6))
         ttk.Button(row2, text="Import Dorks…", command=self.import_all_dorks).pack(side=tk.LEFT, padx=5)
         ttk.Button(row2, text="Export Dorks…", command=self.export_all_dorks).pack(side=tk.LEFT, padx=5)
-        ttk.Button(row2, text="Reset to Embedded", command=self.reset_to_embedded).pack(side=tk.LEFT, padx=5)
+        self.reset_btn = ttk.Button(row2, text="Reset to Embedded", command=self.reset_to_embedded)
+        self.reset_btn.pack(side=tk.LEFT, padx=5)
         ttk.Button(row2, text="Help", command=self.show_help).pack(side=tk.LEFT, padx=5)
 
         # Row 3 — search
@@ -477,9 +684,26 @@ class PagodoGUI:
         ttk.Label(search_row, text="Search:").pack(side=tk.LEFT)
         self.search_entry = ttk.Entry(search_row, textvariable=self.search_var, width=44)
         self.search_entry.pack(side=tk.LEFT, padx=6)
-        ToolTip(self.search_entry, text="Filter across all categories + favorites")
+        ToolTip(self.search_entry, text="Filter across all categories + favorites.\n"
+                                        "Operators rank results: filetype:env password, inurl:admin OR intitle:login, -site:gov")
+        self.search_var.trace_add("write", lambda *_: self._schedule_search())
         ttk.Button(search_row, text="Search", command=self.search_dorks).pack(side=tk.LEFT)
 
+        # facet filters; counts come from the facet index and narrow with the other filters
+        self.facet_vars = {}
+        self.facet_combos = {}
+        for facet, label in (("operator", "Operator:"), ("filetype", "File type:"), ("term", "Term:")):
+            ttk.Label(search_row, text=label).pack(side=tk.LEFT, padx=(12, 0))
+            var = tk.StringVar(value=FACET_ANY)
+            combo = ttk.Combobox(search_row, textvariable=var, values=[FACET_ANY], width=18, state="readonly",
+                                 postcommand=lambda f=facet: self._refresh_facet(f))
+            combo.pack(side=tk.LEFT, padx=4)
+            combo.bind("<<ComboboxSelected>>", lambda e: self.search_dorks())
+            self.facet_vars[facet] = var
+            self.facet_combos[facet] = combo
+        ToolTip(self.facet_combos["operator"], text="Only dorks using this operator (count = matching dorks)")
+        ttk.Button(search_row, text="Clear Filters", command=self._clear_facets).pack(side=tk.LEFT, padx=4)
+
         # Row 4 — theme
         theme_row = ttk.Frame(self.root)
         theme_row.pack(fill=tk.X, padx=10, pady=4)
@@ -516,6 +740,9 @@ class PagodoGUI:
         run_row = ttk.Frame(self.root)
         run_row.pack(fill=tk.X, padx=10, pady=5)
         ttk.Button(run_row, text="Run Scan (Ctrl+R)", command=self.run_scan).pack(side=tk.LEFT)
+        self.pause_btn = ttk.Button(run_row, text="Pause", command=self.pause_scan)
+        self.pause_btn.pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(run_row, text="Cancel", command=self.cancel_scan).pack(side=tk.LEFT, padx=6)
         ttk.Button(run_row, text="Save Results", command=self.save_results).pack(side=tk.LEFT, padx=6)
 
         # Log — neon console vibe
@@ -557,7 +784,7 @@ class PagodoGUI:
         if not sel:
             return
         dork = self.dorks_listbox.get(sel[0])
-        domain = self.domain_var.get().strip()
+        domain = self._first_domain()
         query = f'site:{domain} {dork}' if domain else dork
         url_template = self.search_engines.get(self.selected_search_engine.get(), self.search_engines["Google"])
         url = url_template.format(query=query.replace(" ", "+"))
@@ -603,7 +830,7 @@ class PagodoGUI:
         dork = getattr(self, "_daily_dork", "")
         if not dork:
             return
-        domain = self.domain_var.get().strip()
+        domain = self._first_domain()
         query = f'site:{domain} {dork}' if domain else dork
         url_template = self.search_engines.get(self.selected_search_engine.get(), self.search_engines["Google"])
         url = url_template.format(query=query.replace(" ", "+"))
@@ -613,14 +840,7 @@ class PagodoGUI:
         dork = getattr(self, "_daily_dork", "")
         if not dork:
             return
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.insert(tk.END, "Running scan on 1 dork...\n\n")
-        results = run_pagodo_scan([dork], self.domain_var.get())
-        self.scan_results = results
-        for dk, urls in results.items():
-            self.log_text.insert(tk.END, f"[{dk}]\n")
-            for u in urls:
-                self.log_text.insert(tk.END, f"{u}\n")
+        self._enqueue_scan([dork], parse_domains(self._first_domain()), self.selected_search_engine.get())
 
     def open_contact_window(self):
         win = tk.Toplevel(self.root)
@@ -747,47 +967,30 @@ class PagodoGUI:
 
         self._center_child(win)
 
-    def _normalize_full(self, data):
-        if isinstance(data, dict):
-            out = {}
-            for k, v in data.items():
-                if not isinstance(k, str):
-                    continue
-                lst = v if isinstance(v, list) else [v]
-                lst2 = [_norm(x) for x in lst if _norm(x)]
-                out[k] = lst2
-            return out
-        if isinstance(data, list):
-            out = {}
-            for row in data:
-                if not isinstance(row, dict):
-                    continue
-                cat = _norm(row.get("category", ""))
-                dork = _norm(row.get("dork", ""))
-                if not cat or not dork:
-                    continue
-                out.setdefault(cat, [])
-                if dork not in out[cat]:
-                    out[cat].append(dork)
-            return out
-        return {}
-
-    def _merge_user_dorks(self):
-        changed = False
-        for row in self.user_store.load():
-            cat = (row.get("category") or "").strip()
-            dork = _norm(row.get("dork", ""))
-            if not cat or not dork:
-                continue
-            self.dorks_by_category.setdefault(cat, [])
-            if not self._category_has_dork(cat, dork):
-                self.dorks_by_category[cat].append(dork)
-                changed = True
-        if changed and hasattr(self, "category_combo"):
-            self._refresh_categories_combo()
+    def _build_search_index(self):
+        self.search_index = build_search_index(self.dorks_by_category, self.fav_store.load())
 
     def _category_has_dork(self, cat, nd):
-        return any(_norm(x) == nd for x in self.dorks_by_category.get(cat, []))
+        return self.category_index.has(cat, nd)
+
+    def _add_to_category(self, cat, dork):
+        """Append dork to cat and the indexes unless cat already lists it."""
+        self.dorks_by_category.setdefault(cat, [])
+        if self.category_index.has(cat, dork):
+            return False
+        self.dorks_by_category[cat].append(dork)
+        self.category_index.add(cat, dork)
+        self.search_index.add(dork)
+        return True
+
+    def _remove_from_category(self, cat, dork):
+        lst = self.dorks_by_category.get(cat)
+        if not lst or dork not in lst:
+            return False
+        lst.remove(dork)
+        self.category_index.remove(cat, dork)
+        self.search_index.remove(dork)
+        return True
 
     def _all_categories_for_combo(self):
         cats = sorted(self.dorks_by_category.keys())
@@ -825,6 +1028,8 @@ class PagodoGUI:
         self.dorks_listbox.delete(0, tk.END)
         raw = self._raw_from_disp(self.category_var.get())
         if raw == FAV_CATEGORY_NAME:
+            if self.fav_store is None:
+                return
             for dork in [r.get("dork", "") for r in self.fav_store.load() if r.get("dork")]:
                 self.dorks_listbox.insert(tk.END, dork)
             return
@@ -832,47 +1037,76 @@ class PagodoGUI:
             for dork in self.dorks_by_category[raw]:
                 self.dorks_listbox.insert(tk.END, dork)
 
+    def _schedule_search(self):
+        # search as you type, once typing pauses
+        if getattr(self, "_search_after", None):
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(SEARCH_DEBOUNCE_MS, self.search_dorks)
+
+    def _facet_filters(self):
+        # "value (count)" in the dropdown -> {facet: value}
+        out = {}
+        for facet, var in getattr(self, "facet_vars", {}).items():
+            choice = var.get()
+            if choice and choice != FACET_ANY:
+                out[facet] = choice.rsplit(" (", 1)[0]
+        return out
+
+    def _refresh_facet(self, facet):
+        counts = self.search_index.facets.counts(facet, self._facet_filters(), limit=FACET_LIMIT)
+        self.facet_combos[facet]["values"] = [FACET_ANY] + [f"{v} ({n})" for v, n in counts]
+
+    def _clear_facets(self):
+        for var in self.facet_vars.values():
+            var.set(FACET_ANY)
+        self.search_dorks()
+
     def search_dorks(self):
-        query = (self.search_var.get() or "").lower()
+        self._search_after = None
         self.dorks_listbox.delete(0, tk.END)
-        added = set()
-        for dorks in self.dorks_by_category.values():
-            for dork in dorks:
-                if query in dork.lower() and dork not in added:
-                    self.dorks_listbox.insert(tk.END, dork)
-                    added.add(dork)
-        for r in self.fav_store.load():
-            dork = r.get("dork", "")
-            if dork and query in dork.lower() and dork not in added:
-                self.dorks_listbox.insert(tk.END, dork)
-                added.add(dork)
+        query = self.search_var.get()
+        filters = self._facet_filters()
+        if filters:
+            allowed = self.search_index.facets.select(filters)
+            if query.strip():
+                allowed = set(allowed)
+                hits = [d for d in self.search_index.search(query) if d in allowed]
+            else:
+                hits = allowed
+        else:
+            hits = self.search_index.search(query)
+        if hits:
+            self.dorks_listbox.insert(tk.END, *hits)
 
     def toggle_favorite(self):
+        if not self._dorks_ready():
+            return
         selection = self.dorks_listbox.curselection()
         if not selection:
             messagebox.showinfo("Favorites", "Select one or more dorks first.")
             return
         current_raw = self._raw_from_disp(self.category_var.get())
-        changed = False
+        shown = self.dorks_listbox.get(0, tk.END)
+        unstar, star = {}, {}
         for idx in selection:
-            dork = _norm(self.dorks_listbox.get(idx))
-            if not dork:
+            dork = _norm(shown[idx])
+            if not dork or dork in unstar or dork in star:
                 continue
             if self.fav_store.is_favorite(dork):
-                self.fav_store.remove(dork)
-                changed = True
+                unstar[dork] = None
             else:
                 cat_to_store = current_raw if current_raw != FAV_CATEGORY_NAME else ""
                 if not cat_to_store:
-                    for c, lst in self.dorks_by_category.items():
-                        if self._category_has_dork(c, dork):
-                            cat_to_store = c
-                            break
-                    if not cat_to_store:
-                        cat_to_store = UNKNOWN_CAT_BUCKET
-                self.fav_store.add(dork, cat_to_store)
-                changed = True
-        if changed:
+                    cat_to_store = self.category_index.category_of(dork) or UNKNOWN_CAT_BUCKET
+                star[dork] = cat_to_store
+        # one commit however many dorks are selected
+        with self.fav_store.batch():
+            self.fav_store.remove_many(unstar)
+            self.fav_store.add_many(star.items())
+        for dork in unstar:
+            self.search_index.remove(dork)
+        self.search_index.update(star)
+        if unstar or star:
             self._update_fav_count()
             if current_raw == FAV_CATEGORY_NAME:
                 self.load_dorks()
@@ -882,11 +1116,13 @@ class PagodoGUI:
 
     def _update_fav_count(self):
         try:
-            self.fav_count_var.set(f"★ {len(self._favorites_list())}")
+            self.fav_count_var.set(f"★ {self.fav_store.count()}")
         except Exception:
             pass
 
     def on_add_dork(self):
+        if not self._dorks_ready():
+            return
         raw_cat = self._raw_from_disp(self.category_var.get())
         if not raw_cat or raw_cat == FAV_CATEGORY_NAME:
             messagebox.showwarning("No category", "Select a real category first (not Favorites).")
@@ -897,7 +1133,7 @@ class PagodoGUI:
         dork = simpledialog.askstring("Add Custom Dork", "Enter the Google dork:")
         if not dork:
             return
-        dork = _norm(dork)
+        dork = _intern(dork)
         if not dork:
             messagebox.showwarning("Empty dork", "Please enter a non-empty dork.")
             return
@@ -905,7 +1141,7 @@ class PagodoGUI:
             messagebox.showinfo("Already exists", f"This dork already exists in “{raw_cat}”.")
             return
 
-        self.dorks_by_category[raw_cat].append(dork)
+        self._add_to_category(raw_cat, dork)
         try:
             self.user_store.add(raw_cat, dork)
         except Exception:
@@ -914,7 +1150,13 @@ class PagodoGUI:
             self.load_dorks()
         messagebox.showinfo("Added", f"Dork added under “{raw_cat}”.")
 
+    def open_near_duplicates(self):
+        if self._dorks_ready():
+            NearDuplicatesWindow(self)
+
     def open_manage_dorks(self):
+        if not self._dorks_ready():
+            return
         for w in self.root.winfo_children():
             if isinstance(w, ManageDorksWindow):
                 try:
@@ -924,67 +1166,203 @@ class PagodoGUI:
                     pass
         ManageDorksWindow(self)
 
+    def _first_domain(self):
+        domains = parse_domains(self.domain_var.get())
+        return domains[0] if domains else ""
+
+    def load_domains_file(self):
+        path = filedialog.askopenfilename(
+            title="Load Domain List",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            domains = parse_domains(read_domains(path))
+        except Exception as e:
+            messagebox.showerror("Load failed", f"Could not read domains:\n{e}")
+            return
+        self.domain_var.set(", ".join(domains))
+        messagebox.showinfo("Domains", f"Loaded {len(domains)} domains. Run Scan will cover every selected dork on each.")
+
     def run_scan(self):
         selected = [self.dorks_listbox.get(i) for i in self.dorks_listbox.curselection()]
-        domain = self.domain_var.get()
+        domains = parse_domains(self.domain_var.get())
+        engine = self.selected_search_engine.get()
         if not selected:
             messagebox.showwarning("No dorks selected", "Please select dorks first.")
             return
+        self._enqueue_scan(selected, domains, engine)
 
-        # Clear log and status
+    def _enqueue_scan(self, dorks, domains, engine):
+        """Queue a scan job for dorks x domains and show it in the log."""
+        if not self._jobs_ready("Scan error"):
+            return
+        label = dorks[0] if len(dorks) == 1 else f"{len(dorks)} dorks"
+        if len(domains) > 1:
+            label += f" x {len(domains)} domains"
+        elif domains:
+            label += f" @ {domains[0]}"
+        job_id = self.job_queue.enqueue(dorks, domains, engine, label=label)
+        self._watch_job(job_id)
+        self.job_runner.wake()
+
+    def _on_job_event(self, kind, job_id, payload):
+        # called on job worker threads; only results of the watched job are forwarded
+        if kind == "status" or job_id == getattr(self, "current_job_id", None):
+            self._job_events.put((kind, job_id, payload))
+
+    def _watch_job(self, job_id):
+        """Show a job's results in the log: what it already has, then live updates."""
+        row = self.job_queue.get(job_id)
+        if row is None:
+            return
+        self.current_job_id = job_id
+        self._current_multi = len(json.loads(row["domains"])) > 1
+        self.scan_results = {}
+        self.pause_btn.configure(text="Resume" if row["status"] == "paused" else "Pause")
         self.log_text.delete(1.0, tk.END)
-        self.log_text.insert(tk.END, f"Running scan on {len(selected)} dorks...\n\n")
+        self.log_text.insert(tk.END, f"Scan job {row['label']} — {row['status']}, "
+                                     f"{row['done'] + row['failed']}/{row['total']} queries\n\n")
+        try:
+            for item in self.job_queue.load(job_id).iter_results():
+                self._show_result(item)
+        except (OSError, ValueError):
+            pass
+        self.log_text.see(tk.END)
+        self._current_status = row["status"]
+        if row["status"] in ("queued", "running", "paused"):
+            self._tick_spinner()
+
+    def _show_result(self, item, chunks=None):
+        domain, dork, urls, error = item
+        value = {"error": error} if error else urls
+        body = f"  ! failed: {error}\n" if error else "".join(f"{url}\n" for url in urls)
+        if self._current_multi:
+            self.scan_results.setdefault(domain, {})[dork] = value
+            text = f"[site:{domain}] [{dork}]\n{body}\n"
+        else:
+            self.scan_results[dork] = value
+            text = f"[{dork}]\n{body}\n"
+        if chunks is None:
+            self.log_text.insert(tk.END, text)
+        else:
+            chunks.append(text)
 
-        # Spinner state
-        self._scan_complete = False
+    def _tick_spinner(self):
+        if getattr(self, "_spinner_running", False):
+            return
+        self._spinner_running = True
         self._spinner_phase = 0
 
-        def tick_spinner():
-            if not getattr(self, "_scan_complete", True):
+        def tick():
+            status = getattr(self, "_current_status", "done")
+            if status in ("queued", "running", "paused"):
                 spinner = "|/-\\"
                 ch = spinner[self._spinner_phase % len(spinner)]
                 self._spinner_phase += 1
+                state = {"queued": "Queued", "paused": "Paused"}.get(status, f"Scanning {ch}")
                 try:
-                    self.root.title(f"{APP_TITLE} — Scanning {ch}")
+                    self.root.title(f"{APP_TITLE} — {state}")
                 except Exception:
                     pass
-                self.root.after(120, tick_spinner)
+                self.root.after(120, tick)
             else:
+                self._spinner_running = False
                 self.root.title(APP_TITLE)
 
-        tick_spinner()
+        tick()
 
-        def do_scan():
+    def _drain_job_events(self):
+        chunks = []
+        finished = None
+        changed = False
+        for _ in range(SCAN_DRAIN_BATCH):
             try:
-                results = run_pagodo_scan(selected, domain)
-            except Exception:
-                try:
-                    with open("error_log.txt", "w", encoding="utf-8") as f:
-                        f.write(traceback.format_exc())
-                except Exception:
-                    pass
-                def show_err():
-                    self._scan_complete = True
-                    messagebox.showerror("Scan error", "An error occurred during scanning. See error_log.txt for details.")
-                self.root.after(0, show_err)
-                return
+                kind, job_id, payload = self._job_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "status":
+                changed = True
+                if job_id == getattr(self, "current_job_id", None):
+                    self._current_status = payload
+                    if payload in ("done", "cancelled", "failed"):
+                        finished = payload
+            elif job_id == getattr(self, "current_job_id", None):
+                self._show_result(payload, chunks)
+        if chunks:
+            self.log_text.insert(tk.END, "".join(chunks))
+            self.log_text.see(tk.END)
+        if finished:
+            self._report_job_finished(finished)
+        if changed and self.jobs_window is not None:
+            self.jobs_window.refresh()
+        self.root.after(SCAN_DRAIN_MS, self._drain_job_events)
+
+    def _report_job_finished(self, status):
+        row = self.job_queue.get(self.current_job_id) or {}
+        if status == "failed":
+            messagebox.showerror("Scan error", f"The scan job stopped with an error:\n{row.get('error')}\n\n"
+                                 "Finished queries were kept; resume it from Tools > Scan Jobs.")
+            return
+        if not row.get("done") and not row.get("failed"):
+            self.log_text.insert(tk.END, "No results.\n")
+            return
+        failed = f", {row['failed']} failed — Resume in Scan Jobs retries them" if row.get("failed") else ""
+        verb = "cancelled" if status == "cancelled" else "complete"
+        self.log_text.insert(tk.END, f"Scan {verb}: {row['done']}/{row['total']} queries{failed}.\n")
+        self.log_text.see(tk.END)
+
+    def pause_scan(self):
+        job_id = getattr(self, "current_job_id", None)
+        status = getattr(self, "_current_status", None)
+        if job_id is None or status not in ("running", "paused"):
+            return
+        if status == "paused":
+            self.job_runner.resume(job_id)
+            self.pause_btn.configure(text="Pause")
+        else:
+            self.job_runner.pause(job_id)
+            self.pause_btn.configure(text="Resume")
 
-            def show_results():
-                self._scan_complete = True
-                self.scan_results = results
-                self.log_text.delete(1.0, tk.END)
-                if not results:
-                    self.log_text.insert(tk.END, "No results.\n")
-                    return
-                for dork, urls in results.items():
-                    self.log_text.insert(tk.END, f"[{dork}]\n")
-                    for url in urls:
-                        self.log_text.insert(tk.END, f"{url}\n")
-                    self.log_text.insert(tk.END, "\n")
-                self.log_text.see(tk.END)
-            self.root.after(0, show_results)
+    def cancel_scan(self):
+        job_id = getattr(self, "current_job_id", None)
+        if job_id is None or getattr(self, "_current_status", None) not in ("queued", "running", "paused"):
+            return
+        if messagebox.askyesno("Cancel Scan", "Stop this scan? Finished results are kept."):
+            self.job_runner.cancel(job_id)
 
-        threading.Thread(target=do_scan, daemon=True).start()
+    def open_scan_jobs(self):
+        if not self._jobs_ready():
+            return
+        if self.jobs_window is not None:
+            try:
+                self.jobs_window.lift()
+                return
+            except tk.TclError:
+                self.jobs_window = None
+        self.jobs_window = ScanJobsWindow(self)
+
+    def _on_close(self):
+        if self._ghdb_update is not None:
+            # it can't be interrupted, and closing the database under it would lose it
+            messagebox.showinfo("Exit", "A GHDB update is still running; close the window once it finishes.")
+            return
+        if self.importer is not None:
+            self.importer.cancel()
+            self.importer.join()
+        stopped = True
+        if self.job_runner is not None:
+            # a worker inside a request finishes it first; past the timeout it is left to the exit
+            stopped = self.job_runner.stop(wait=True, timeout=SHUTDOWN_WAIT)
+        if stopped:
+            if isinstance(self._jobs_loaded, JobQueue):
+                self._jobs_loaded.close()
+            if self.result_cache is not None:
+                self.result_cache.close()
+        if self.dork_db is not None:
+            self.dork_db.close()
+        self.root.destroy()
 
     def save_results(self):
         if not hasattr(self, "scan_results") or not getattr(self, "scan_results", {}):
@@ -999,6 +1377,16 @@ class PagodoGUI:
             except Exception as e:
                 messagebox.showerror("Save failed", str(e))
 
+    def clear_scan_cache(self):
+        if self.result_cache is None:
+            messagebox.showinfo("Scan cache", "The scan cache is not available.")
+            return
+        entries = self.result_cache.stats()["entries"]
+        if not messagebox.askyesno("Scan cache", f"Discard {entries} cached scan results?"):
+            return
+        self.result_cache.clear()
+        messagebox.showinfo("Scan cache", "Scan cache cleared.")
+
     def open_url(self, event):
         index = self.log_text.index("@%s,%s" % (event.x, event.y))
         line = self.log_text.get(index + " linestart", index + " lineend").strip()
@@ -1010,7 +1398,7 @@ class PagodoGUI:
         if not selection:
             return
         dork = self.dorks_listbox.get(selection[0])
-        domain = self.domain_var.get().strip()
+        domain = self._first_domain()
         query = f'site:{domain} {dork}' if domain else dork
         url_template = self.search_engines.get(self.selected_search_engine.get(), self.search_engines["Google"])
         url = url_template.format(query=query.replace(" ", "+"))
@@ -1026,92 +1414,143 @@ class PagodoGUI:
         help_text = (
             f"{APP_TITLE}\n\n"
             "• Category: Pick a type (with emoji badges) — includes ★ Favorites.\n"
-            "• Domain: Optionally limit search to a site (site:example.com).\n"
+            "• Domain: Optionally limit search to a site (site:example.com); several comma-separated\n"
+            "  domains (or Domains… to load a file) scan every selected dork on each.\n"
             "• Search: Filter dorks across all categories and favorites (Ctrl+F).\n"
             "• Run Scan: Send selected dorks to Google and log results (Ctrl+R).\n"
             "• Double-click a dork: Opens the Google search.\n"
+            "• Scan Jobs: Every scan is queued and checkpointed; Tools > Scan Jobs lists them, with\n"
+            "  pause/resume/cancel, priorities and past results. Unfinished jobs continue after a restart.\n"
             "• Save Results: Export current scan to JSON.\n"
             "• Add Dork: Add a custom dork to the current category.\n"
             "• Manage Dorks: Add/edit/delete user dorks (persisted in your profile).\n"
             "• Favorites: Toggle selected dorks as favorites (Ctrl+D).\n"
+            "• Search (Ctrl+F): Filters as you type. Operators search fields and rank the results:\n"
+            "  filetype:env password, inurl:admin OR intitle:login, \"index of\" -site:gov\n"
             "• Import Dorks: Merge JSON without duplicates; unknown categories → 'Imported Dorks'.\n"
+            "• Update from GHDB Export: Apply only what changed in a newer Exploit-DB ghdb.json;\n"
+            "  your own dorks and favorites are kept.\n"
             "• Export Dorks: Save the full DB to JSON (Ctrl+E).\n"
             "• Reset to Embedded: Restore the built-in list.\n"
             "• Daily Dork: Random suggestion banner with quick actions.\n"
-            f"\nData folder: {_appdata_dir()} (user_dorks.json, favorites.json, all_dorks.json)\n"
+            "• Scan Cache: Repeat scans of the same dork/domain/engine are answered from disk for 24h.\n"
+            f"\nData folder: {_appdata_dir()} (dorks.sqlite3, scan_cache.sqlite3, scan_jobs.sqlite3, scan_jobs/)\n"
         )
         messagebox.showinfo("Help", help_text)
 
-    def _iter_import_items(self, data):
-        if isinstance(data, dict):
-            for cat, lst in data.items():
-                if not isinstance(cat, str):
-                    continue
-                if isinstance(lst, list):
-                    for d in lst:
-                        yield (cat, str(d))
-                else:
-                    yield (cat, str(lst))
-        elif isinstance(data, list):
-            for row in data:
-                if not isinstance(row, dict):
-                    continue
-                cat = row.get("category")
-                dork = row.get("dork")
-                if dork is None:
-                    continue
-                yield (str(cat) if cat is not None else None, str(dork))
-
     def import_all_dorks(self):
+        if not self._dorks_ready():
+            return
+        busy = self._dork_list_busy()
+        if busy:
+            messagebox.showinfo("Import", busy)
+            return
         path = filedialog.askopenfilename(
             title="Import Dorks JSON",
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
         )
         if not path:
             return
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            messagebox.showerror("Import failed", f"Could not read JSON:\n{e}")
+        categories = set(self.dorks_by_category)
+        self.dorks_by_category.setdefault(UNKNOWN_CAT_BUCKET, [])
+        from pagodo_import import DorkImporter
+        # parsed, de-duplicated and saved on a worker thread; the list is updated as batches arrive
+        index = self.category_index
+        existing = [d for dorks in self.dorks_by_category.values() for d in dorks]
+        self.importer = DorkImporter(path, known=lambda nd: nd in index, categories=categories,
+                                     fallback=UNKNOWN_CAT_BUCKET, user_store=self.user_store,
+                                     on_event=lambda kind, payload: self._import_events.put((kind, payload)),
+                                     existing=existing)
+        self.import_window = ImportWindow(self, path, self.importer)
+        self.importer.start()
+        self._update_reset_state()
+        self.root.after(SCAN_DRAIN_MS, self._drain_import_events)
+
+    def _drain_import_events(self):
+        counts = None
+        while True:
+            try:
+                kind, payload = self._import_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "added":
+                self._import_pending.extend(payload)
+            else:
+                counts = payload
+                if kind != "progress":
+                    self._import_finished = (kind, payload)
+        # indexing is the slow part, so only a slice per tick keeps the UI responsive
+        for _ in range(min(IMPORT_APPLY_BATCH, len(self._import_pending))):
+            self._add_to_category(*self._import_pending.popleft())
+        finished = self._import_finished if not self._import_pending else None
+        if finished:
+            counts = finished[1]
+        if counts is not None and self.import_window is not None:
+            try:
+                self.import_window.update_counts(counts, finished and finished[0])
+            except tk.TclError:
+                self.import_window = None
+        if not finished:
+            self.root.after(SCAN_DRAIN_MS, self._drain_import_events)
             return
+        self.importer = self._import_finished = None
+        self._update_reset_state()
+        if counts["added"]:
+            self._refresh_categories_combo()
+            self.load_dorks()
 
-        existing = {}
-        for cat, dorks in self.dorks_by_category.items():
-            for d in dorks:
-                existing[_norm(d)] = cat
-
-        imported_any = False
-        if UNKNOWN_CAT_BUCKET not in self.dorks_by_category:
-            self.dorks_by_category[UNKNOWN_CAT_BUCKET] = []
-
-        seen_in_file = set()
-        for cat, dork in self._iter_import_items(data):
-            nd = _norm(dork)
-            if not nd or nd in seen_in_file:
-                continue
-            seen_in_file.add(nd)
-
-            if nd in existing:
-                continue
+    def update_from_ghdb(self):
+        if not self._dorks_ready():
+            return
+        busy = self._dork_list_busy()
+        if busy:
+            messagebox.showinfo("Update", busy)
+            return
+        path = filedialog.askopenfilename(
+            title="Exploit-DB GHDB Export",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        from pagodo_ghdb import update_from_export
+        outcome = self._ghdb_update = []
 
-            dest_cat = (cat or "").strip()
-            if not dest_cat or dest_cat not in self.dorks_by_category:
-                dest_cat = UNKNOWN_CAT_BUCKET
+        def work():
+            try:
+                outcome.append(update_from_export(self.dork_db, path))
+            except Exception as e:
+                outcome.append(e)
 
-            self.dorks_by_category.setdefault(dest_cat, [])
-            if not self._category_has_dork(dest_cat, nd):
-                self.dorks_by_category[dest_cat].append(nd)
-                imported_any = True
+        threading.Thread(target=work, name="pagodo-ghdb-update", daemon=True).start()
+        self._update_reset_state()
+        self.root.after(SCAN_DRAIN_MS, self._poll_ghdb_update)
 
-        if imported_any:
-            messagebox.showinfo("Import complete", "Dorks imported successfully.")
+    def _poll_ghdb_update(self):
+        if not self._ghdb_update:
+            self.root.after(SCAN_DRAIN_MS, self._poll_ghdb_update)
+            return
+        outcome, self._ghdb_update = self._ghdb_update[0], None
+        self._update_reset_state()
+        if isinstance(outcome, Exception):
+            messagebox.showerror("Update failed", str(outcome))
+            return
+        delta, added, dropped = outcome
+        for cat, dork in dropped:
+            self._remove_from_category(cat, _intern(dork))
+        for cat, dork in added:
+            self._add_to_category(cat, _intern(dork))
+        if added or dropped:
             self._refresh_categories_combo()
             self.load_dorks()
-        else:
-            messagebox.showinfo("Import complete", "No new dorks were imported.")
+        messagebox.showinfo("Update complete",
+                            f"GHDB records: {len(delta.added)} new, {len(delta.changed)} changed, "
+                            f"{len(delta.removed)} removed.\n"
+                            f"Dork list: {len(added)} added, {len(dropped)} removed.\n"
+                            "Your own dorks and favorites were kept.")
 
     def export_all_dorks(self):
+        if not self._dorks_ready():
+            return
         path = filedialog.asksaveasfilename(
             title="Export All Dorks JSON",
             defaultextension=".json",
@@ -1127,21 +1566,54 @@ class PagodoGUI:
         except Exception as e:
             messagebox.showerror("Export failed", str(e))
 
+    def _dork_list_busy(self):
+        """Why the dork list can't be rewritten right now, or None."""
+        if self._ghdb_update is not None:
+            return "A GHDB update is still running."
+        if self.importer is not None:
+            return "An import is still running."
+        return None
+
+    def _update_reset_state(self):
+        # Reset rewrites the whole list, so it waits for a running import or update
+        state = tk.DISABLED if self._dork_list_busy() else tk.NORMAL
+        self.reset_btn.configure(state=state)
+        self.file_menu.entryconfigure("Reset to Embedded", state=state)
+
     def reset_to_embedded(self):
+        if not self._dorks_ready():
+            return
+        busy = self._dork_list_busy()
+        if busy:
+            messagebox.showinfo("Reset", busy)
+            return
         if not messagebox.askyesno("Reset", "Restore the built-in dork list and discard changes?"):
             return
-        self.dorks_by_category = {cat: list(dorks) for cat, dorks in GHDB_DATA.items()}
-        self.user_store._cache = []
-        self.user_store._save([])
-        self.fav_store._cache = []
-        self.fav_store._save([])
+        from embedded_ghdb import GHDB_DATA
+        self.dorks_by_category = normalize_full(GHDB_DATA)
+        self.full_store.clear()
+        self.user_store.clear()
+        self.fav_store.clear()
+        self.category_index = CategoryIndex(self.dorks_by_category)
+        self._build_search_index()
         self._refresh_categories_combo()
         self.load_dorks()
         messagebox.showinfo("Reset", "Reset to embedded dorks completed.")
 
-def main():
-    root = tk.Tk()
-    app = PagodoGUI(root)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=APP_TITLE)
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase took (or set PAGODO_PROFILE_STARTUP=1)")
+    parser.add_argument("--exit-when-ready", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    profile = StartupProfile(args.profile_startup or bool(os.environ.get("PAGODO_PROFILE_STARTUP")),
+                             origin=START_TIME)
+    profile.mark("imports done")
+    with profile.phase("create root"):
+        root = tk.Tk()
+    with profile.phase("window"):
+        PagodoGUI(root, profile, exit_when_ready=args.exit_when_ready)
     root.mainloop()
 
 
@@ -5,8 +5,8 @@ a = Analysis(
     ['pagodo_gui.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=['pagodo_core', 'embedded_ghdb'],
+    datas=[('embedded_ghdb.pack', '.')],
+    hiddenimports=['pagodo_core', 'pagodo_serp', 'pagodo_jobs', 'pagodo_db', 'pagodo_index', 'pagodo_dork', 'pagodo_import', 'pagodo_similar', 'pagodo_pack', 'pagodo_startup', 'pagodo_ghdb', 'embedded_ghdb'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
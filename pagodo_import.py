@@ -0,0 +1,235 @@
+"""
+Streaming dork import.
+
+iter_import_items() reads a dork JSON file a chunk at a time and yields
+(category, dork) pairs as soon as each one is complete. Both export layouts
+are understood:
+
+    {"Category": ["dork", ...], ...}
+    [{"category": "...", "dork": "..."}, ...]
+
+so a multi-hundred-megabyte collection never has to fit in memory as one
+document. DorkImporter runs that on a worker thread: it normalizes and
+de-duplicates the dorks, optionally flags near-duplicates (see
+pagodo_similar) without dropping them, saves the new ones as user dorks in batches and reports
+progress through a callback.
+"""
+import json
+import os
+import re
+import threading
+
+from pagodo_core import _intern
+from pagodo_similar import NearDuplicateIndex
+
+CHUNK_SIZE = 1 << 20  # characters read per refill
+IMPORT_BATCH = 2000  # new dorks saved and reported at a time
+PROGRESS_EVERY = 20000  # rows read between progress reports when nothing is new
+FLAGGED_LIMIT = 1000  # near-duplicates remembered for review; the rest are only counted
+_WS = " \t\r\n"
+_DELIMITER = re.compile(r"[\s,\]}]")
+
+
+class _Stream:
+    """A text file read in chunks, with just enough JSON lexing to walk the top level."""
+    def __init__(self, fp):
+        self.fp = fp
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.consumed = 0  # characters dropped from the front of buf
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.fp.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """The next non-space character, or "" at the end of the file."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"expected {' or '.join(chars)} at character {self.tell()}, found {c or 'end of file'!r}")
+        self.pos += 1
+        return c
+
+    def value(self, decoder=json.JSONDecoder()):
+        """Decode one complete JSON value, reading more of the file as needed."""
+        if self.peek() not in '"[{':
+            # a bare number or literal is only complete once something follows it
+            while not _DELIMITER.search(self.buf, self.pos) and self._fill():
+                pass
+        while True:
+            try:
+                obj, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            self.pos = end
+            return obj
+
+    def tell(self):
+        return self.consumed + self.pos
+
+
+def _items(stream):
+    """Yield values of the array or object that starts at the stream position."""
+    opener = stream.expect("[{")
+    closer = "]" if opener == "[" else "}"
+    if stream.peek() == closer:
+        stream.pos += 1
+        return
+    while True:
+        if opener == "{":
+            key = stream.value()
+            stream.expect(":")
+            yield key
+        else:
+            yield None
+        if stream.expect("," + closer) == closer:
+            return
+
+
+def iter_import_items(fp):
+    """(category or None, dork) pairs from an open JSON file, in file order."""
+    stream = _Stream(fp)
+    if stream.peek() == "{":
+        for cat in _items(stream):
+            if stream.peek() == "[":
+                for _ in _items(stream):
+                    d = stream.value()
+                    if isinstance(cat, str):
+                        yield cat, str(d)
+            else:
+                v = stream.value()
+                if isinstance(cat, str):
+                    yield cat, str(v)
+    elif stream.peek() == "[":
+        for _ in _items(stream):
+            row = stream.value()
+            if not isinstance(row, dict) or row.get("dork") is None:
+                continue
+            cat = row.get("category")
+            yield (str(cat) if cat is not None else None, str(row["dork"]))
+    else:
+        stream.expect("[{")
+
+
+class DorkImporter:
+    """
+    Imports one file on a background thread.
+
+    known(dork) says whether a normalized dork is already listed; new dorks
+    go to their category if it is in categories, else to fallback. If
+    existing dorks are given, a near-duplicate of one of them or of an
+    earlier dork in the file is still imported, but counted and flagged
+    in flagged as (category, dork, the dork it resembles). Each
+    batch is saved with user_store and handed to on_event("added", [(cat, dork), ...])
+    before the next one is parsed; on_event("progress", counts) follows it,
+    and on_event("done" | "cancelled" | "failed", counts) ends the run.
+    counts has bytes, total, read, added, duplicates, near_duplicates and,
+    on failure, error.
+    Events arrive on the worker thread.
+    """
+    def __init__(self, path, known, categories, fallback, user_store, on_event, existing=None):
+        self.path = path
+        self.known = known
+        self.categories = set(categories)
+        self.fallback = fallback
+        self.user_store = user_store
+        self.on_event = on_event
+        self.existing = existing
+        self.similar = None
+        self.flagged = []
+        self.counts = {"bytes": 0, "total": 0, "read": 0, "added": 0, "duplicates": 0, "near_duplicates": 0}
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="pagodo-import", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        counts = self.counts
+        try:
+            counts["total"] = os.path.getsize(self.path)
+            if self.existing is not None:
+                self.similar = NearDuplicateIndex(self.existing)
+                self.existing = None
+            with open(self.path, "r", encoding="utf-8") as fp:
+                status = self._import(fp)
+        except Exception as e:
+            counts["error"] = str(e)
+            status = "failed"
+        self.on_event(status, dict(counts))
+
+    def _import(self, fp):
+        counts = self.counts
+        seen = set()
+        batch = []
+        for cat, dork in iter_import_items(fp):
+            if self._cancel.is_set():
+                self._flush(batch, fp)
+                return "cancelled"
+            counts["read"] += 1
+            if counts["read"] % PROGRESS_EVERY == 0:
+                self._progress(fp)
+            nd = _intern(dork)
+            if not nd:
+                continue
+            if nd in seen or self.known(nd):
+                counts["duplicates"] += 1
+                continue
+            seen.add(nd)
+            dest = (cat or "").strip()
+            dest = dest if dest in self.categories else self.fallback
+            if self.similar is not None:
+                matches = self.similar.add(nd)
+                if matches:
+                    counts["near_duplicates"] += 1
+                    if len(self.flagged) < FLAGGED_LIMIT:
+                        self.flagged.append((dest, nd, self.similar[matches[0]]))
+            batch.append((dest, nd))
+            if len(batch) >= IMPORT_BATCH:
+                self._flush(batch, fp)
+                batch = []
+        self._flush(batch, fp)
+        return "done"
+
+    def _flush(self, batch, fp):
+        if batch:
+            self.user_store.add_many(batch)
+            self.counts["added"] += len(batch)
+            self.on_event("added", batch)
+        self._progress(fp)
+
+    def _progress(self, fp):
+        try:
+            self.counts["bytes"] = fp.buffer.tell()
+        except (AttributeError, OSError, ValueError):
+            pass
+        self.on_event("progress", dict(self.counts))
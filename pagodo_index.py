@@ -0,0 +1,684 @@
+"""
+In-memory search indexes over the loaded dork collection.
+
+DorkTable holds each loaded dork once, interned, with an integer id and a
+lowercase copy; the search indexes below share one table and work on ids.
+
+TrigramIndex answers case-insensitive substring queries without scanning
+every dork: each dork is split into its distinct 3-character grams, and a
+query only verifies the dorks listed under its rarest gram.
+
+CategoryIndex maps each normalized dork to the categories that list it, so
+"is this dork in that category" and "which category is it in" are hash
+look-ups instead of a _norm() pass over every list.
+
+FacetIndex groups the parsed dorks (see pagodo_dork) by operator, file
+type and term for the filter dropdowns.
+
+DorkSearchEngine is a small full-text engine that knows Google operators:
+`intitle:`, `inurl:`, `intext:`, `filetype:`/`ext:` and `site:` values are
+indexed as fields, so a query like `filetype:env password` finds dorks with
+an env file type that mention password anywhere. Matches are ranked by BM25.
+"""
+import bisect
+import math
+import re
+import sys
+from array import array
+
+from pagodo_core import _intern, _norm
+from pagodo_dork import Operator, parse_dork, positive_nodes, walk
+
+
+def _grams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class DorkTable:
+    """
+    The dork strings behind the indexes, stored once. Each distinct dork
+    gets an integer id the first time it is acquired; the string is
+    interned, so category lists, favorites and indexes share one object,
+    and its lowercase form is kept beside it (the same object when the
+    dork has no capitals). A dork acquired several times (e.g. it appears
+    in two categories) lives until it has been released as many times.
+    Ids only grow: a released dork leaves an empty slot until the owning
+    index compacts.
+    """
+    # compact once this share of the slots belongs to released dorks
+    COMPACT_RATIO = 0.5
+
+    def __init__(self):
+        self._ids = {}           # dork -> id
+        self.dorks = []          # id -> dork, None once released
+        self.lower = []          # id -> lowercase dork, "" once released
+        self._refs = array("I")
+        self.dead = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, dork):
+        return dork in self._ids
+
+    def ids(self):
+        """Set of the live dorks' ids."""
+        return set(self._ids.values())
+
+    def acquire(self, dork, refs=1):
+        """(id, whether the dork is new to the table)."""
+        doc = self._ids.get(dork)
+        if doc is not None:
+            self._refs[doc] += refs
+            return doc, False
+        dork = sys.intern(dork)
+        lower = dork.lower()
+        doc = len(self.dorks)
+        self._ids[dork] = doc
+        self.dorks.append(dork)
+        self.lower.append(dork if lower == dork else lower)
+        self._refs.append(refs)
+        return doc, True
+
+    def release(self, dork):
+        """The dork's id if this was its last reference, else None; drop() frees the slot."""
+        doc = self._ids.get(dork)
+        if doc is None:
+            return None
+        self._refs[doc] -= 1
+        return doc if self._refs[doc] == 0 else None
+
+    def drop(self, doc):
+        del self._ids[self.dorks[doc]]
+        self.dorks[doc] = None
+        self.lower[doc] = ""
+        self.dead += 1
+
+    def wants_compaction(self):
+        return self.dead > 1000 and self.dead > len(self.dorks) * self.COMPACT_RATIO
+
+    def live(self):
+        """[(dork, refs), ...] for the live dorks, in id order."""
+        return [(d, self._refs[i]) for i, d in enumerate(self.dorks) if d is not None]
+
+
+class _TableIndex:
+    """
+    An index over the ids of a DorkTable. On its own it owns the table and
+    add()/remove() keep it refcounted; DorkIndex shares one table between
+    several indexes and calls their _index()/_unindex() itself.
+    """
+    def __init__(self, dorks=(), table=None):
+        self.table = table if table is not None else DorkTable()
+        self._reset()
+        self.update(dorks)
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, dork):
+        return dork in self.table
+
+    def update(self, dorks):
+        for dork in dorks:
+            self.add(dork)
+
+    def add(self, dork):
+        if not dork:
+            return
+        doc, new = self.table.acquire(dork)
+        if new:
+            self._index(doc)
+
+    def remove(self, dork):
+        doc = self.table.release(dork)
+        if doc is None:
+            return
+        self._unindex(doc)
+        self.table.drop(doc)
+        if self.table.wants_compaction():
+            self._compact()
+
+    def replace(self, old, new):
+        self.remove(old)
+        self.add(new)
+
+    def _compact(self):
+        live = self.table.live()
+        self.table = DorkTable()
+        self._reset()
+        for dork, refs in live:
+            self._index(self.table.acquire(dork, refs)[0])
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def _index(self, doc):
+        raise NotImplementedError
+
+    def _unindex(self, doc):
+        raise NotImplementedError
+
+
+class TrigramIndex(_TableIndex):
+    """
+    Substring index over a set of dork strings. Results keep insertion
+    order.
+    """
+    def _reset(self):
+        self._postings = {}  # gram -> array of ids, ascending
+
+    def _index(self, doc):
+        postings = self._postings
+        for g in _grams(self.table.lower[doc]):
+            lst = postings.get(g)
+            if lst is None:
+                postings[g] = array("I", (doc,))
+            else:
+                lst.append(doc)
+
+    def _unindex(self, doc):
+        pass  # postings keep the stale id; search skips it until the next compaction
+
+    def search(self, query):
+        """Dorks containing query (case-insensitive), in insertion order."""
+        q = (query or "").lower()
+        docs, lower = self.table.dorks, self.table.lower
+        if len(q) < 3:
+            # no gram to look up: short queries verify every dork
+            return [docs[s] for s in range(len(docs)) if docs[s] is not None and q in lower[s]]
+        postings = self._postings
+        best = None
+        for g in _grams(q):
+            lst = postings.get(g)
+            if lst is None:
+                return []
+            if best is None or len(lst) < len(best):
+                best = lst
+        # released ids have an empty lowercase text, so the check drops them too
+        return [docs[s] for s in best if q in lower[s]]
+
+
+# Google operators that become fields; allin* operators apply to the words after them
+FIELDS = {
+    "intitle": "intitle", "allintitle": "intitle",
+    "inurl": "inurl", "allinurl": "inurl",
+    "intext": "intext", "allintext": "intext",
+    "filetype": "filetype", "ext": "filetype",
+    "site": "site",
+}
+ANY = ""  # pseudo-field holding every token of a dork
+
+_WORD = re.compile(r"[^\W_]+")
+_QUERY_PART = re.compile(r'([()])|(-)?(?:([A-Za-z]+):)?("[^"]*"?|[^\s()"]+)?')
+
+
+def _words(text):
+    return _WORD.findall(text.lower())
+
+
+def dork_fields(dork):
+    """
+    [(field, token), ...] for a dork; text outside the field operators gets
+    field None. Excluded operators (-site:gov, or inside a negated group)
+    are plain text too, so a site:gov search does not find them.
+    """
+    out = []
+    ast = parse_dork(dork)
+    required = {id(node) for node in positive_nodes(ast)}
+    for node in walk(ast):
+        if isinstance(node, Operator):
+            field = FIELDS.get(node.name) if id(node) in required else None
+            text = node.value if field else f"{node.name} {node.value}"
+        else:
+            field, text = None, node.text
+        out.extend((field, tok) for tok in _words(text))
+    return out
+
+
+class _Term:
+    def __init__(self, field, words, phrase=None):
+        self.field = field
+        self.words = words
+        self.phrase = phrase
+        self.prefix = False
+
+
+class _Node:
+    def __init__(self, op, children):
+        self.op = op  # "and", "or", "not"
+        self.children = children
+
+
+def parse_query(query):
+    """
+    Parse a search box query into a tree of _Node/_Term. Terms are ANDed;
+    OR, NOT/-term and parentheses combine them. Returns None for an empty
+    query. Unbalanced parentheses are tolerated.
+    """
+    tokens = []
+    for m in _QUERY_PART.finditer(query or ""):
+        paren, neg, op, value = m.groups()
+        if not m.group(0):
+            continue
+        if paren:
+            tokens.append(paren)
+            continue
+        value = value or ""
+        if not op and not neg and value in ("OR", "AND", "NOT"):
+            tokens.append(value)
+            continue
+        field = FIELDS.get(op.lower()) if op else None
+        if op and field is None:
+            value = f"{op}:{value}"
+        quoted = value.startswith('"')
+        words = _words(value.strip('"'))
+        if not words and not field:
+            continue
+        term = _Term(field or ANY, words, " ".join(words) if quoted and len(words) > 1 else None)
+        term.prefix = not quoted and m.end() == len(query)
+        tokens.append(_Node("not", [term]) if neg else term)
+    pos = [0]
+
+    def peek():
+        return tokens[pos[0]] if pos[0] < len(tokens) else None
+
+    def parse_or():
+        children = [parse_and()]
+        while peek() == "OR":
+            pos[0] += 1
+            children.append(parse_and())
+        children = [c for c in children if c is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else _Node("or", children)
+
+    def parse_and():
+        children = []
+        while True:
+            tok = peek()
+            if tok is None or tok in (")", "OR"):
+                break
+            if tok == "AND":
+                pos[0] += 1
+                continue
+            node = parse_unary()
+            if node is not None:
+                children.append(node)
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else _Node("and", children)
+
+    def parse_unary():
+        tok = peek()
+        pos[0] += 1
+        if tok == "NOT":
+            inner = parse_unary() if peek() not in (None, ")", "OR") else None
+            return _Node("not", [inner]) if inner is not None else None
+        if tok == "(":
+            inner = parse_or()
+            if peek() == ")":
+                pos[0] += 1
+            return inner
+        return tok
+
+    tree = None
+    while pos[0] < len(tokens):
+        node = parse_or()
+        if node is not None:
+            tree = node if tree is None else _Node("and", [tree, node])
+        if peek() == ")":
+            pos[0] += 1  # stray closing parenthesis
+    return tree
+
+
+class DorkSearchEngine(_TableIndex):
+    """
+    Field-aware inverted index with BM25 ranking, refcounted through its
+    DorkTable like TrigramIndex.
+    """
+    K1 = 1.2
+    B = 0.75
+
+    def _reset(self):
+        self._len = array("I")  # id -> token count
+        self._total_len = 0
+        self._postings = {}  # field -> token -> {id: term frequency}
+        self._vocab = {}     # field -> sorted tokens, for prefix terms; dropped when it changes
+
+    def _index(self, doc):
+        pairs = dork_fields(self.table.dorks[doc])
+        while len(self._len) <= doc:
+            self._len.append(0)
+        self._len[doc] = len(pairs)
+        self._total_len += len(pairs)
+        for field, tok in pairs:
+            for f in (ANY, field) if field else (ANY,):
+                by_tok = self._postings.setdefault(f, {})
+                plist = by_tok.get(tok)
+                if plist is None:
+                    by_tok[tok] = plist = {}
+                    self._vocab.pop(f, None)
+                plist[doc] = plist.get(doc, 0) + 1
+
+    def _unindex(self, doc):
+        self._total_len -= self._len[doc]
+        self._len[doc] = 0
+        for field, tok in dork_fields(self.table.dorks[doc]):
+            for f in (ANY, field) if field else (ANY,):
+                by_tok = self._postings[f]
+                plist = by_tok.get(tok)
+                if plist is not None and plist.pop(doc, None) is not None and not plist:
+                    del by_tok[tok]
+                    self._vocab.pop(f, None)
+
+    def _expand(self, field, word, prefix):
+        """Posting lists of word, or of every token starting with it."""
+        by_tok = self._postings.get(field, {})
+        if not prefix:
+            plist = by_tok.get(word)
+            return [(word, plist)] if plist else []
+        vocab = self._vocab.get(field)
+        if vocab is None:
+            vocab = self._vocab[field] = sorted(by_tok)
+        out = []
+        for i in range(bisect.bisect_left(vocab, word), len(vocab)):
+            if not vocab[i].startswith(word):
+                break
+            out.append((vocab[i], by_tok[vocab[i]]))
+        return out
+
+    def _match_term(self, term, scored):
+        if not term.words:
+            # bare `filetype:` and friends: every dork using the operator
+            ids = set()
+            for plist in self._postings.get(term.field, {}).values():
+                ids.update(plist)
+            return ids
+        last = len(term.words) - 1
+        groups = []
+        for i, word in enumerate(term.words):
+            expanded = self._expand(term.field, word, term.prefix and i == last)
+            if not expanded:
+                return set()
+            if scored is not None:
+                scored.extend((term.field, tok) for tok, _ in expanded)
+            groups.append([plist for _, plist in expanded])
+        # start from the rarest word, then only probe the other words' postings
+        groups.sort(key=lambda lists: sum(map(len, lists)))
+        ids = set().union(*groups[0])
+        for lists in groups[1:]:
+            ids = {d for d in ids if any(d in plist for plist in lists)}
+            if not ids:
+                return set()
+        if term.phrase:
+            lower = self.table.lower
+            ids = {d for d in ids if term.phrase in lower[d]}
+        return ids
+
+    def _match(self, node, scored):
+        if isinstance(node, _Term):
+            return self._match_term(node, scored)
+        if node.op == "or":
+            ids = set()
+            for child in node.children:
+                ids |= self._match(child, scored)
+            return ids
+        if node.op == "not":
+            return self.table.ids() - self._match(node.children[0], None)
+        # and: intersect the positive parts, then subtract the negated ones
+        ids = None
+        negated = []
+        for child in node.children:
+            if isinstance(child, _Node) and child.op == "not":
+                negated.append(child.children[0])
+                continue
+            found = self._match(child, scored)
+            ids = found if ids is None else ids & found
+            if not ids:
+                return set()
+        if ids is None:
+            ids = self.table.ids()
+        for child in negated:
+            ids -= self._match(child, None)
+        return ids
+
+    def search(self, query, limit=None):
+        """Dorks matching query, best BM25 score first (ties keep insertion order)."""
+        tree = parse_query(query)
+        if tree is None or not len(self.table):
+            return []
+        scored = []
+        ids = self._match(tree, scored)
+        if not ids:
+            return []
+        n = len(self.table)
+        avg = self._total_len / n if self._total_len else 1.0
+        scores = dict.fromkeys(ids, 0.0)
+        for field, tok in set(scored):
+            plist = self._postings[field].get(tok)
+            if not plist:
+                continue
+            idf = math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            k = self.K1
+            docs = scores if len(scores) < len(plist) else plist
+            for doc in docs:
+                tf = plist.get(doc)
+                if tf and doc in scores:
+                    norm = k * (1 - self.B + self.B * self._len[doc] / avg)
+                    scores[doc] += idf * tf * (k + 1) / (tf + norm)
+        ranked = sorted(scores, key=lambda d: (-scores[d], d))
+        if limit is not None:
+            ranked = ranked[:limit]
+        docs = self.table.dorks
+        return [docs[d] for d in ranked]
+
+
+_STRUCTURED = re.compile(r'(?:^|[\s(])(?:-|(?:%s):|(?:OR|AND|NOT)(?=\s))|["()]' % "|".join(FIELDS))
+
+
+def is_structured_query(query):
+    """True if query uses operators, quotes, parentheses or boolean words."""
+    return bool(_STRUCTURED.search(query or ""))
+
+
+class CategoryIndex:
+    """
+    Normalized dork -> the categories listing it, kept next to
+    dorks_by_category. Categories are small integer ids; a dork in one
+    category maps straight to its id, one listed more than once maps to
+    {id: count}. Categories keep the order they were added in, so
+    category_of() returns the first one.
+    """
+    def __init__(self, dorks_by_category=None):
+        self._names = []    # category id -> name
+        self._cat_ids = {}  # name -> category id
+        self._cats = {}     # interned normalized dork -> category id or {category id: count}
+        if dorks_by_category:
+            self.update(dorks_by_category)
+
+    def __len__(self):
+        return len(self._cats)
+
+    def __contains__(self, dork):
+        return _norm(dork) in self._cats
+
+    def update(self, dorks_by_category):
+        for cat, dorks in dorks_by_category.items():
+            for dork in dorks:
+                self.add(cat, dork)
+
+    def _cat_id(self, category):
+        cid = self._cat_ids.get(category)
+        if cid is None:
+            cid = self._cat_ids[category] = len(self._names)
+            self._names.append(category)
+        return cid
+
+    def add(self, category, dork):
+        nd = _intern(dork)
+        if not nd:
+            return
+        cid = self._cat_id(category)
+        cur = self._cats.get(nd)
+        if cur is None:
+            self._cats[nd] = cid
+            return
+        if not isinstance(cur, dict):
+            cur = self._cats[nd] = {cur: 1}
+        cur[cid] = cur.get(cid, 0) + 1
+
+    def remove(self, category, dork):
+        nd = _norm(dork)
+        cid = self._cat_ids.get(category)
+        cur = self._cats.get(nd)
+        if cur is None or cid is None:
+            return
+        if not isinstance(cur, dict):
+            if cur == cid:
+                del self._cats[nd]
+            return
+        if cid not in cur:
+            return
+        cur[cid] -= 1
+        if cur[cid] <= 0:
+            del cur[cid]
+            if len(cur) == 1 and next(iter(cur.values())) == 1:
+                self._cats[nd] = next(iter(cur))
+            elif not cur:
+                del self._cats[nd]
+
+    def has(self, category, dork):
+        cur = self._cats.get(_norm(dork))
+        if cur is None:
+            return False
+        cid = self._cat_ids.get(category)
+        return cid in cur if isinstance(cur, dict) else cid == cur
+
+    def category_of(self, dork):
+        """The first category listing dork, or None."""
+        cur = self._cats.get(_norm(dork))
+        if cur is None:
+            return None
+        return self._names[next(iter(cur)) if isinstance(cur, dict) else cur]
+
+
+FACETS = ("operator", "filetype", "term")
+# facet operator names: ext: and filetype: are the same operator
+_FACET_OPERATOR = {"ext": "filetype"}
+# operator values that are not worth offering as terms
+_NO_TERMS = ("filetype", "ext", "site", "before", "after")
+
+
+def dork_facets(dork):
+    """{facet: set of values} for one dork, from its parsed AST."""
+    ast = parse_dork(dork)
+    operators = {_FACET_OPERATOR.get(n.name, n.name) for n in walk(ast) if isinstance(n, Operator)}
+    filetypes, terms = set(), set()
+    for node in positive_nodes(ast):
+        if isinstance(node, Operator):
+            if node.name in ("filetype", "ext"):
+                filetypes.update(v.strip(".") for v in node.value.lower().split() if v.strip("."))
+                continue
+            if node.name in _NO_TERMS:
+                continue
+            text = node.value
+        else:
+            text = node.text
+        terms.update(w for w in _words(text) if len(w) > 2 and not w.isdigit())
+    return {"operator": operators, "filetype": filetypes, "term": terms}
+
+
+class FacetIndex(_TableIndex):
+    """
+    Operator, file type and term facets over the parsed dorks, for filters
+    with live counts. Refcounted through its DorkTable like the other indexes.
+    """
+    def _reset(self):
+        self._values = {f: {} for f in FACETS}  # facet -> value -> set of ids
+
+    def _index(self, doc):
+        for facet, values in dork_facets(self.table.dorks[doc]).items():
+            by_value = self._values[facet]
+            for v in values:
+                by_value.setdefault(v, set()).add(doc)
+
+    def _unindex(self, doc):
+        for facet, values in dork_facets(self.table.dorks[doc]).items():
+            by_value = self._values[facet]
+            for v in values:
+                ids = by_value.get(v)
+                if ids is not None:
+                    ids.discard(doc)
+                    if not ids:
+                        del by_value[v]
+
+    def _select(self, filters, skip=None):
+        ids = None
+        for facet, value in filters.items():
+            if facet == skip or not value:
+                continue
+            found = self._values[facet].get(value, set())
+            ids = set(found) if ids is None else ids & found
+        return ids
+
+    def select(self, filters):
+        """Dorks with every {facet: value} in filters, in insertion order."""
+        ids = self._select(filters)
+        docs = self.table.dorks
+        if ids is None:
+            return [d for d in docs if d is not None]
+        return [docs[d] for d in sorted(ids)]
+
+    def counts(self, facet, filters=None, limit=None):
+        """
+        [(value, count), ...] for one facet, most common first. Counts are
+        within the dorks matching the other facets' filters, so they show
+        what picking each value would leave.
+        """
+        base = self._select(filters or {}, skip=facet)
+        out = []
+        for value, ids in self._values[facet].items():
+            n = len(ids) if base is None else len(ids & base)
+            if n:
+                out.append((value, n))
+        out.sort(key=lambda vc: (-vc[1], vc[0]))
+        return out if limit is None else out[:limit]
+
+
+class DorkIndex(_TableIndex):
+    """
+    All indexes behind one add/remove API, sharing one DorkTable. Plain
+    text is a substring filter; queries using operators or boolean syntax
+    go to the ranked engine; facets holds the structured filters.
+    """
+    def __init__(self, dorks=()):
+        table = DorkTable()
+        self.substring = TrigramIndex(table=table)
+        self.fulltext = DorkSearchEngine(table=table)
+        self.facets = FacetIndex(table=table)
+        super().__init__(dorks, table)
+
+    def _parts(self):
+        return self.substring, self.fulltext, self.facets
+
+    def _reset(self):
+        for part in self._parts():
+            part.table = self.table
+            part._reset()
+
+    def _index(self, doc):
+        for part in self._parts():
+            part._index(doc)
+
+    def _unindex(self, doc):
+        for part in self._parts():
+            part._unindex(doc)
+
+    def search(self, query, limit=None):
+        if is_structured_query(query):
+            if parse_query(query) is not None:
+                return self.fulltext.search(query, limit)
+            query = ""  # a lone quote or "-" being typed: no terms yet, so nothing is filtered out
+        hits = self.substring.search(query)
+        return hits if limit is None else hits[:limit]
@@ -0,0 +1,273 @@
+"""
+Persistent scan job queue.
+
+JobQueue keeps one row per scan job in SQLite under the app data dir:
+priority, status and progress counters. The dorks and results stay in
+each job's ScanJob journal, so a job can be resumed from exactly where it
+stopped. JobRunner is a pool of background threads that claims queued
+jobs (highest priority first, then oldest) and runs them.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from pagodo_core import DEFAULT_ENGINE, ScanJob, _appdata_dir
+
+STATUSES = ("queued", "running", "paused", "done", "cancelled", "failed")
+ACTIVE_STATUSES = ("queued", "running", "paused")
+PROGRESS_INTERVAL = 0.5
+
+
+class JobQueue:
+    """SQLite-backed job table; safe to share between threads."""
+    def __init__(self, path=None, jobs_dir=None):
+        self.path = Path(path) if path else _appdata_dir() / "scan_jobs.sqlite3"
+        self.jobs_dir = Path(jobs_dir) if jobs_dir else ScanJob.jobs_dir()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, label TEXT NOT NULL DEFAULT '', engine TEXT NOT NULL,"
+            " domains TEXT NOT NULL DEFAULT '[]', priority INTEGER NOT NULL DEFAULT 0,"
+            " status TEXT NOT NULL DEFAULT 'queued', total INTEGER NOT NULL DEFAULT 0,"
+            " done INTEGER NOT NULL DEFAULT 0, failed INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_pick ON jobs (status, priority DESC, created)")
+        self._db.commit()
+        self._adopt_journals()
+
+    def _adopt_journals(self):
+        # journals of checkpointed scans started outside the queue (the CLI, older
+        # versions); the queue's own and already adopted ones are skipped unread
+        known = {r["id"] for r in self._db.execute("SELECT id FROM jobs")}
+        for job in ScanJob.unfinished(self.jobs_dir, skip=known):
+            if job.id not in known:
+                self._insert(job, "paused", 0, label=f"{len(job.dorks)} dorks")
+
+    def _insert(self, job, status, priority, label=""):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, label, engine, domains, priority, status, total, done, failed, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, label, job.engine, json.dumps(job.domains), priority, status, job.total,
+                 len(job.done), len(job.failed), now, now),
+            )
+            self._db.commit()
+
+    def enqueue(self, dorks, domains="", engine=DEFAULT_ENGINE, priority=0, label=""):
+        """Create a job and its journal; returns the job id."""
+        job = ScanJob(dorks, domains, engine, directory=self.jobs_dir)
+        job.save()
+        self._insert(job, "queued", priority, label or f"{len(job.dorks)} dorks")
+        return job.id
+
+    def load(self, job_id):
+        return ScanJob.load(self.jobs_dir / f"{job_id}.jsonl")
+
+    def claim(self):
+        """Atomically move the next queued job to running; returns its id or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM jobs WHERE status='queued' ORDER BY priority DESC, created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE jobs SET status='running', updated=? WHERE id=?", (time.time(), row["id"]))
+            self._db.commit()
+            return row["id"]
+
+    def set_status(self, job_id, status, error=None, only_from=None):
+        """Change a job's status; with only_from, only if it is currently in one of those states."""
+        sql = "UPDATE jobs SET status=?, error=?, updated=? WHERE id=?"
+        args = [status, error, time.time(), job_id]
+        if only_from:
+            sql += f" AND status IN ({', '.join('?' * len(only_from))})"
+            args += list(only_from)
+        with self._lock:
+            changed = self._db.execute(sql, args).rowcount
+            self._db.commit()
+        return bool(changed)
+
+    def set_progress(self, job_id, done, failed):
+        with self._lock:
+            self._db.execute("UPDATE jobs SET done=?, failed=?, updated=? WHERE id=?",
+                             (done, failed, time.time(), job_id))
+            self._db.commit()
+
+    def set_priority(self, job_id, priority):
+        with self._lock:
+            self._db.execute("UPDATE jobs SET priority=?, updated=? WHERE id=?", (priority, time.time(), job_id))
+            self._db.commit()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, limit=200):
+        """Active jobs first (by priority), then the most recent finished ones."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM jobs ORDER BY status NOT IN ('queued', 'running', 'paused'),"
+                " priority DESC, created DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def recover(self, resume=False):
+        """
+        Jobs left 'running' by a crash or exit go back to 'queued' (resume=True)
+        or 'paused' so they only continue when asked. Returns how many.
+        """
+        with self._lock:
+            n = self._db.execute("UPDATE jobs SET status=?, updated=? WHERE status='running'",
+                                 ("queued" if resume else "paused", time.time())).rowcount
+            self._db.commit()
+        return n
+
+    def delete(self, job_id):
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE id=?", (job_id,))
+            self._db.commit()
+        try:
+            (self.jobs_dir / f"{job_id}.jsonl").unlink()
+        except OSError:
+            pass
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobRunner:
+    """
+    Background worker pool over a JobQueue. on_event(kind, job_id, payload)
+    is called from worker threads: kind "result" with (domain, dork, urls,
+    error), or "status" with the new status string.
+    """
+    def __init__(self, queue, workers=2, on_event=None, **scan_options):
+        self.queue = queue
+        self.workers = max(1, workers)
+        self.on_event = on_event
+        self.scan_options = scan_options
+        self.active = {}
+        self._held = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._loop, name=f"pagodo-job-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, wait=False, timeout=None):
+        """
+        Stop claiming jobs and interrupt the running ones. Interrupted jobs go
+        back to 'queued' (user-paused ones stay 'paused') and continue from
+        their journal the next time a runner starts. With wait, blocks until
+        the workers exit (at most timeout seconds) and returns whether they did.
+        """
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            jobs = list(self.active.items())
+            self._held = {job_id for job_id, job in jobs if job.status == "paused"}
+        for _, job in jobs:
+            job.stop()
+        if not wait:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in self._threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(t.is_alive() for t in self._threads)
+
+    def wake(self):
+        self._wake.set()
+
+    def _emit(self, kind, job_id, payload):
+        if self.on_event is not None:
+            try:
+                self.on_event(kind, job_id, payload)
+            except Exception:
+                pass
+
+    def _loop(self):
+        while not self._stop.is_set():
+            job_id = self.queue.claim()
+            if job_id is None:
+                self._wake.wait(1.0)
+                self._wake.clear()
+                continue
+            self._run(job_id)
+
+    def _run(self, job_id):
+        try:
+            job = self.queue.load(job_id)
+        except (OSError, ValueError) as e:
+            self.queue.set_status(job_id, "failed", error=str(e))
+            self._emit("status", job_id, "failed")
+            return
+        with self._lock:
+            self.active[job_id] = job
+        self._emit("status", job_id, "running")
+        last = [0.0]
+
+        def on_result(domain, dork, urls, error):
+            now = time.monotonic()
+            if now - last[0] >= PROGRESS_INTERVAL:
+                last[0] = now
+                self.queue.set_progress(job_id, len(job.done), len(job.failed))
+            self._emit("result", job_id, (domain, dork, urls, error))
+
+        try:
+            status = job.run(on_result=on_result, **self.scan_options)
+            error = None
+        except Exception as e:
+            status, error = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            with self._lock:
+                self.active.pop(job_id, None)
+        if self._stop.is_set() and status == "paused":
+            # interrupted by shutdown, not by the user; the journal has no final status
+            status = "paused" if job_id in self._held else "queued"
+        self.queue.set_progress(job_id, len(job.done), len(job.failed))
+        self.queue.set_status(job_id, status, error=error)
+        self._emit("status", job_id, status)
+
+    def pause(self, job_id):
+        with self._lock:
+            job = self.active.get(job_id)
+        if job is not None:
+            job.pause()
+            self.queue.set_progress(job_id, len(job.done), len(job.failed))
+            self.queue.set_status(job_id, "paused", only_from=("running",))
+            self._emit("status", job_id, "paused")
+
+    def resume(self, job_id):
+        with self._lock:
+            job = self.active.get(job_id)
+        if job is not None:
+            job.resume()
+            self.queue.set_status(job_id, "running", only_from=("paused",))
+            self._emit("status", job_id, "running")
+        elif self.queue.set_status(job_id, "queued", only_from=("paused", "failed", "cancelled", "done")):
+            # re-queued jobs skip finished queries and retry failed ones
+            self._emit("status", job_id, "queued")
+            self.wake()
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self.active.get(job_id)
+        if job is not None:
+            job.cancel()
+        elif self.queue.set_status(job_id, "cancelled", only_from=("queued", "paused")):
+            self._emit("status", job_id, "cancelled")
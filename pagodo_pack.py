@@ -0,0 +1,120 @@
+"""
+Packed dork lists.
+
+The embedded GHDB list ships as a small binary file instead of a Python
+dict literal, which had to be compiled (or unmarshalled from a .pyc) on
+every start and grew with every GHDB refresh. Layout, little-endian:
+
+    b"PGDKPACK"  u16 version  u32 category count
+    per category:  u16 name length, UTF-8 name,
+                   u32 dork count, u32 block offset, u32 block length
+    blocks:        zlib("dork\\0dork\\0...") per category, in table order
+
+The offset table lets a reader pull one category without inflating the
+others. Dorks never contain NUL, so it separates them.
+
+    write_pack({"Category": ["dork", ...]}, "embedded_ghdb.pack")
+    read_pack("embedded_ghdb.pack")  -> {"Category": ["dork", ...]}
+"""
+import os
+import struct
+import zlib
+from collections import namedtuple
+
+MAGIC = b"PGDKPACK"
+VERSION = 1
+_HEADER = struct.Struct("<8sHI")
+_NAME_LEN = struct.Struct("<H")
+_ENTRY = struct.Struct("<III")
+
+# the built-in list loaded by embedded_ghdb
+EMBEDDED_PACK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "embedded_ghdb.pack")
+
+PackEntry = namedtuple("PackEntry", "category count offset length")
+
+
+class PackError(ValueError):
+    """The file is not a dork pack this version can read."""
+
+
+def encode_pack(data, level=9):
+    """Bytes of a pack for {category: [dork, ...]}, categories in dict order."""
+    names, blocks = [], []
+    for cat, dorks in data.items():
+        dorks = [str(d) for d in dorks]
+        if any("\0" in d for d in dorks):
+            raise ValueError(f"dork in {cat!r} contains a NUL character")
+        names.append((str(cat).encode("utf-8"), len(dorks)))
+        blocks.append(zlib.compress("\0".join(dorks).encode("utf-8"), level))
+    offset = _HEADER.size + sum(_NAME_LEN.size + len(n) + _ENTRY.size for n, _ in names)
+    out = [_HEADER.pack(MAGIC, VERSION, len(names))]
+    for (name, count), block in zip(names, blocks):
+        out += [_NAME_LEN.pack(len(name)), name, _ENTRY.pack(count, offset, len(block))]
+        offset += len(block)
+    return b"".join(out + blocks)
+
+
+def write_pack(data, path, level=9):
+    with open(path, "wb") as f:
+        f.write(encode_pack(data, level))
+
+
+def pack_entries(buf):
+    """The category table of a pack, as [PackEntry, ...]."""
+    try:
+        magic, version, n = _HEADER.unpack_from(buf, 0)
+    except struct.error:
+        raise PackError("file is too short for a dork pack") from None
+    if magic != MAGIC:
+        raise PackError("not a dork pack")
+    if version != VERSION:
+        raise PackError(f"unsupported dork pack version {version}")
+    pos = _HEADER.size
+    entries = []
+    try:
+        for _ in range(n):
+            (size,) = _NAME_LEN.unpack_from(buf, pos)
+            pos += _NAME_LEN.size
+            name = bytes(buf[pos:pos + size]).decode("utf-8")
+            pos += size
+            count, offset, length = _ENTRY.unpack_from(buf, pos)
+            pos += _ENTRY.size
+            if offset + length > len(buf):
+                raise PackError(f"block of {name!r} runs past the end of the file")
+            entries.append(PackEntry(name, count, offset, length))
+    except struct.error:
+        raise PackError("category table is truncated") from None
+    return entries
+
+
+def read_block(buf, entry):
+    """The dorks of one category."""
+    if not entry.count:
+        return []
+    try:
+        dorks = zlib.decompress(buf[entry.offset:entry.offset + entry.length]).decode("utf-8").split("\0")
+    except zlib.error as e:
+        raise PackError(f"block of {entry.category!r} is corrupt: {e}") from None
+    if len(dorks) != entry.count:
+        raise PackError(f"{entry.category!r} holds {len(dorks)} dorks, the table says {entry.count}")
+    return dorks
+
+
+def decode_pack(buf):
+    return {e.category: read_block(buf, e) for e in pack_entries(buf)}
+
+
+def read_pack(path):
+    """{category: [dork, ...]} from a pack file."""
+    with open(path, "rb") as f:
+        return decode_pack(f.read())
+
+
+def read_category(path, category):
+    """One category's dorks without inflating the rest, or None if the pack lacks it."""
+    with open(path, "rb") as f:
+        buf = f.read()
+    for entry in pack_entries(buf):
+        if entry.category == category:
+            return read_block(buf, entry)
+    return None
@@ -0,0 +1,152 @@
+"""
+Result-link extraction from search engine result pages (SERPs).
+
+Parsers scan anchor tags with a single compiled regex instead of building a
+DOM, and accept the page in chunks through feed(), so a response can be
+parsed while it is still being read. Each engine only differs in how it
+wraps outbound links and which hosts belong to the engine itself.
+"""
+import base64
+import html
+import re
+import urllib.parse
+
+# only hrefs that can be results (absolute, protocol-relative or rooted) are
+# captured, so fragment/javascript links never reach Python code
+_A_HREF = re.compile(
+    r"""<[aA]\s[^>]*?\b[hH][rR][eE][fF]\s*=\s*"""
+    r"""(?:"((?:https?:|/)[^"]*)"|'((?:https?:|/)[^']*)'|((?:https?:|/)[^\s>"']+))"""
+)
+
+
+class SerpParser:
+    """Generic parser: every absolute http(s) link to a non-engine host."""
+    # hosts (or host suffixes) that belong to the engine and are never results
+    own_hosts = ()
+
+    def __init__(self):
+        self._buf = ""
+        self._seen = set()
+
+    def feed(self, chunk):
+        """Consume the next piece of the page; returns newly found result URLs."""
+        data = self._buf + chunk
+        # only scan up to the last tag opener; the remainder may be a split tag
+        cut = data.rfind("<")
+        if cut <= 0:
+            self._buf = data
+            return []
+        self._buf = data[cut:]
+        return self._scan(data[:cut])
+
+    def close(self):
+        data, self._buf = self._buf, ""
+        return self._scan(data)
+
+    @classmethod
+    def parse(cls, page):
+        """Extract all result URLs from a complete page."""
+        if not page:
+            return []
+        parser = cls()
+        return parser._scan(page)
+
+    def _scan(self, text):
+        found = []
+        seen = self._seen
+        for dq, sq, bare in _A_HREF.findall(text):
+            href = dq or sq or bare
+            if "&" in href:
+                href = html.unescape(href)
+            url = self.unwrap(href)
+            if url and url not in seen and self._is_result(url):
+                seen.add(url)
+                found.append(url)
+        return found
+
+    def unwrap(self, href):
+        """Turn an anchor href into the outbound result URL, or None."""
+        if href.startswith(("http://", "https://")):
+            return href
+        return None
+
+    def _is_result(self, url):
+        host = urllib.parse.urlsplit(url).hostname or ""
+        return bool(host) and not any(host == h or host.endswith("." + h) for h in self.own_hosts)
+
+
+def _query_param(href, name):
+    values = urllib.parse.parse_qs(urllib.parse.urlsplit(href).query).get(name)
+    return values[0] if values else None
+
+
+_GOOGLE_HOST = re.compile(r"(?:[\w-]+\.)*google\.[a-z.]+$")
+
+
+class GoogleParser(SerpParser):
+    own_hosts = ("google.com", "googleusercontent.com", "gstatic.com", "youtube.com", "blogger.com")
+
+    def unwrap(self, href):
+        # basic (no-JS) result pages wrap links as /url?q=<target>&sa=...
+        if href.startswith("/url?"):
+            return _query_param(href, "q") or _query_param(href, "url")
+        return super().unwrap(href)
+
+    def _is_result(self, url):
+        host = urllib.parse.urlsplit(url).hostname or ""
+        return super()._is_result(url) and not _GOOGLE_HOST.match(host)
+
+
+class BingParser(SerpParser):
+    own_hosts = ("bing.com", "microsoft.com", "msn.com", "live.com", "microsofttranslator.com")
+
+    def unwrap(self, href):
+        # click-tracking links: /ck/a?...&u=a1<base64url target>
+        if "/ck/a?" in href:
+            u = _query_param(href, "u")
+            if u and u.startswith("a1"):
+                raw = u[2:]
+                try:
+                    return base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)).decode("utf-8")
+                except (ValueError, UnicodeDecodeError):
+                    return None
+            return None
+        return super().unwrap(href)
+
+
+class YahooParser(SerpParser):
+    own_hosts = ("yahoo.com", "yimg.com", "yahoo.net", "bing.com")
+
+    def unwrap(self, href):
+        # r.search.yahoo.com/_ylt=.../RV=2/RE=.../RO=10/RU=<quoted target>/RK=2/RS=...
+        if "/RU=" in href:
+            target = href.split("/RU=", 1)[1].split("/R", 1)[0]
+            return urllib.parse.unquote(target)
+        return super().unwrap(href)
+
+
+class DuckDuckGoParser(SerpParser):
+    own_hosts = ("duckduckgo.com", "duck.com")
+
+    def unwrap(self, href):
+        # html.duckduckgo.com results: //duckduckgo.com/l/?uddg=<quoted target>&rut=...
+        if "/l/?" in href and "uddg=" in href:
+            return _query_param(href, "uddg")
+        return super().unwrap(href)
+
+
+PARSERS = {
+    "Google": GoogleParser,
+    "Yahoo": YahooParser,
+    "Bing": BingParser,
+    "DuckDuckGo": DuckDuckGoParser,
+}
+
+
+def parser_for(engine):
+    return PARSERS.get(engine, SerpParser)
+
+
+def parse_serp(engine, page):
+    """Result URLs from one engine response page, in page order."""
+    return parser_for(engine).parse(page)
@@ -0,0 +1,231 @@
+"""
+Near-duplicate dorks.
+
+_norm only collapses whitespace, so `intitle:"index of" backup` and
+`intitle:"Index Of" backup` are two dorks. dork_key() reduces a dork to a
+canonical form: case-folded, `ext:` spelled `filetype:`, quotes dropped
+around single words and the parts of a plain AND sorted. Dorks with the
+same key are duplicates outright.
+
+For the rest, a dork's shingles are its words, adjacent word pairs and
+the word sequence of each whole term (an operator with its value, or a
+quoted phrase); operator
+names only count inside pairs and terms, so inurl:admin and intitle:admin
+differ but two inurl: dorks are not alike just for being inurl:. The words
+of an excluded term carry its "-", so a dork and its negation never look
+alike, and whole terms keep `"wp-config.php"` and `"wp-config.php.bak"`
+apart even though they share every word. Similarity is the Jaccard index
+of the shingle sets.
+
+Candidates come from MinHash LSH. The signature uses one-permutation
+hashing: each shingle is hashed once into one of NUM_BINS bins, each bin
+keeps its smallest hash, and empty bins borrow from the next filled one.
+Bands of BAND_ROWS bins are bucketed, only dorks sharing a bucket are
+compared, and the signature estimate screens them before the exact check.
+
+    index = NearDuplicateIndex(dorks)
+    index.similar('intitle:"Index Of" backup')  -> [('intitle:"index of" backup', 1.0)]
+    index.clusters()  -> [Cluster(canonical=..., members=[...]), ...]
+"""
+import re
+from array import array
+from collections import namedtuple
+from operator import eq
+
+# Jaccard similarity at which two dorks are near-duplicates
+THRESHOLD = 0.8
+NUM_BINS = 12
+BAND_ROWS = 3
+# candidates whose signature agrees on fewer bins than this share are not checked exactly
+ESTIMATE_FLOOR = 0.5
+
+Cluster = namedtuple("Cluster", "canonical members")
+
+_EMPTY = (0,) * NUM_BINS
+_MASK = (1 << 64) - 1
+_SPREAD = 0x9E3779B97F4A7C15
+_PART = re.compile(r'-?(?:[a-z]+:)?(?:"[^"]*"?|[^\s"]+)')
+_QUOTED_WORD = re.compile(r'"([^\s"()]+)"')
+_EXT = re.compile(r'(^|[\s(-])ext:')
+_TOKEN = re.compile(r"[a-z]+:|\w+")
+_NO_SORT = ("or", "|", "and")
+
+
+def dork_key(dork):
+    """Canonical form of a dork; equal keys mean the same query."""
+    text = " ".join(str(dork).split()).casefold()
+    if "ext:" in text:
+        text = _EXT.sub(r"\1filetype:", text)
+    if '"' in text:
+        text = _QUOTED_WORD.sub(r"\1", text)
+    parts = _PART.findall(text) if '"' in text else text.split(" ")
+    if not any(p in _NO_SORT or "(" in p or ")" in p for p in parts):
+        parts.sort()  # a plain AND does not depend on order
+    return " ".join(parts)
+
+
+def shingles(key):
+    """
+    Words of a canonical dork, adjacent token pairs and whole terms;
+    operators only count inside pairs and terms, excluded terms are marked "-".
+    """
+    tokens = []
+    out = set()
+    for part in _PART.findall(key):
+        words = _TOKEN.findall(part)
+        if part[0] == "-":
+            words = ["-" + w for w in words]
+        tokens += words
+        if len(words) > 1:
+            out.add(tuple(words))
+    out.update(t for t in tokens if t[-1] != ":")
+    out.update(zip(tokens, tokens[1:]))
+    return out
+
+
+def signature(sh):
+    """NUM_BINS one-permutation minimum hashes of a shingle set, or None if it is empty."""
+    if not sh:
+        return None
+    bins = [None] * NUM_BINS
+    for h in map(hash, sh):
+        h &= _MASK
+        i = h % NUM_BINS
+        b = bins[i]
+        if b is None or h < b:
+            bins[i] = h
+    if None in bins:
+        filled = list(bins)
+        for i, v in enumerate(bins):
+            if v is None:
+                d = 1
+                while bins[(i + d) % NUM_BINS] is None:
+                    d += 1
+                # offset by distance, so a borrowed value rarely equals a real minimum
+                filled[i] = (bins[(i + d) % NUM_BINS] + d * _SPREAD) & _MASK
+        bins = filled
+    return bins
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _bands(sig):
+    r = BAND_ROWS
+    return [hash((b, *sig[b * r:b * r + r])) for b in range(NUM_BINS // r)]
+
+
+class NearDuplicateIndex:
+    """
+    Dorks grouped into near-duplicate clusters as they are added.
+
+    Each LSH bucket remembers only the first dork that landed in it and new
+    dorks are compared with those; clusters are joined transitively.
+    Signatures are kept in one flat array, so memory stays near NUM_BINS
+    8-byte values plus a few dict entries per dork.
+    """
+    def __init__(self, dorks=(), threshold=THRESHOLD):
+        self.threshold = threshold
+        self._dorks = []
+        self._parent = []
+        self._sigs = array("Q")  # NUM_BINS values per dork, zeros for dorks without words
+        self._by_key = {}  # hash of dork_key -> first id
+        self._buckets = {}  # band hash -> first id
+        self.update(dorks)
+
+    def __len__(self):
+        return len(self._dorks)
+
+    def __getitem__(self, i):
+        """The dork with id i, as returned by add()."""
+        return self._dorks[i]
+
+    def update(self, dorks):
+        for dork in dorks:
+            self.add(dork)
+
+    def _find(self, i):
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, a, b):
+        a, b = self._find(a), self._find(b)
+        if a != b:
+            self._parent[max(a, b)] = min(a, b)
+
+    def _matches(self, key, sh, sig, bands):
+        """[(id, similarity), ...] of indexed dorks near this one."""
+        first = self._by_key.get(hash(key))
+        if first is not None:
+            return [(first, 1.0)]
+        out = []
+        seen = set()
+        sigs = self._sigs
+        for bk in bands:
+            other = self._buckets.get(bk)
+            if other is None or other in seen:
+                continue
+            seen.add(other)
+            base = other * NUM_BINS
+            if sum(map(eq, sig, sigs[base:base + NUM_BINS])) < ESTIMATE_FLOOR * NUM_BINS:
+                continue
+            score = jaccard(sh, shingles(dork_key(self._dorks[other])))
+            if score >= self.threshold:
+                out.append((other, score))
+        return out
+
+    def _prepare(self, dork):
+        key = dork_key(dork)
+        sh = shingles(key)
+        sig = signature(sh)
+        return key, sh, sig, (_bands(sig) if sig else ())
+
+    def add(self, dork):
+        """Index a dork; returns the ids of the indexed dorks it duplicates."""
+        key, sh, sig, bands = self._prepare(dork)
+        matches = self._matches(key, sh, sig, bands)
+        doc = len(self._dorks)
+        self._dorks.append(dork)
+        self._parent.append(doc)
+        self._sigs.extend(sig or _EMPTY)
+        for other, _ in matches:
+            self._union(doc, other)
+        self._by_key.setdefault(hash(key), doc)
+        for bk in bands:
+            self._buckets.setdefault(bk, doc)
+        return [m for m, _ in matches]
+
+    def similar(self, dork):
+        """[(indexed dork, similarity), ...] for a dork, best first."""
+        matches = self._matches(*self._prepare(dork))
+        return sorted(((self._dorks[i], s) for i, s in matches), key=lambda ds: -ds[1])
+
+    def clusters(self, prefer=()):
+        """
+        Clusters of two or more dorks, largest first. The canonical member
+        is one found in prefer (e.g. the embedded list) if any, else the
+        shortest, else the first added.
+        """
+        groups = {}
+        for i in range(len(self._dorks)):
+            groups.setdefault(self._find(i), []).append(i)
+        prefer = set(prefer)
+        out = []
+        for ids in groups.values():
+            if len(ids) < 2:
+                continue
+            ids.sort()
+            members = [self._dorks[i] for i in ids]
+            canonical = min(members, key=lambda d: (d not in prefer, len(d)))
+            out.append(Cluster(canonical, members))
+        out.sort(key=lambda c: (-len(c.members), c.canonical))
+        return out
+
+
+def find_near_duplicates(dorks, threshold=THRESHOLD, prefer=()):
+    """Near-duplicate clusters among dorks; see NearDuplicateIndex.clusters."""
+    return NearDuplicateIndex(dorks, threshold).clusters(prefer)
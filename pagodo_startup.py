@@ -0,0 +1,209 @@
+"""
+Staged startup.
+
+PagodoGUI paints its window with empty lists first and builds the dork
+collection on a background thread with load_dork_state(): open the
+database, load the saved or embedded dork list, merge the user's dorks
+and build the category and search indexes. The window fills in when that
+is done.
+
+StartupProfile times the phases of both stages. Start the GUI with
+--profile-startup (or PAGODO_PROFILE_STARTUP=1) to print them:
+
+    startup phases (s from launch):
+      0.231         imports done
+      0.231  0.048  create root             MainThread
+      0.279  0.162  window                  MainThread
+      ...
+      0.463         first paint
+      0.464  0.012  open database           pagodo-startup
+      ...
+      1.020         interactive
+
+The window's phases run on the main thread, the loading phases on
+pagodo-startup; "first paint" and "interactive" bracket the wait.
+
+The merged list (saved or embedded list plus the user's dorks) is cached
+in dorks.snapshot next to the database, so a warm start reads it back
+instead of normalizing and merging again. The snapshot is keyed by the
+database's id and dork revision (see DorkDatabase.revision) and by the
+size and SHA-256 of the embedded pack; if any of them changed, or the
+file is damaged, it is rebuilt from scratch. The pack's mtime is left
+out: a one-file build unpacks it afresh on every launch.
+"""
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import namedtuple
+from contextlib import contextmanager
+
+from pagodo_core import _intern
+from pagodo_db import DorkDatabase, DorkListStore, FavoritesStore, UserDorkStore, normalize_full
+from pagodo_index import CategoryIndex, DorkIndex
+from pagodo_pack import EMBEDDED_PACK, PackError, decode_pack, encode_pack
+
+SNAPSHOT_NAME = "dorks.snapshot"
+SNAPSHOT_MAGIC = b"PGDKSNAP"
+# bump when normalize_full or merge_user_dorks change what they produce
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct("<8sI")
+
+DorkState = namedtuple("DorkState", "db user_store full_store fav_store dorks_by_category category_index search_index")
+
+
+class StartupProfile:
+    """
+    Wall-clock start and length of each startup phase and the moments
+    marked on the way, relative to origin (seconds since the epoch; the
+    launcher can pass its own in PAGODO_STARTUP_T0). Safe to use from
+    several threads; disabled profiles record nothing.
+    """
+    def __init__(self, enabled=False, origin=None):
+        self.enabled = enabled
+        self.origin = float(os.environ.get("PAGODO_STARTUP_T0") or origin or time.time())
+        self.phases = []  # (name, start, seconds, thread name)
+        self.marks = {}   # name -> seconds
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append((name, start - self.origin, time.time() - start,
+                                    threading.current_thread().name))
+
+    def mark(self, name):
+        if self.enabled:
+            with self._lock:
+                self.marks.setdefault(name, time.time() - self.origin)
+
+    def report(self):
+        rows = [(start, f"{start:7.3f}{seconds:7.3f}  {name:<22}  {thread}")
+                for name, start, seconds, thread in self.phases]
+        rows += [(at, f"{at:7.3f}{'':7}  {name}") for name, at in self.marks.items()]
+        return "startup phases (s from launch):\n" + "\n".join(line for _, line in sorted(rows))
+
+    def print_report(self, out=None):
+        if self.enabled:
+            print(self.report(), file=out or sys.stderr, flush=True)
+
+
+def merge_user_dorks(dorks_by_category, category_index, rows):
+    """Add user dork rows missing from their category; True if any were added."""
+    changed = False
+    for row in rows:
+        cat = (row.get("category") or "").strip()
+        dork = _intern(row.get("dork", ""))
+        if not cat or not dork:
+            continue
+        dorks_by_category.setdefault(cat, [])
+        if not category_index.has(cat, dork):
+            dorks_by_category[cat].append(dork)
+            category_index.add(cat, dork)
+            changed = True
+    return changed
+
+
+def build_search_index(dorks_by_category, favorites):
+    # every listed dork plus favorites, which may come from an older dork list
+    index = DorkIndex(d for dorks in dorks_by_category.values() for d in dorks)
+    index.update(r.get("dork", "") for r in favorites)
+    return index
+
+
+def _file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    return [len(data), hashlib.sha256(data).hexdigest()]
+
+
+def snapshot_key(db):
+    """What the merged list was built from; a snapshot is only good for the same key."""
+    db_id, revision = db.revision()
+    return {"version": SNAPSHOT_VERSION, "db": db_id, "revision": revision,
+            "embedded": _file_digest(EMBEDDED_PACK)}
+
+
+def save_snapshot(path, key, dorks_by_category):
+    """Write the snapshot atomically; False if it could not be written."""
+    try:
+        body = encode_pack(dorks_by_category, level=1)
+    except ValueError:
+        return False
+    header = json.dumps({"key": key, "crc32": zlib.crc32(body)}).encode("utf-8")
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(header)))
+            f.write(header)
+            f.write(body)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def load_snapshot(path, key):
+    """The merged {category: [dork, ...]} saved for key, or None if missing, stale or damaged."""
+    try:
+        with open(path, "rb") as f:
+            buf = f.read()
+        magic, size = _SNAPSHOT_HEADER.unpack_from(buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            return None
+        start = _SNAPSHOT_HEADER.size
+        header = json.loads(buf[start:start + size].decode("utf-8"))
+        body = memoryview(buf)[start + size:]
+        if not isinstance(header, dict) or header.get("key") != key or header.get("crc32") != zlib.crc32(body):
+            return None
+        data = decode_pack(body)
+    except (OSError, PackError, ValueError, struct.error):
+        return None
+    # already normalized when the snapshot was written; only interning is left
+    return {cat: list(map(sys.intern, dorks)) for cat, dorks in data.items()}
+
+
+def load_dork_state(profile=None, db_path=None):
+    """Everything the dork list needs, built off the UI thread."""
+    profile = profile or StartupProfile()
+    with profile.phase("open database"):
+        db = DorkDatabase(db_path)
+        user_store, full_store, fav_store = UserDorkStore(db), DorkListStore(db), FavoritesStore(db)
+    snapshot_path = db.path.with_name(SNAPSHOT_NAME)
+    with profile.phase("load snapshot"):
+        key = snapshot_key(db)
+        dorks_by_category = load_snapshot(snapshot_path, key)
+    if dorks_by_category is not None:
+        with profile.phase("category index"):
+            category_index = CategoryIndex(dorks_by_category)
+    else:
+        with profile.phase("load dork list"):
+            stored = full_store.load()
+            if stored:
+                dorks_by_category = normalize_full(stored)
+            else:
+                from embedded_ghdb import GHDB_DATA
+                dorks_by_category = normalize_full(GHDB_DATA)
+        with profile.phase("category index"):
+            category_index = CategoryIndex(dorks_by_category)
+        with profile.phase("merge user dorks"):
+            merge_user_dorks(dorks_by_category, category_index, user_store.load())
+        with profile.phase("save snapshot"):
+            save_snapshot(snapshot_path, key, dorks_by_category)
+    with profile.phase("search index"):
+        search_index = build_search_index(dorks_by_category, fav_store.load())
+    return DorkState(db, user_store, full_store, fav_store, dorks_by_category, category_index, search_index)
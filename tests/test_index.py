@@ -0,0 +1,21 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagodo_index import DorkIndex  # noqa: E402
+
+
+def test_field_search_skips_excluded_operators():
+    index = DorkIndex(["inurl:admin -site:gov", "inurl:admin site:gov",
+                       "-(site:gov | filetype:pdf) inurl:login", "-filetype:pdf intitle:report",
+                       "filetype:pdf intitle:report"])
+    assert index.search("site:gov") == ["inurl:admin site:gov"]
+    assert index.search("filetype:pdf") == ["filetype:pdf intitle:report"]
+
+
+def test_query_without_terms_lists_everything():
+    dorks = ["inurl:admin", 'intitle:"index of"', "filetype:sql"]
+    index = DorkIndex(dorks)
+    for query in ('"', "-", '-"', "()"):
+        assert index.search(query) == dorks